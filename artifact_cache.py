@@ -0,0 +1,109 @@
+import fcntl
+import hashlib
+import json
+import os
+import pickle
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+import config
+from model import get_latest_model_version, load_model_mlflow
+from model_artifact import write_atomic
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class ArtifactCache:
+    def __init__(self, root: str = config.MODEL_CACHE_DIR):
+        self.root = root
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _ref_path(self, model_name: str, ref: str) -> str:
+        return os.path.join(self.root, "refs", model_name, ref)
+
+    def put(self, model_name: str, version: str, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if not os.path.exists(self._object_path(digest)):
+            write_atomic(self._object_path(digest), data)
+        write_atomic(self._ref_path(model_name, version), digest.encode())
+        write_atomic(
+            self._ref_path(model_name, "current"),
+            json.dumps({"version": version, "digest": digest}).encode(),
+        )
+        return digest
+
+    def read(self, digest: str) -> bytes:
+        with open(self._object_path(digest), "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Повреждён артефакт в кэше: {digest}")
+        return data
+
+    def resolve(self, model_name: str, version: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        try:
+            if version is None:
+                with open(self._ref_path(model_name, "current"), "rb") as f:
+                    ref = json.loads(f.read())
+                version, digest = ref["version"], ref["digest"]
+            else:
+                with open(self._ref_path(model_name, version), "rb") as f:
+                    digest = f.read().decode()
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        if not os.path.exists(self._object_path(digest)):
+            return None
+        return version, digest
+
+    def lock(self, model_name: str):
+        return file_lock(os.path.join(self.root, "locks", f"{model_name}.lock"))
+
+
+def default_cache() -> Optional[ArtifactCache]:
+    return ArtifactCache(config.MODEL_CACHE_DIR) if config.MODEL_CACHE_DIR else None
+
+
+def _read_cached(cache: ArtifactCache, model_name: str, version: Optional[str]):
+    cached = cache.resolve(model_name, version)
+    if cached is not None:
+        try:
+            return pickle.loads(cache.read(cached[1])), cached[0]
+        except ValueError:
+            pass
+    return None
+
+
+def load_model_mlflow_cached(
+    model_name: str,
+    version: Optional[str] = None,
+    cache: Optional[ArtifactCache] = None,
+):
+    cache = cache or default_cache()
+    if cache is None:
+        if version is None:
+            version = get_latest_model_version(model_name)
+        return load_model_mlflow(model_name, version=version), version
+
+    cached = _read_cached(cache, model_name, version)
+    if cached is not None:
+        return cached
+    with cache.lock(model_name):
+        cached = _read_cached(cache, model_name, version)
+        if cached is not None:
+            return cached
+        if version is None:
+            version = get_latest_model_version(model_name)
+        model = load_model_mlflow(model_name, version=version)
+        if version is not None:
+            cache.put(model_name, version, pickle.dumps(model))
+    return model, version
@@ -0,0 +1,30 @@
+import os
+import tempfile
+import timeit
+
+from model import load_model, save_model, train_model
+from model_artifact import load_model_artifact, save_model_artifact
+
+
+def per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="moderation-artifact-")
+    model = train_model()
+    pickle_path = os.path.join(workdir, "model.pkl")
+    artifact_path = os.path.join(workdir, "model.artifact")
+    save_model(model, pickle_path)
+    save_model_artifact(model, artifact_path)
+
+    print(f"{'loader':>34} {'us/load':>10}")
+    print(f"{'pickle':>34} {per_call_us(lambda: load_model(pickle_path), 500):>10.1f}")
+    print(f"{'artifact (mmap, checksum)':>34} {per_call_us(lambda: load_model_artifact(artifact_path), 500):>10.1f}")
+    print(f"{'artifact (mmap, no checksum)':>34} "
+          f"{per_call_us(lambda: load_model_artifact(artifact_path, verify=False), 500):>10.1f}")
+    print(f"pickle size: {os.path.getsize(pickle_path)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from model import train_model
+from services.moderation_service import ModerationService
+from benchmarks.common import best_of, make_requests, silence_service_logs
+
+
+def main():
+    silence_service_logs()
+    ModerationService.model = train_model()
+
+    print(f"{'N':>6} {'per-item rows/s':>16} {'batched rows/s':>16} {'speedup':>8}")
+    for n in (1, 100, 10_000):
+        requests = make_requests(n)
+        repeat = 3 if n >= 10_000 else 10
+        per_item = best_of(lambda: [ModerationService.predict(r) for r in requests], repeat)
+        batched = best_of(lambda: ModerationService.predict_batch(requests), repeat)
+        print(f"{n:>6} {n / per_item:>16,.0f} {n / batched:>16,.0f} {per_item / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
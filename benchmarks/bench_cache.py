@@ -0,0 +1,48 @@
+import argparse
+import time
+
+import numpy as np
+
+from model import train_model
+from services.cache import PredictionCache
+from services.moderation_service import ModerationService
+from benchmarks.common import make_requests, silence_service_logs
+
+
+def replay(requests, order) -> float:
+    start = time.perf_counter()
+    for i in order:
+        ModerationService.predict(requests[i])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--zipf", type=float, default=1.2)
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    parser.add_argument("--backend", default="sklearn")
+    args = parser.parse_args()
+
+    silence_service_logs()
+    ModerationService.model = train_model()
+    ModerationService.backend = args.backend
+    requests = make_requests(args.listings)
+    rng = np.random.default_rng(0)
+    order = (rng.zipf(args.zipf, args.requests) - 1) % args.listings
+
+    ModerationService.cache = None
+    uncached = replay(requests, order)
+    ModerationService.cache = PredictionCache(args.cache_size)
+    cached = replay(requests, order)
+    stats = ModerationService.cache.stats()
+
+    print(f"{args.requests} requests over {args.listings} listings, zipf a={args.zipf}, backend={args.backend}")
+    print(f"uncached: {args.requests / uncached:>10,.0f} req/s")
+    print(f"cached:   {args.requests / cached:>10,.0f} req/s ({uncached / cached:.1f}x)")
+    print(f"hit rate: {stats['hits'] / (stats['hits'] + stats['misses']):.1%}, evictions: {stats['evictions']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+
+from benchmarks.common import drive_closed_loop, make_requests, percentile, serve_app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--queue-depth", type=int, default=256)
+    parser.add_argument("--modes", default="inline,thread,process")
+    args = parser.parse_args()
+
+    payloads = [request.model_dump() for request in make_requests(1000)]
+    print(f"concurrency={args.concurrency} pool_size={args.pool_size} queue_depth={args.queue_depth}")
+    print(f"{'mode':>8} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'503':>6}")
+    for mode in args.modes.split(","):
+        env = {
+            "INFERENCE_MODE": mode,
+            "INFERENCE_POOL_SIZE": str(args.pool_size),
+            "INFERENCE_QUEUE_DEPTH": str(args.queue_depth),
+            "LOG_LEVEL": "WARNING",
+        }
+        with serve_app(env) as (url, _):
+            asyncio.run(drive_closed_loop(url, payloads, args.concurrency, 1.0))
+            latencies, statuses, elapsed = asyncio.run(
+                drive_closed_loop(url, payloads, args.concurrency, args.duration)
+            )
+        print(
+            f"{mode:>8} {len(latencies) / elapsed:>8,.0f} "
+            f"{percentile(latencies, 50) * 1000:>8.2f} {percentile(latencies, 95) * 1000:>8.2f} "
+            f"{percentile(latencies, 99) * 1000:>8.2f} {statuses.get(503, 0):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
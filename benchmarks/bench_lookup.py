@@ -0,0 +1,44 @@
+import timeit
+
+from model import train_model
+from services.features import FeatureEncoder
+from services.moderation_service import ModerationService
+from services.scorer import build_lookup_table, compile_scorer
+from benchmarks.common import make_requests, silence_service_logs
+
+
+def per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    silence_service_logs()
+    model = train_model()
+    scorer = compile_scorer(model)
+    table = build_lookup_table(model)
+    encoder = FeatureEncoder()
+    request = make_requests(1)[0]
+    row = encoder.encode(request).copy()
+    key = encoder.key(request)
+
+    print(f"{'path':>34} {'us/call':>10}")
+    print(f"{'sklearn predict_proba':>34} {per_call_us(lambda: model.predict_proba(row.reshape(1, -1)), 2000):>10.2f}")
+    print(f"{'compiled predict_one':>34} {per_call_us(lambda: scorer.predict_one(row), 100_000):>10.2f}")
+    print(f"{'lookup predict_key':>34} {per_call_us(lambda: table.predict_key(key), 100_000):>10.2f}")
+    print(f"{'encode + lookup predict_key':>34} {per_call_us(lambda: table.predict_key(encoder.key(request)), 100_000):>10.2f}")
+
+    ModerationService.model = model
+    for backend in ("sklearn", "compiled", "lookup"):
+        ModerationService.backend = backend
+        us = per_call_us(lambda: ModerationService.predict(request), 5000)
+        print(f"{f'ModerationService.predict [{backend}]':>34} {us:>10.2f}")
+
+    requests = make_requests(10_000)
+    for backend in ("sklearn", "compiled", "lookup"):
+        ModerationService.backend = backend
+        us = per_call_us(lambda: ModerationService.predict_batch(requests), 20)
+        print(f"{f'predict_batch 10k [{backend}]':>34} {us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
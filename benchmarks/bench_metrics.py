@@ -0,0 +1,36 @@
+import timeit
+
+from model import train_model
+from services import metrics
+from services.moderation_service import ModerationService
+from benchmarks.common import make_requests, silence_service_logs
+
+
+def per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    silence_service_logs()
+    ModerationService.model = train_model()
+    request = make_requests(1)[0]
+
+    counter = metrics.Counter("bench_total", "bench", ("outcome",))
+    histogram = metrics.Histogram("bench_seconds", "bench", ("stage",))
+    print(f"{'operation':>36} {'us/call':>10}")
+    print(f"{'Counter.inc':>36} {per_call_us(lambda: counter.inc(('success',)), 200_000):>10.3f}")
+    print(f"{'Histogram.observe':>36} {per_call_us(lambda: histogram.observe(0.0003, ('model',)), 200_000):>10.3f}")
+
+    for backend in ("sklearn", "compiled", "lookup"):
+        ModerationService.backend = backend
+        results = {}
+        for enabled in (False, True):
+            metrics.registry.enabled = enabled
+            results[enabled] = per_call_us(lambda: ModerationService.predict(request), 20_000 if backend != "sklearn" else 2000)
+        print(f"{f'predict [{backend}] without metrics':>36} {results[False]:>10.3f}")
+        print(f"{f'predict [{backend}] with metrics':>36} {results[True]:>10.3f}"
+              f"  (+{results[True] - results[False]:.3f} us)")
+
+
+if __name__ == "__main__":
+    main()
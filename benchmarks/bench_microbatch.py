@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import time
+
+from model import train_model
+from services.batcher import MicroBatcher
+from services.moderation_service import ModerationService
+from benchmarks.common import make_requests, percentile, silence_service_logs
+
+
+async def closed_loop(score, requests, concurrency: int, duration: float):
+    latencies = []
+    stop_at = time.perf_counter() + duration
+
+    async def client(offset: int):
+        i = offset
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            await score(requests[i % len(requests)])
+            latencies.append(time.perf_counter() - start)
+            i += concurrency
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+async def inline_score(request):
+    return ModerationService.predict(request)
+
+
+async def run(concurrency: int, duration: float, max_batch_size: int, max_wait_ms: float):
+    requests = make_requests(1000)
+    batcher = MicroBatcher(max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    await batcher.start()
+    try:
+        results = {
+            "inline": await closed_loop(inline_score, requests, concurrency, duration),
+            "micro-batched": await closed_loop(batcher.submit, requests, concurrency, duration),
+        }
+    finally:
+        await batcher.stop()
+
+    print(f"concurrency={concurrency} max_batch_size={max_batch_size} max_wait_ms={max_wait_ms}")
+    print(f"{'mode':>14} {'rps':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode, (latencies, elapsed) in results.items():
+        print(
+            f"{mode:>14} {len(latencies) / elapsed:>10,.0f} "
+            f"{percentile(latencies, 50) * 1000:>8.2f} {percentile(latencies, 99) * 1000:>8.2f}"
+        )
+    print(f"mean batch size: {batcher.items / max(batcher.batches, 1):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    silence_service_logs()
+    ModerationService.model = train_model()
+    asyncio.run(run(args.concurrency, args.duration, args.max_batch_size, args.max_wait_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from benchmarks.common import best_of
+from services.policy import ThresholdPolicy
+
+
+def make_rules(overrides: int, categories: int, seed: int = 42) -> bytes:
+    rng = random.Random(seed)
+    return json.dumps({
+        "default": 0.5,
+        "categories": {str(c): round(rng.random(), 3) for c in range(categories)},
+        "sellers": {str(s): round(rng.random(), 3) for s in rng.sample(range(10_000_000), overrides)},
+    }).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--overrides", default="0,1000,10000,100000")
+    parser.add_argument("--categories", type=int, default=120)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    seller_ids = [rng.randrange(10_000_000) for _ in range(args.lookups)]
+    categories = [rng.randrange(args.categories + 20) for _ in range(args.lookups)]
+    batch_sellers = np.array(seller_ids[:args.batch_size])
+    batch_categories = np.array(categories[:args.batch_size])
+
+    print(f"{'overrides':>10} {'compile ms':>11} {'scalar ns':>10} {'batch ns/item':>14}")
+    for overrides in map(int, args.overrides.split(",")):
+        data = make_rules(overrides, args.categories)
+        started = time.perf_counter()
+        policy = ThresholdPolicy.from_json(data)
+        compile_ms = (time.perf_counter() - started) * 1000
+        threshold = policy.threshold
+
+        def scalar():
+            for seller_id, category in zip(seller_ids, categories):
+                threshold(seller_id, category)
+
+        scalar_ns = best_of(scalar) / args.lookups * 1e9
+        batch_ns = best_of(lambda: policy.thresholds(batch_categories, batch_sellers), repeat=50) / args.batch_size * 1e9
+        print(f"{overrides:>10,} {compile_ms:>11.1f} {scalar_ns:>10.1f} {batch_ns:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.common import make_requests, silence_service_logs
+from model import train_model
+from routers.metrics import MetricsMiddleware
+from routers.moderation import fast_router, root_router
+from services.moderation_service import ModerationService
+
+
+def make_app(router) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router, prefix="/predict")
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app, path: str, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app, path: str, bodies, iterations: int) -> float:
+    for body in bodies[:100]:
+        assert await call(app, path, body) == 200
+    started = time.perf_counter()
+    for i in range(iterations):
+        await call(app, path, bodies[i % len(bodies)])
+    return (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--backend", default="compiled")
+    args = parser.parse_args()
+
+    ModerationService.backend = args.backend
+    ModerationService.model = train_model()
+    silence_service_logs()
+    requests = make_requests(1000)
+    single = [request.model_dump_json().encode() for request in requests]
+    batches = [
+        json.dumps({"items": [r.model_dump() for r in requests[i:i + args.batch_size]]}).encode()
+        for i in range(0, len(requests) - args.batch_size + 1, args.batch_size)
+    ]
+
+    started = time.perf_counter()
+    for i in range(args.iterations):
+        ModerationService.predict(requests[i % len(requests)])
+    model_only = (time.perf_counter() - started) / args.iterations
+
+    print(f"{'route':>14} {'default us':>11} {'fast us':>9} {'speedup':>8}")
+    print(f"{'predict()':>14} {model_only * 1e6:>11.1f}")
+    for name, path, bodies, iterations in (
+        ("/predict/", "/predict/", single, args.iterations),
+        ("/predict/batch", "/predict/batch", batches, args.iterations // 10),
+    ):
+        default = asyncio.run(measure(make_app(root_router), path, bodies, iterations))
+        fast = asyncio.run(measure(make_app(fast_router), path, bodies, iterations))
+        print(f"{name:>14} {default * 1e6:>11.1f} {fast * 1e6:>9.1f} {default / fast:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from benchmarks.common import make_requests, silence_service_logs
+from model import save_model, train_model
+from score_cli import score_file
+
+
+def write_csv(path: str, rows: int):
+    requests = make_requests(min(rows, 10_000))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["seller_id", "item_id", "is_verified_seller", "images_qty", "description", "category"])
+        for i in range(rows):
+            r = requests[i % len(requests)]
+            writer.writerow([r.seller_id, i, r.is_verified_seller, r.images_qty, r.description, r.category])
+
+
+def write_parquet(path: str, csv_path: str):
+    import pyarrow.csv
+    import pyarrow.parquet
+
+    pyarrow.parquet.write_table(pyarrow.csv.read_csv(csv_path), path, row_group_size=100_000)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--processes", default="1,2,4,8")
+    parser.add_argument("--formats", default="csv,parquet")
+    parser.add_argument("--chunk-bytes", type=int, default=8 * 1024 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        model_path = os.path.join(workdir, "model.pkl")
+        save_model(train_model(), model_path)
+        inputs = {"csv": os.path.join(workdir, "input.csv")}
+        write_csv(inputs["csv"], args.rows)
+        if "parquet" in args.formats:
+            inputs["parquet"] = os.path.join(workdir, "input.parquet")
+            write_parquet(inputs["parquet"], inputs["csv"])
+        silence_service_logs()
+
+        print(f"rows={args.rows} cpus={os.cpu_count()}")
+        print(f"{'format':>8} {'procs':>6} {'rows/s':>12} {'speedup':>8}")
+        for fmt in args.formats.split(","):
+            baseline = None
+            output_path = os.path.join(workdir, "output.parquet")
+            for processes in map(int, args.processes.split(",")):
+                started = time.perf_counter()
+                rows = score_file(
+                    inputs[fmt], output_path, processes=processes, chunk_bytes=args.chunk_bytes, model_path=model_path
+                )
+                rate = rows / (time.perf_counter() - started)
+                baseline = baseline or rate
+                print(f"{fmt:>8} {processes:>6} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import timeit
+
+import numpy as np
+
+from model import train_model
+from services.scorer import compile_scorer
+
+
+def per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    model = train_model()
+    scorer = compile_scorer(model)
+    row = np.array([0.0, 0.3, 0.5, 0.01])
+    row_list = [row.tolist()]
+
+    print(f"{'path':>30} {'us/call':>10}")
+    print(f"{'sklearn predict_proba, 1 row':>30} {per_call_us(lambda: model.predict_proba(row_list), 2000):>10.2f}")
+    print(f"{'compiled predict_one':>30} {per_call_us(lambda: scorer.predict_one(row), 100_000):>10.2f}")
+
+    for n in (100, 10_000):
+        batch = np.random.default_rng(0).random((n, 4))
+        sklearn_us = per_call_us(lambda: model.predict_proba(batch), 200)
+        compiled_us = per_call_us(lambda: scorer.predict_proba(batch), 200)
+        print(f"{f'sklearn predict_proba, {n} rows':>30} {sklearn_us:>10.2f}")
+        print(f"{f'compiled predict_proba, {n} rows':>30} {compiled_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from services.seller_store import SellerFeatureCache, create_seller_store
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sellers", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--backends", default="memory,sqlite")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rows = [(seller_id, rng.random() * 0.2, rng.randint(0, 5000)) for seller_id in range(args.sellers)]
+    seller_ids = [rng.randrange(args.sellers * 2) for _ in range(args.requests)]
+    batches = [seller_ids[i:i + args.batch_size] for i in range(0, len(seller_ids), args.batch_size)]
+
+    print(f"sellers={args.sellers} requests={args.requests} batch_size={args.batch_size}")
+    print(f"{'backend':>8} {'mode':>16} {'us/item':>9} {'queries':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for backend in args.backends.split(","):
+            store = create_seller_store(backend, os.path.join(workdir, "sellers.db"))
+            store.put_many(rows)
+
+            def per_request():
+                for seller_id in seller_ids:
+                    store.fetch_many([seller_id])
+
+            def batched():
+                for batch in batches:
+                    store.fetch_many(batch)
+
+            cold = SellerFeatureCache(store, max_size=args.sellers * 2)
+
+            def cached_batches():
+                for batch in batches:
+                    cold.get_many(batch)
+
+            coalesced = SellerFeatureCache(store, max_size=args.sellers * 2)
+
+            async def concurrent_prefetch():
+                for batch in batches:
+                    await asyncio.gather(*(coalesced.prefetch((seller_id,)) for seller_id in batch))
+
+            results = [
+                ("per-request", timed(per_request), len(seller_ids)),
+                ("batched", timed(batched), len(batches)),
+                ("lru cold", timed(cached_batches), None),
+                ("lru warm", timed(cached_batches), None),
+                ("async coalesced", timed(lambda: asyncio.run(concurrent_prefetch())), None),
+            ]
+            for mode, elapsed, queries in results:
+                if queries is None:
+                    queries = (cold if mode.startswith("lru") else coalesced).queries
+                print(f"{backend:>8} {mode:>16} {elapsed / len(seller_ids) * 1e6:>9.2f} {queries:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import time
+
+from benchmarks.bench_routes import call, make_app
+from benchmarks.common import make_requests, percentile, silence_service_logs
+from model import train_model
+from routers.moderation import root_router
+from services.moderation_service import ModerationService
+from services.registry import ModelRegistry
+from services.shadow import shadow
+
+
+class SlowModel:
+    def __init__(self, model, delay: float):
+        self.model = model
+        self.delay = delay
+
+    def predict_proba(self, X):
+        time.sleep(self.delay)
+        return self.model.predict_proba(X)
+
+
+async def measure(app, bodies, iterations: int):
+    for body in bodies[:100]:
+        assert await call(app, "/predict/", body) == 200
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        await call(app, "/predict/", bodies[i % len(bodies)])
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0)
+    await shadow.wait_idle()
+    return latencies
+
+
+async def run(app, bodies, iterations: int, version: str, challenger, traffic_share: float, shadow_scoring: bool):
+    ModerationService.registry = ModelRegistry()
+    if challenger is not None:
+        ModerationService.registry.register(version, challenger)
+        ModerationService.registry.set_challenger(version, traffic_share, shadow_scoring)
+    await shadow.start()
+    try:
+        return await measure(app, bodies, iterations)
+    finally:
+        await shadow.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--slow-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    model = train_model()
+    ModerationService.model = model
+    silence_service_logs()
+    bodies = [request.model_dump_json().encode() for request in make_requests(1000)]
+    app = make_app(root_router)
+
+    print(f"{'scenario':>24} {'p50 us':>8} {'p99 us':>8} {'compared':>9} {'dropped':>8} {'agreement':>10}")
+    for name, challenger, traffic_share, shadow_scoring in (
+        ("champion only", None, 0.0, False),
+        ("shadow, same model", model, 0.0, True),
+        (f"shadow, +{args.slow_ms:g} ms model", SlowModel(model, args.slow_ms / 1000), 0.0, True),
+        ("10% routed, no shadow", model, 0.1, False),
+    ):
+        latencies = asyncio.run(run(app, bodies, args.iterations, name, challenger, traffic_share, shadow_scoring))
+        stats = shadow.stats() if shadow_scoring else {"compared": 0, "dropped": 0, "agreement_rate": None}
+        agreement = stats["agreement_rate"]
+        print(
+            f"{name:>24} {percentile(latencies, 50) * 1e6:>8.1f} {percentile(latencies, 99) * 1e6:>8.1f} "
+            f"{stats['compared']:>9,} {stats['dropped']:>8,} {agreement if agreement is not None else float('nan'):>10.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
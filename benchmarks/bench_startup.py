@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from artifact_cache import ArtifactCache
+from model import save_model, train_model
+from benchmarks.common import REPO_ROOT
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+import config
+from services.moderation_service import ModerationService, WARMUP_REQUESTS
+imported = time.perf_counter()
+if config.USE_MLFLOW:
+    ModerationService.load_model(config.MODEL_NAME)
+else:
+    ModerationService.load_model(model_path=config.MODEL_PATH)
+ModerationService.predict(WARMUP_REQUESTS[0])
+finished = time.perf_counter()
+import sys
+print(json.dumps({"import": imported - started, "first_prediction": finished - started, "mlflow_imported": "mlflow" in sys.modules}))
+"""
+
+MLFLOW_IMPORT = "import time; t = time.perf_counter(); import mlflow, mlflow.sklearn; print(time.perf_counter() - t)"
+
+
+def run(code: str, env: dict) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        env={**os.environ, "LOG_LEVEL": "WARNING", "MLFLOW_DISABLE_AGENT_HINT": "1", **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="moderation-startup-")
+    model = train_model()
+    model_path = os.path.join(workdir, "model.pkl")
+    save_model(model, model_path)
+    cache_dir = os.path.join(workdir, "cache")
+    ArtifactCache(cache_dir).put("moderation_model", "1", pickle.dumps(model))
+
+    modes = {
+        "local pickle": {"USE_MLFLOW": "false", "MODEL_PATH": model_path},
+        "mlflow (artifact cache hit)": {"USE_MLFLOW": "true", "MODEL_CACHE_DIR": cache_dir},
+    }
+    print(f"{'mode':>28} {'import s':>9} {'first prediction s':>19} {'mlflow imported':>16}")
+    for mode, env in modes.items():
+        samples = [json.loads(run(PROBE, env)) for _ in range(args.repeat)]
+        print(
+            f"{mode:>28} {statistics.median(s['import'] for s in samples):>9.3f} "
+            f"{statistics.median(s['first_prediction'] for s in samples):>19.3f} "
+            f"{str(samples[0]['mlflow_imported']):>16}"
+        )
+
+    mlflow_import = statistics.median(float(run(MLFLOW_IMPORT, {})) for _ in range(args.repeat))
+    print(f"for reference, importing mlflow alone takes {mlflow_import:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
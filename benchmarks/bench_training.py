@@ -0,0 +1,83 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from services.features import FeatureEncoder
+from training import LABEL_COLUMN, iter_file_chunks, iter_synthetic_chunks, synthetic_columns, train, write_synthetic
+
+
+def peak_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def accuracy(model) -> float:
+    columns = synthetic_columns(100_000, seed=999)
+    return float((model.predict(FeatureEncoder().encode_columns(columns)) == columns[LABEL_COLUMN]).mean())
+
+
+def run_streaming(rows: int, chunk_rows: int):
+    baseline = peak_rss_mb()
+    model, stats = train(lambda: iter_synthetic_chunks(rows, chunk_rows))
+    return stats.seconds, baseline, peak_rss_mb(), accuracy(model)
+
+
+def run_file(path: str, chunk_bytes: int):
+    baseline = peak_rss_mb()
+    model, stats = train(lambda: iter_file_chunks([path], chunk_bytes=chunk_bytes))
+    return stats.seconds, baseline, peak_rss_mb(), accuracy(model)
+
+
+def run_full_fit(rows: int, chunk_rows: int):
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    chunks = list(iter_synthetic_chunks(rows, chunk_rows))
+    X = np.vstack([X for X, _ in chunks])
+    y = np.concatenate([y for _, y in chunks])
+    del chunks
+    model = LogisticRegression().fit(X, y)
+    return time.perf_counter() - started, baseline, peak_rss_mb(), accuracy(model)
+
+
+def isolated(fn, *args):
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(fn, args)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--full-fit-rows", type=int, default=2_000_000)
+    parser.add_argument("--file-rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-bytes", type=int, default=16 * 1024 * 1024)
+    args = parser.parse_args()
+
+    print(f"{'mode':>28} {'rows':>12} {'seconds':>8} {'rows/s':>11} {'start MB':>9} {'peak MB':>8} {'accuracy':>9}")
+
+    def report(name: str, rows: int, result):
+        seconds, baseline, peak, score = result
+        print(f"{name:>28} {rows:>12,} {seconds:>8.2f} {rows / seconds:>11,.0f} {baseline:>9.1f} {peak:>8.1f} {score:>9.4f}")
+
+    report("partial_fit, synthetic", args.rows, isolated(run_streaming, args.rows, args.chunk_rows))
+    if args.full_fit_rows:
+        report("LogisticRegression.fit", args.full_fit_rows, isolated(run_full_fit, args.full_fit_rows, args.chunk_rows))
+    if args.file_rows:
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ("parquet", "csv"):
+                path = os.path.join(directory, f"train.{extension}")
+                write_synthetic(path, args.file_rows, args.chunk_rows)
+                report(f"partial_fit, {extension} file", args.file_rows, isolated(run_file, path, args.chunk_bytes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import REPO_ROOT, drive_closed_loop, make_requests, summarize_latencies
+from services.workers import process_memory
+from training import iter_synthetic_chunks, publish, train
+
+
+def child_pids(pid: int) -> List[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if parent == pid:
+            children.append(int(entry))
+    return children
+
+
+def worker_memory(pid: int) -> Dict[str, float]:
+    parent = process_memory(pid)
+    workers = [usage for usage in map(process_memory, child_pids(pid)) if usage] or [parent]
+    total_pss = sum(usage["pss_kb"] for usage in workers)
+    if workers[0] is not parent:
+        total_pss += parent["pss_kb"]
+    return {
+        "workers": len(workers),
+        "rss_mb": sum(usage["rss_kb"] for usage in workers) / len(workers) / 1024,
+        "pss_mb": sum(usage["pss_kb"] for usage in workers) / len(workers) / 1024,
+        "private_mb": sum(usage["private_kb"] for usage in workers) / len(workers) / 1024,
+        "total_pss_mb": total_pss / 1024,
+    }
+
+
+@contextlib.contextmanager
+def launch(mode: str, workers: int, model_path: str, port: int):
+    if mode == "prefork":
+        command = [sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1",
+                   "--port", str(port), "--model-path", model_path, "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--workers", str(workers), "--log-level", "warning"]
+    process = subprocess.Popen(
+        command,
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONPATH": REPO_ROOT, "MODEL_PATH": model_path, "LOG_LEVEL": "WARNING"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 120
+        ready = 0
+        while ready < 4 * workers:
+            try:
+                ready = ready + 1 if httpx.get(url + "/health/ready", timeout=1).status_code == 200 else 0
+            except httpx.TransportError:
+                ready = 0
+            if process.poll() is not None or time.time() > deadline:
+                raise RuntimeError("Сервис не запустился")
+            time.sleep(0.05)
+        yield url, process
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--modes", nargs="+", choices=["prefork", "uvicorn"], default=["prefork", "uvicorn"])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8023)
+    args = parser.parse_args()
+
+    payloads = [request.model_dump() for request in make_requests(2_000)]
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, "model.pkl")
+        model, _ = train(lambda: iter_synthetic_chunks(200_000))
+        publish(model, model_path)
+
+        print(f"cpu_count: {os.cpu_count()}")
+        print(f"{'mode':>8} {'workers':>7} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'RSS/w MB':>9} {'PSS/w MB':>9} {'priv/w MB':>10} {'total PSS MB':>13}")
+        for mode in args.modes:
+            for workers in args.workers:
+                with launch(mode, workers, model_path, args.port) as (url, process):
+                    latencies, statuses, elapsed = asyncio.run(
+                        drive_closed_loop(url, payloads, args.concurrency, args.duration)
+                    )
+                    memory = worker_memory(process.pid)
+                summary = summarize_latencies(latencies, statuses, elapsed)
+                print(f"{mode:>8} {workers:>7} {summary['rps']:>8.0f} {summary['p50_ms']:>8.2f} "
+                      f"{summary['p99_ms']:>8.2f} {memory['rss_mb']:>9.1f} {memory['pss_mb']:>9.1f} "
+                      f"{memory['private_mb']:>10.1f} {memory['total_pss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+from model import save_model, train_model
+from models.moderation import PredictionRequest
+
+
+def make_requests(n: int, seed: int = 42) -> List[PredictionRequest]:
+    rng = random.Random(seed)
+    return [
+        PredictionRequest(
+            seller_id=rng.randint(1, 100_000),
+            is_verified_seller=rng.random() < 0.5,
+            item_id=i,
+            name=f"Item {i}",
+            description="x" * rng.randint(0, 1500),
+            category=rng.randint(0, 120),
+            images_qty=rng.randint(0, 15),
+        )
+        for i in range(n)
+    ]
+
+
+def silence_service_logs():
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("services"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return float("nan")
+    index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@contextlib.contextmanager
+def serve_app(env: Optional[Dict[str, str]] = None, port: int = 8013, workdir: Optional[str] = None, args: Sequence[str] = ()):
+    workdir = workdir or tempfile.mkdtemp(prefix="moderation-bench-")
+    env = {"MODEL_PATH": os.path.join(workdir, "model.pkl"), **(env or {})}
+    if not os.path.exists(env["MODEL_PATH"]):
+        save_model(train_model(), env["MODEL_PATH"])
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", REPO_ROOT,
+         "--port", str(port), "--log-level", "warning", *args],
+        cwd=workdir,
+        env={**os.environ, "MLFLOW_DISABLE_AGENT_HINT": "1", **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 60
+        while True:
+            try:
+                if httpx.get(url + "/health/ready", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.time() > deadline:
+                raise RuntimeError("Сервис не запустился")
+            time.sleep(0.1)
+        yield url, process
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def drive_closed_loop(url: str, payloads: List[dict], concurrency: int, duration: float, path: str = "/predict/"):
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        stop_at = time.perf_counter() + duration
+
+        async def worker(offset: int):
+            i = offset
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                response = await client.post(path, json=payloads[i % len(payloads)])
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                i += concurrency
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(c) for c in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed
+
+
+async def drive_fixed_rate(
+    url: str,
+    payloads: List[dict],
+    rps: float,
+    duration: float,
+    max_in_flight: int = 1024,
+    path: str = "/predict/",
+) -> Tuple[List[float], Dict[int, int], float, int]:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    dropped = 0
+    in_flight = 0
+    tasks = set()
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+
+        async def fire(i: int, scheduled: float):
+            nonlocal in_flight
+            try:
+                response = await client.post(path, json=payloads[i % len(payloads)])
+                status = response.status_code
+            except httpx.TransportError:
+                status = 0
+            latencies.append(time.perf_counter() - scheduled)
+            statuses[status] = statuses.get(status, 0) + 1
+            in_flight -= 1
+
+        started = time.perf_counter()
+        for i in range(int(rps * duration)):
+            scheduled = started + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if in_flight >= max_in_flight:
+                dropped += 1
+                continue
+            in_flight += 1
+            task = asyncio.ensure_future(fire(i, scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed, dropped
+
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def summarize_latencies(
+    latencies: List[float],
+    statuses: Dict[int, int],
+    elapsed: float,
+    cpu_seconds: Optional[float] = None,
+) -> Dict[str, float]:
+    total = sum(statuses.values())
+    succeeded = statuses.get(200, 0)
+    summary = {
+        "requests": total,
+        "rps": succeeded / elapsed if elapsed > 0 else 0.0,
+        "error_rate": (total - succeeded) / total if total else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "p999_ms": percentile(latencies, 99.9) * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else float("nan"),
+    }
+    if cpu_seconds is not None and succeeded:
+        summary["cpu_ms_per_request"] = cpu_seconds / succeeded * 1000
+    return summary
+
+
+def save_results(path: str, benchmark: str, metrics: Dict[str, float], settings: Optional[dict] = None):
+    with open(path, "w") as f:
+        json.dump({
+            "benchmark": benchmark,
+            "created_at": time.time(),
+            "cpu_count": os.cpu_count(),
+            "settings": settings or {},
+            "metrics": metrics,
+        }, f, indent=2, sort_keys=True)
+
+
+def check_regressions(
+    metrics: Dict[str, float],
+    baseline_path: str,
+    tolerance: float,
+    higher_is_better: Iterable[str] = (),
+) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["metrics"]
+    higher_is_better = set(higher_is_better)
+    regressions = []
+    for name, expected in sorted(baseline.items()):
+        actual = metrics.get(name)
+        if actual is None or expected is None:
+            continue
+        if name in higher_is_better:
+            regressed = actual < expected * (1 - tolerance)
+        else:
+            regressed = actual > expected * (1 + tolerance)
+        if regressed:
+            regressions.append(f"{name}: {actual:.4g} (базовое значение {expected:.4g}, допуск {tolerance:.0%})")
+    return regressions
+
+
+def report_regressions(regressions: List[str]) -> int:
+    if not regressions:
+        print("Регрессий не обнаружено")
+        return 0
+    print("Обнаружены регрессии:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
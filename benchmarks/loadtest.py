@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import contextlib
+import sys
+from typing import Dict, Optional
+
+from benchmarks.common import (
+    check_regressions,
+    drive_closed_loop,
+    drive_fixed_rate,
+    make_requests,
+    process_cpu_seconds,
+    report_regressions,
+    save_results,
+    serve_app,
+    summarize_latencies,
+)
+
+HIGHER_IS_BETTER = ("rps", "max_sustainable_rps")
+CHECKED_METRICS = (
+    "rps", "max_sustainable_rps", "error_rate", "p50_ms", "p95_ms", "p99_ms", "p999_ms", "cpu_ms_per_request",
+)
+
+
+def parse_env(pairs) -> Dict[str, str]:
+    env = {"LOG_LEVEL": "WARNING"}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        env[key] = value
+    return env
+
+
+@contextlib.contextmanager
+def target(args):
+    if args.url:
+        yield args.url, None
+        return
+    with serve_app(parse_env(args.env), port=args.port) as (url, process):
+        yield url, process.pid
+
+
+def run_closed(url: str, pid: Optional[int], payloads, args) -> Dict[str, float]:
+    asyncio.run(drive_closed_loop(url, payloads, args.concurrency, args.warmup, path=args.path))
+    cpu_before = process_cpu_seconds(pid) if pid else None
+    latencies, statuses, elapsed = asyncio.run(
+        drive_closed_loop(url, payloads, args.concurrency, args.duration, path=args.path)
+    )
+    cpu_after = process_cpu_seconds(pid) if pid else None
+    cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+    return summarize_latencies(latencies, statuses, elapsed, cpu)
+
+
+def run_fixed(url: str, pid: Optional[int], payloads, rps: float, args) -> Dict[str, float]:
+    cpu_before = process_cpu_seconds(pid) if pid else None
+    latencies, statuses, elapsed, dropped = asyncio.run(
+        drive_fixed_rate(url, payloads, rps, args.duration, args.max_in_flight, path=args.path)
+    )
+    cpu_after = process_cpu_seconds(pid) if pid else None
+    cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+    summary = summarize_latencies(latencies, statuses, elapsed, cpu)
+    summary["target_rps"] = rps
+    summary["dropped"] = dropped
+    return summary
+
+
+def sustainable(summary: Dict[str, float], args) -> bool:
+    return (
+        summary["dropped"] == 0
+        and summary["error_rate"] <= args.max_error_rate
+        and summary["p99_ms"] <= args.slo_ms
+        and summary["rps"] >= summary["target_rps"] * 0.95
+    )
+
+
+def print_summary(label: str, summary: Dict[str, float]):
+    cpu = summary.get("cpu_ms_per_request")
+    print(
+        f"{label:>12} {summary['rps']:>9,.0f} {summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} "
+        f"{summary['p99_ms']:>8.2f} {summary['p999_ms']:>8.2f} {summary['error_rate']:>7.2%} "
+        f"{cpu if cpu is not None else float('nan'):>8.3f}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочное тестирование /predict/")
+    parser.add_argument("--mode", choices=("closed", "fixed", "sweep"), default="closed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rps", type=float, default=200.0)
+    parser.add_argument("--rps-step", type=float, default=1.5)
+    parser.add_argument("--slo-ms", type=float, default=50.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.001)
+    parser.add_argument("--max-in-flight", type=int, default=1024)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--path", default="/predict/")
+    parser.add_argument("--payloads", type=int, default=1000)
+    parser.add_argument("--url", help="Адрес уже запущенного сервиса вместо локального uvicorn")
+    parser.add_argument("--port", type=int, default=8013)
+    parser.add_argument("--env", action="append", default=[], help="Переменная окружения сервиса KEY=VALUE")
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    payloads = [request.model_dump() for request in make_requests(args.payloads)]
+    print(f"{'':>12} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'p999 ms':>8} {'errors':>7} {'cpu ms':>8}")
+    with target(args) as (url, pid):
+        if args.mode == "closed":
+            metrics = run_closed(url, pid, payloads, args)
+            print_summary(f"c={args.concurrency}", metrics)
+        elif args.mode == "fixed":
+            run_fixed(url, pid, payloads, args.rps, argparse.Namespace(**{**vars(args), "duration": args.warmup}))
+            metrics = run_fixed(url, pid, payloads, args.rps, args)
+            print_summary(f"{args.rps:,.0f}/s", metrics)
+        else:
+            metrics = {"max_sustainable_rps": 0.0}
+            rps = args.rps
+            while True:
+                summary = run_fixed(url, pid, payloads, rps, args)
+                print_summary(f"{rps:,.0f}/s", summary)
+                if not sustainable(summary, args):
+                    break
+                metrics = {**summary, "max_sustainable_rps": rps}
+                rps *= args.rps_step
+            print(f"Максимальная устойчивая нагрузка: {metrics['max_sustainable_rps']:,.0f} RPS")
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    if args.output:
+        save_results(args.output, f"loadtest-{args.mode}", metrics, settings)
+    if args.baseline:
+        checked = {name: value for name, value in metrics.items() if name in CHECKED_METRICS}
+        return report_regressions(check_regressions(checked, args.baseline, args.tolerance, HIGHER_IS_BETTER))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+
+from benchmarks.common import (
+    best_of,
+    check_regressions,
+    make_requests,
+    report_regressions,
+    save_results,
+    silence_service_logs,
+)
+from model import save_model, train_model
+from model_artifact import load_local_model, save_model_artifact
+from services.features import FeatureEncoder
+from services.moderation_service import ModerationService
+
+
+def per_call(fn, calls: int, repeat: int = 5) -> float:
+    def loop():
+        for _ in range(calls):
+            fn()
+
+    return best_of(loop, repeat) / calls
+
+
+def bench_predict(requests, iterations: int) -> Dict[str, float]:
+    metrics = {}
+    ModerationService.model = train_model()
+    ModerationService.cache = None
+    for backend in ("sklearn", "compiled", "lookup"):
+        ModerationService.backend = backend
+        cycle = iter(requests * (iterations // len(requests) + 1) * 5)
+        metrics[f"predict_{backend}_us"] = per_call(lambda: ModerationService.predict(next(cycle)), iterations) * 1e6
+        batch = requests[:64]
+        metrics[f"predict_batch64_{backend}_us_per_item"] = (
+            best_of(lambda: ModerationService.predict_batch(batch), 20) / len(batch) * 1e6
+        )
+    ModerationService.backend = "sklearn"
+    ModerationService.model = None
+    return metrics
+
+
+def bench_features(requests, iterations: int) -> Dict[str, float]:
+    encoder = FeatureEncoder()
+    request = requests[0]
+    batch = requests[:1024]
+    columns = {
+        "is_verified_seller": np.array([r.is_verified_seller for r in batch]),
+        "images_qty": np.array([r.images_qty for r in batch]),
+        "description_length": np.array([len(r.description) for r in batch]),
+        "category": np.array([r.category for r in batch]),
+    }
+    buffer = np.empty((len(batch), 4))
+    return {
+        "encode_us": per_call(lambda: encoder.encode(request), iterations) * 1e6,
+        "key_us": per_call(lambda: encoder.key(request), iterations) * 1e6,
+        "encode_batch_us_per_item": best_of(lambda: encoder.encode_batch(batch, out=buffer), 50) / len(batch) * 1e6,
+        "encode_columns_us_per_item": best_of(lambda: encoder.encode_columns(columns, out=buffer), 50) / len(batch) * 1e6,
+    }
+
+
+def bench_loading(repeat: int) -> Dict[str, float]:
+    workdir = tempfile.mkdtemp(prefix="moderation-micro-")
+    pickle_path = os.path.join(workdir, "model.pkl")
+    artifact_path = os.path.join(workdir, "model.artifact")
+    model = train_model()
+    save_model(model, pickle_path)
+    save_model_artifact(model, artifact_path)
+
+    metrics = {
+        "load_pickle_ms": best_of(lambda: load_local_model(pickle_path), repeat) * 1000,
+        "load_artifact_ms": best_of(lambda: load_local_model(artifact_path), repeat) * 1000,
+        "load_model_pickle_ms": best_of(lambda: ModerationService.load_model(model_path=pickle_path), repeat) * 1000,
+        "load_model_artifact_ms": best_of(lambda: ModerationService.load_model(model_path=artifact_path), repeat) * 1000,
+    }
+    ModerationService.model = None
+    ModerationService.model_version = None
+    return metrics
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Микробенчмарки предсказания, признаков и загрузки модели")
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    args = parser.parse_args()
+
+    requests = make_requests(1024)
+    silence_service_logs()
+
+    started = time.perf_counter()
+    metrics = {
+        **bench_predict(requests, args.iterations),
+        **bench_features(requests, args.iterations),
+        **bench_loading(args.repeat),
+    }
+    for name, value in metrics.items():
+        print(f"{name:>36} {value:>10.3f}")
+    print(f"{'total_s':>36} {time.perf_counter() - started:>10.1f}")
+
+    if args.output:
+        save_results(args.output, "micro", metrics, {"iterations": args.iterations, "repeat": args.repeat})
+    if args.baseline:
+        return report_regressions(check_regressions(metrics, args.baseline, args.tolerance))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
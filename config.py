@@ -0,0 +1,71 @@
+import os
+
+
+BATCHING_ENABLED = os.getenv("BATCHING_ENABLED", "false") == "true"
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "2"))
+BATCH_MAX_QUEUE = int(os.getenv("BATCH_MAX_QUEUE", "1024"))
+
+INFERENCE_MODE = os.getenv("INFERENCE_MODE", "inline")
+INFERENCE_POOL_SIZE = int(os.getenv("INFERENCE_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+INFERENCE_QUEUE_DEPTH = int(os.getenv("INFERENCE_QUEUE_DEPTH", "64"))
+
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "sklearn")
+
+WARMUP_BATCH_SIZE = int(os.getenv("WARMUP_BATCH_SIZE", "64"))
+READINESS_POLL_INTERVAL = float(os.getenv("READINESS_POLL_INTERVAL", "0.5"))
+
+ADMISSION_TARGET_MS = float(os.getenv("ADMISSION_TARGET_MS", "0"))
+ADMISSION_INTERVAL_MS = float(os.getenv("ADMISSION_INTERVAL_MS", "100"))
+ADMISSION_MAX_RETRY_AFTER = int(os.getenv("ADMISSION_MAX_RETRY_AFTER", "30"))
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "0"))
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "false") == "true"
+DEDUP_WINDOW_MS = float(os.getenv("DEDUP_WINDOW_MS", "0"))
+DEDUP_MAX_ENTRIES = int(os.getenv("DEDUP_MAX_ENTRIES", "10000"))
+
+USE_MLFLOW = os.getenv("USE_MLFLOW", "false") == "true"
+MODEL_NAME = os.getenv("MODEL_NAME", "moderation_model")
+MODEL_PATH = os.getenv("MODEL_PATH", "model.pkl")
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", "0"))
+MODELS_DIR = os.getenv("MODELS_DIR", "artifacts")
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+SELLER_STORE = os.getenv("SELLER_STORE", "memory")
+SELLER_STORE_PATH = os.getenv("SELLER_STORE_PATH", "sellers.db")
+SELLER_AGGREGATES_PATH = os.getenv("SELLER_AGGREGATES_PATH", "")
+SELLER_CACHE_SIZE = int(os.getenv("SELLER_CACHE_SIZE", "100000"))
+
+CHALLENGER_PATH = os.getenv("CHALLENGER_PATH", "")
+CHALLENGER_VERSION = os.getenv("CHALLENGER_VERSION", "challenger")
+CHALLENGER_TRAFFIC_SHARE = float(os.getenv("CHALLENGER_TRAFFIC_SHARE", "0"))
+CHALLENGER_SHADOW = os.getenv("CHALLENGER_SHADOW", "true") == "true"
+
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1024"))
+SHADOW_BATCH_SIZE = int(os.getenv("SHADOW_BATCH_SIZE", "64"))
+SHADOW_MAX_WAIT_MS = float(os.getenv("SHADOW_MAX_WAIT_MS", "5"))
+
+POLICY_PATH = os.getenv("POLICY_PATH", "")
+POLICY_RELOAD_INTERVAL = float(os.getenv("POLICY_RELOAD_INTERVAL", "0"))
+POLICY_MAX_CATEGORY = int(os.getenv("POLICY_MAX_CATEGORY", "100000"))
+
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "moderation-service"))
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true") == "true"
+
+FAST_ROUTES = os.getenv("FAST_ROUTES", "false") == "true"
+
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "1024"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+
+WORKERS = int(os.getenv("WORKERS", "1"))
+WORKER_STATS_DIR = os.getenv("WORKER_STATS_DIR", "")
+WORKER_STATS_INTERVAL = float(os.getenv("WORKER_STATS_INTERVAL", "1"))
+BOOTSTRAP_ROWS = int(os.getenv("BOOTSTRAP_ROWS", "0"))
@@ -1,2 +1,8 @@
 class ModelNotLoadedError(Exception):
     ...
+
+
+class ServiceOverloadedError(Exception):
+    def __init__(self, message: str = "Сервис перегружен, повторите запрос позже.", retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
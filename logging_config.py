@@ -0,0 +1,86 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import config
+
+SERVICE_LOGGER = "services"
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class KeyValueFormatter(logging.Formatter):
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.message = f"{record.message} - " + ", ".join(f"{key}: {value}" for key, value in fields.items())
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+_sample_rate: float = config.LOG_SAMPLE_RATE
+
+
+def setup_logging(
+    level: str = config.LOG_LEVEL,
+    log_format: str = config.LOG_FORMAT,
+    sample_rate: float = config.LOG_SAMPLE_RATE,
+    handler: Optional[logging.Handler] = None,
+):
+    global _listener, _listener_pid, _sample_rate
+    shutdown_logging()
+
+    if handler is None:
+        handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if log_format == "json" else KeyValueFormatter(TEXT_FORMAT))
+
+    records = queue.SimpleQueue()
+    logger = logging.getLogger(SERVICE_LOGGER)
+    logger.handlers = [QueueHandler(records)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+    _sample_rate = sample_rate
+
+
+def ensure_logging():
+    if _listener is None or _listener_pid != os.getpid():
+        setup_logging()
+
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+
+
+def should_sample() -> bool:
+    return _sample_rate >= 1.0 or random.random() < _sample_rate
+
+
+atexit.register(shutdown_logging)
@@ -1,26 +1,74 @@
 from fastapi import FastAPI
-from routers.moderation import root_router
+from routers.moderation import fast_router, root_router
+from routers.admin import admin_router
+from routers.health import health_router
+from routers.metrics import MetricsMiddleware, metrics_router
 from services.moderation_service import ModerationService
+from services.batcher import batcher
+from services.admission import admission
+from services.executor import executor
+from services.health import readiness
+from services.shadow import shadow
+from services.reloader import policy_reloader, reloader
+from services.workers import worker_stats
+import config
 import uvicorn
 from contextlib import asynccontextmanager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    if not config.ADMIN_TOKEN:
+        print("ADMIN_TOKEN не задан, изменяющие административные эндпоинты отключены")
     try:
-        import os
-        use_mlflow = os.getenv("USE_MLFLOW", "false") == "true"
-        if use_mlflow:
-            ModerationService.load_model("moderation_model")
+        if ModerationService.model is not None:
+            print(f"Модель уже загружена, версия: {ModerationService.model_version}")
+        elif config.USE_MLFLOW:
+            ModerationService.load_model(config.MODEL_NAME)
         else:
-            ModerationService.load_model(model_path="model.pkl")
+            ModerationService.load_model(model_path=config.MODEL_PATH)
     except Exception as e:
+        readiness.last_error = str(e)
         print(f"Ошибка при загрузке модели: {e}")
+    if config.POLICY_PATH:
+        try:
+            policy_reloader.reload(force=True)
+        except Exception as e:
+            print(f"Ошибка при загрузке правил порогов: {e}")
+    if config.CHALLENGER_PATH:
+        try:
+            ModerationService.load_registry_model(config.CHALLENGER_VERSION, path=config.CHALLENGER_PATH)
+            ModerationService.registry.set_challenger(
+                config.CHALLENGER_VERSION, config.CHALLENGER_TRAFFIC_SHARE, config.CHALLENGER_SHADOW
+            )
+        except Exception as e:
+            print(f"Ошибка при загрузке модели-претендента: {e}")
+    executor.start()
+    if config.BATCHING_ENABLED:
+        await batcher.start()
+    await reloader.start()
+    await policy_reloader.start()
+    await shadow.start()
+    await admission.start()
+    await worker_stats.start()
+    await readiness.start(app)
     yield
+    await readiness.stop()
+    await worker_stats.stop()
+    await admission.stop()
+    await shadow.stop()
+    await policy_reloader.stop()
+    await reloader.stop()
+    await batcher.stop()
+    executor.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
-app.include_router(root_router, prefix="/predict")
+app.include_router(fast_router if config.FAST_ROUTES else root_router, prefix="/predict")
+app.include_router(admin_router, prefix="/admin")
+app.include_router(health_router, prefix="/health")
+app.include_router(metrics_router)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -1,9 +1,8 @@
-from mlflow.exceptions import MlflowTraceDataNotFound
 import numpy as np
 from sklearn.linear_model import LogisticRegression
 import pickle
-import mlflow
 import os
+import hashlib
 from typing import Optional
 
 
@@ -28,6 +27,20 @@ def load_model(path: str = "model.pkl"):
         return pickle.load(f)
 
 
+def get_model_file_version(path: str = "model.pkl") -> Optional[str]:
+    if os.path.isdir(path):
+        from model_artifact import read_artifact_meta
+        try:
+            return read_artifact_meta(path)["version"]
+        except FileNotFoundError:
+            return None
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:12]
+    except FileNotFoundError:
+        return None
+
+
 def save_model_mlflow(
     model,
     model_name: str = "moderation_model",
@@ -35,6 +48,8 @@ def save_model_mlflow(
     tracking_uri: Optional[str] = None,
     experiment_name: str = "moderation"
 ):
+    import mlflow
+
     if tracking_uri is None:
         tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "http://127.0.0.1:5001")
     
@@ -66,16 +81,39 @@ def save_model_mlflow(
     return model_uri
 
 
+def get_latest_model_version(
+    model_name: str = "moderation_model",
+    tracking_uri: Optional[str] = None
+) -> Optional[str]:
+    import mlflow
+
+    if tracking_uri is None:
+        tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "http://127.0.0.1:5001")
+
+    mlflow.set_tracking_uri(tracking_uri)
+
+    try:
+        versions = mlflow.MlflowClient().search_model_versions(f"name='{model_name}'")
+    except Exception as e:
+        raise FileNotFoundError(f"Не удалось получить версии модели '{model_name}': {e}")
+    if not versions:
+        return None
+    return str(max(int(version.version) for version in versions))
+
+
 def load_model_mlflow(
     model_name: Optional[str] = None,
-    tracking_uri: Optional[str] = None
+    tracking_uri: Optional[str] = None,
+    version: Optional[str] = None
 ):
+    import mlflow
+
     if tracking_uri is None:
         tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "http://127.0.0.1:5001")
     
     mlflow.set_tracking_uri(tracking_uri)
     
     try:
-        return mlflow.sklearn.load_model(f"models:/{model_name}/latest")
+        return mlflow.sklearn.load_model(f"models:/{model_name}/{version or 'latest'}")
     except Exception as e:
         raise FileNotFoundError(f"Модель '{model_name}' не найдена или произошла ошибка при загрузке: {e}")
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from services.features import FEATURE_NAMES as _FEATURE_NAMES, FEATURE_SCALES as _FEATURE_SCALES
+from services.seller_store import LISTING_COUNT_SCALE, SELLER_FEATURE_NAMES
+
+FORMAT_NAME = "moderation-linear"
+FORMAT_VERSION = 1
+ARTIFACT_SUFFIX = ".artifact"
+META_FILE = "meta.json"
+FEATURE_NAMES = list(_FEATURE_NAMES)
+FEATURE_SCALES = _FEATURE_SCALES.tolist()
+SELLER_FEATURE_SCALES = [1.0, LISTING_COUNT_SCALE]
+FEATURE_SCHEMAS = {
+    len(FEATURE_NAMES): (FEATURE_NAMES, FEATURE_SCALES),
+    len(FEATURE_NAMES) + len(SELLER_FEATURE_NAMES): (
+        FEATURE_NAMES + list(SELLER_FEATURE_NAMES), FEATURE_SCALES + SELLER_FEATURE_SCALES
+    ),
+}
+CLIP_RANGE = [0.0, 1.0]
+
+
+class LinearModelArtifact:
+    def __init__(self, path: str, meta: dict, weights: np.ndarray):
+        self.path = path
+        self.meta = meta
+        self.version: str = meta["version"]
+        self.threshold: float = meta["threshold"]
+        self.coef_ = weights[:-1].reshape(1, -1)
+        self.intercept_ = weights[-1:]
+        self.classes_ = np.array(meta["classes"])
+        self.n_features_in_ = self.coef_.shape[1]
+
+    def __reduce__(self):
+        return load_model_artifact, (self.path,)
+
+    def decision_function(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef_[0] + self.intercept_[0]
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.stack([1.0 - positive, positive], axis=1)
+
+
+def is_artifact_path(path: str) -> bool:
+    return os.path.isdir(path) or path.endswith(ARTIFACT_SUFFIX)
+
+
+def write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_model_artifact(model, path: str = "model.artifact", version: Optional[str] = None, threshold: float = 0.5) -> str:
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    classes = [int(c) for c in model.classes_]
+    schema = FEATURE_SCHEMAS.get(coef.shape[1]) if coef.ndim == 2 and coef.shape[0] == 1 else None
+    if schema is None or classes != [0, 1]:
+        raise ValueError(f"Модель {type(model).__name__} не поддерживается форматом {FORMAT_NAME}")
+    weights = np.ascontiguousarray(np.append(coef[0], float(model.intercept_[0])), dtype="<f8")
+
+    os.makedirs(path, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path, prefix=".tmp-", suffix=".npy")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, weights)
+    with open(tmp_path, "rb") as f:
+        checksum = hashlib.sha256(f.read()).hexdigest()
+    weights_file = f"weights-{checksum[:16]}.npy"
+    os.replace(tmp_path, os.path.join(path, weights_file))
+
+    meta = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "version": version or checksum[:12],
+        "features": schema[0],
+        "scales": schema[1],
+        "clip": CLIP_RANGE,
+        "threshold": threshold,
+        "classes": classes,
+        "weights": weights_file,
+        "checksum": checksum,
+    }
+    if hasattr(model, "t_"):
+        meta["sgd_t"] = float(model.t_)
+    write_atomic(os.path.join(path, META_FILE), json.dumps(meta, indent=2).encode())
+
+    for name in os.listdir(path):
+        if name.startswith("weights-") and name != weights_file:
+            os.unlink(os.path.join(path, name))
+    return meta["version"]
+
+
+def read_artifact_meta(path: str) -> dict:
+    with open(os.path.join(path, META_FILE), "rb") as f:
+        meta = json.loads(f.read())
+    if meta.get("format") != FORMAT_NAME or meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемый формат артефакта: {meta.get('format')} v{meta.get('format_version')}")
+    schema = FEATURE_SCHEMAS.get(len(meta["features"]))
+    if schema is None or (meta["features"], meta["scales"]) != schema or meta["clip"] != CLIP_RANGE:
+        raise ValueError("Схема признаков артефакта не совпадает со схемой сервиса")
+    return meta
+
+
+def load_model_artifact(path: str = "model.artifact", mmap: bool = True, verify: bool = True) -> LinearModelArtifact:
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Артефакт модели не найден: {path}")
+    meta = read_artifact_meta(path)
+    weights_path = os.path.join(path, meta["weights"])
+    if verify:
+        with open(weights_path, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() != meta["checksum"]:
+                raise ValueError(f"Контрольная сумма артефакта не совпадает: {path}")
+    weights = np.load(weights_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+    if weights.shape != (len(meta["features"]) + 1,):
+        raise ValueError(f"Некорректная форма весов в артефакте: {weights.shape}")
+    return LinearModelArtifact(path, meta, weights)
+
+
+def load_local_model(path: str = "model.pkl"):
+    if is_artifact_path(path):
+        return load_model_artifact(path)
+    from model import load_model
+    return load_model(path)
+
+
+if __name__ == "__main__":
+    from model import load_model
+
+    if len(sys.argv) != 3:
+        print("Использование: python model_artifact.py model.pkl model.artifact")
+        sys.exit(1)
+    print(save_model_artifact(load_model(sys.argv[1]), sys.argv[2]))
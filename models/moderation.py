@@ -1,3 +1,4 @@
+from typing import List, Sequence
 from pydantic import BaseModel, Field
 
 
@@ -14,3 +15,21 @@ class PredictionRequest(BaseModel):
 class PredictionResponse(BaseModel):
     is_violation: bool = Field(..., description="Предсказание модели")
     probability: float = Field(..., description="Вероятность нарушения")
+
+
+class BatchPredictionRequest(BaseModel):
+    items: List[PredictionRequest] = Field(..., description="Объявления для пакетной модерации")
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse] = Field(..., description="Предсказания в порядке запроса")
+
+
+def render_prediction(is_violation: bool, probability: float) -> bytes:
+    if is_violation:
+        return b'{"is_violation":true,"probability":%r}' % float(probability)
+    return b'{"is_violation":false,"probability":%r}' % float(probability)
+
+
+def render_predictions(violations: Sequence[bool], probabilities: Sequence[float]) -> bytes:
+    return b'{"predictions":[' + b",".join(map(render_prediction, violations, probabilities)) + b"]}"
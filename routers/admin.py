@@ -0,0 +1,136 @@
+import asyncio
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+import config
+from services.dedup import dedup
+from services.executor import executor
+from services.moderation_service import ModerationService
+from services.registry import resolve_model_path
+from services.reloader import policy_reloader, reloader
+from services.shadow import shadow
+from services.workers import worker_stats
+
+
+async def require_admin_token(request: Request, x_admin_token: Optional[str] = Header(None)):
+    if not config.ADMIN_TOKEN:
+        if request.method not in ("GET", "HEAD"):
+            raise HTTPException(status_code=403, detail="Изменяющие административные запросы отключены: не задан ADMIN_TOKEN")
+        return
+    if not hmac.compare_digest(x_admin_token or "", config.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Неверный токен администратора")
+
+
+admin_router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@admin_router.get("/cache")
+async def cache_stats():
+    if ModerationService.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **ModerationService.cache.stats()}
+
+
+@admin_router.get("/dedup")
+async def dedup_stats():
+    return dedup.stats()
+
+
+@admin_router.get("/sellers")
+async def seller_feature_stats():
+    return {"enabled": ModerationService.uses_seller_features(), **ModerationService.seller_features.stats()}
+
+
+@admin_router.get("/workers")
+async def workers_info():
+    workers = await asyncio.to_thread(worker_stats.collect)
+    return {"count": len(workers), "current": worker_stats.index, "workers": workers}
+
+
+@admin_router.get("/model")
+async def model_info():
+    return {**ModerationService.model_info(), "source": reloader.source, "last_error": reloader.last_error}
+
+
+@admin_router.post("/model/reload")
+async def reload_model():
+    try:
+        reloaded = await asyncio.to_thread(reloader.reload, True)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Ошибка при перезагрузке модели: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка при перезагрузке модели: {str(e)}")
+    return {"reloaded": reloaded, **ModerationService.model_info(), "source": reloader.source}
+
+
+@admin_router.get("/policy")
+async def policy_info():
+    return {
+        **ModerationService.policy.describe(),
+        "source": policy_reloader.source,
+        "last_error": policy_reloader.last_error,
+    }
+
+
+@admin_router.post("/policy/reload")
+async def reload_policy():
+    try:
+        reloaded = await asyncio.to_thread(policy_reloader.reload, True)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Ошибка при перезагрузке правил: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка при перезагрузке правил: {str(e)}")
+    return {"reloaded": reloaded, **ModerationService.policy.describe(), "source": policy_reloader.source}
+
+
+@admin_router.get("/models")
+async def registry_info():
+    return {**ModerationService.registry.describe(), "shadow_stats": shadow.stats()}
+
+
+@admin_router.post("/models/{version}")
+async def load_registry_model(version: str, path: Optional[str] = None, model_name: Optional[str] = None):
+    try:
+        if path:
+            path = resolve_model_path(path, config.MODELS_DIR)
+        await asyncio.to_thread(ModerationService.load_registry_model, version, path, model_name)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=f"Ошибка при загрузке модели в реестр: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Ошибка при загрузке модели в реестр: {str(e)}")
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Ошибка при загрузке модели в реестр: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка при загрузке модели в реестр: {str(e)}")
+    executor.refresh()
+    return ModerationService.registry.describe()
+
+
+@admin_router.delete("/models/{version}")
+async def remove_registry_model(version: str):
+    try:
+        ModerationService.registry.remove(version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Ошибка при удалении модели: {e.args[0]}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=f"Ошибка при удалении модели: {str(e)}")
+    return ModerationService.registry.describe()
+
+
+@admin_router.post("/challenger")
+async def set_challenger(version: str, traffic_share: float = 0.0, shadow_scoring: bool = True):
+    try:
+        ModerationService.registry.set_challenger(version, traffic_share, shadow_scoring)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Ошибка при выборе претендента: {e.args[0]}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Ошибка при выборе претендента: {str(e)}")
+    executor.refresh()
+    return ModerationService.registry.describe()
+
+
+@admin_router.delete("/challenger")
+async def clear_challenger():
+    ModerationService.registry.clear_challenger()
+    executor.refresh()
+    return ModerationService.registry.describe()
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services.health import readiness
+
+health_router = APIRouter()
+
+
+@health_router.get("/live")
+async def live():
+    return {"status": "ok"}
+
+
+@health_router.get("/ready")
+async def ready():
+    status = readiness.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content=status)
+    return status
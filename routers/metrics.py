@@ -0,0 +1,41 @@
+import time
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services import metrics
+from services.health import warming_up
+
+metrics_router = APIRouter()
+
+INSTRUMENTED_ROUTES = {"/predict/": "predict", "/predict/batch": "predict_batch"}
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        route = INSTRUMENTED_ROUTES.get(scope.get("path")) if scope["type"] == "http" else None
+        if route is None or not metrics.registry.enabled or warming_up.get():
+            await self.app(scope, receive, send)
+            return
+
+        timings = metrics.RequestTimings(time.perf_counter())
+        token = metrics.request_timings.set(timings)
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                if timings.handler_finished is not None:
+                    metrics.STAGE_SECONDS.observe(time.perf_counter() - timings.handler_finished, ("serialization",))
+                elif timings.handler_started is None and message["status"] == 422:
+                    metrics.record_request(route, "invalid")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            metrics.request_timings.reset(token)
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def render_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,22 +1,174 @@
-from fastapi import APIRouter, HTTPException
+import email.message
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple, Type, TypeVar
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.requests import ClientDisconnect
 from services.moderation_service import ModerationService
-from models.moderation import PredictionRequest, PredictionResponse
-from errors import ModelNotLoadedError
+from services.batcher import batcher
+from services.dedup import dedup
+from services.admission import admission
+from services.executor import executor
+from services.health import warming_up
+from services.shadow import shadow
+from services.streaming import score_ndjson
+from models.moderation import (
+    BatchPredictionRequest,
+    BatchPredictionResponse,
+    PredictionRequest,
+    PredictionResponse,
+    render_prediction,
+    render_predictions,
+)
+from errors import ModelNotLoadedError, ServiceOverloadedError
+from services import metrics
 
 root_router = APIRouter()
+fast_router = APIRouter()
 
-@root_router.post("/", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
+RequestModel = TypeVar("RequestModel", bound=BaseModel)
+
+
+class BodyStreamingResponse(StreamingResponse):
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+@contextmanager
+def handle_prediction_errors(route: str):
     try:
-        return ModerationService.predict(request)
+        yield
     except ModelNotLoadedError as e:
+        metrics.record_request(route, "model_not_loaded")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Ошибка при обработке запроса: {str(e)}",
+        )
+    except ServiceOverloadedError as e:
+        metrics.record_request(route, "overloaded")
         raise HTTPException(
             status_code=503,
             detail=f"Ошибка при обработке запроса: {str(e)}",
+            headers={"Retry-After": str(e.retry_after)},
         )
     except Exception as e:
+        metrics.record_request(route, "error")
         raise HTTPException(
             status_code=500,
             detail=f"Ошибка при обработке запроса: {str(e)}",
         )
 
+
+async def prefetch_sellers(requests: Iterable[PredictionRequest]):
+    if ModerationService.uses_seller_features():
+        await ModerationService.seller_features.prefetch(request.seller_id for request in requests)
+
+
+async def compute_prediction(request: PredictionRequest) -> PredictionResponse:
+    await prefetch_sellers((request,))
+    if batcher.running:
+        response = await batcher.submit(request)
+    else:
+        response = await executor.run(ModerationService.predict, request)
+    shadow.submit(request, response.probability, response.is_violation)
+    return response
+
+
+async def predict_one(request: PredictionRequest) -> PredictionResponse:
+    if warming_up.get():
+        probabilities, violations = await executor.run(ModerationService.warm_up, None, [request])
+        return PredictionResponse(is_violation=bool(violations[0]), probability=float(probabilities[0]))
+    metrics.handler_started()
+    with handle_prediction_errors("predict"):
+        admission.check()
+        response = await dedup.run(request, compute_prediction)
+    metrics.record_request("predict", "success")
+    metrics.handler_finished()
+    return response
+
+
+async def score_items(items: List[PredictionRequest]) -> Tuple[np.ndarray, np.ndarray]:
+    if warming_up.get():
+        return await executor.run(ModerationService.warm_up, None, items)
+    metrics.handler_started()
+    with handle_prediction_errors("predict_batch"):
+        admission.check()
+        await prefetch_sellers(items)
+        probabilities, violations = await executor.run(ModerationService.score_batch, items)
+    shadow.submit_batch(items, probabilities, violations)
+    metrics.record_request("predict_batch", "success")
+    return probabilities, violations
+
+
+@root_router.post("/", response_model=PredictionResponse)
+async def predict(request: PredictionRequest):
+    return await predict_one(request)
+
+
+@root_router.post("/batch", response_model=BatchPredictionResponse)
+async def predict_batch(request: BatchPredictionRequest):
+    probabilities, violations = await score_items(request.items)
+    predictions = [
+        PredictionResponse(is_violation=is_violation, probability=probability)
+        for is_violation, probability in zip(violations.tolist(), probabilities.tolist())
+    ]
+    metrics.handler_finished()
+    return BatchPredictionResponse(predictions=predictions)
+
+
+def is_json_content_type(content_type: Optional[str]) -> bool:
+    if content_type == "application/json":
+        return True
+    if not content_type:
+        return False
+    message = email.message.Message()
+    message["content-type"] = content_type
+    subtype = message.get_content_subtype()
+    return message.get_content_maintype() == "application" and (subtype == "json" or subtype.endswith("+json"))
+
+
+async def parse_body(http_request: Request, model: Type[RequestModel]) -> RequestModel:
+    body = await http_request.body()
+    if not body:
+        raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
+    try:
+        if is_json_content_type(http_request.headers.get("content-type")):
+            return model.model_validate_json(body)
+        return model.model_validate(body, from_attributes=True)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
+
+@fast_router.post("/", response_model=PredictionResponse)
+async def predict_fast(http_request: Request):
+    response = await predict_one(await parse_body(http_request, PredictionRequest))
+    return Response(render_prediction(response.is_violation, response.probability), media_type="application/json")
+
+
+@fast_router.post("/batch", response_model=BatchPredictionResponse)
+async def predict_batch_fast(http_request: Request):
+    request = await parse_body(http_request, BatchPredictionRequest)
+    probabilities, violations = await score_items(request.items)
+    metrics.handler_finished()
+    return Response(render_predictions(violations.tolist(), probabilities.tolist()), media_type="application/json")
+
+
+@root_router.post("/stream")
+@fast_router.post("/stream")
+async def predict_stream(http_request: Request):
+    if ModerationService.model is None:
+        metrics.record_request("predict_stream", "model_not_loaded")
+        raise HTTPException(
+            status_code=503,
+            detail="Ошибка при обработке запроса: Модель не загружена.",
+        )
+    metrics.record_request("predict_stream", "success")
+    return BodyStreamingResponse(score_ndjson(http_request.stream()), media_type="application/x-ndjson")
@@ -0,0 +1,338 @@
+import abc
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import config
+from services.moderation_service import ModerationService
+from services.policy import ThresholdPolicy
+
+FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+INPUT_COLUMNS = ("seller_id", "item_id", "is_verified_seller", "images_qty", "description", "category")
+TRUE_VALUES = frozenset(("1", "true", "True", "TRUE"))
+SCAN_BLOCK_BYTES = 64 * 1024
+
+Task = Tuple[str, str, tuple]
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Не удалось определить формат файла: {path}")
+    return FORMATS[extension]
+
+
+def _import_parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Для формата parquet требуется пакет pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def _skip_to_boundary(f, quote_aware: bool, parity: int) -> Tuple[int, int]:
+    consumed = 0
+    while True:
+        piece = f.read(SCAN_BLOCK_BYTES)
+        if not piece:
+            return consumed, parity
+        offset = 0
+        while True:
+            newline = piece.find(b"\n", offset)
+            if newline < 0:
+                break
+            if quote_aware:
+                parity ^= piece.count(b'"', offset, newline) & 1
+            offset = newline + 1
+            if not parity:
+                f.seek(offset - len(piece), os.SEEK_CUR)
+                return consumed + offset, parity
+        if quote_aware:
+            parity ^= piece.count(b'"', offset) & 1
+        consumed += len(piece)
+
+
+def split_ranges(path: str, start: int, chunk_bytes: int, quote_aware: bool) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        parity = 0
+        while position < size:
+            if quote_aware:
+                block = f.read(chunk_bytes)
+                parity ^= block.count(b'"') & 1
+                skipped = len(block)
+            else:
+                skipped = min(chunk_bytes, size - position)
+                f.seek(skipped, os.SEEK_CUR)
+            consumed, parity = _skip_to_boundary(f, quote_aware, parity)
+            end = position + skipped + consumed
+            ranges.append((position, end))
+            position = end
+    return ranges
+
+
+def plan_tasks(path: str, fmt: str, chunk_bytes: int, label: Optional[str] = None) -> List[Task]:
+    if fmt == "parquet":
+        _, parquet = _import_parquet()
+        row_groups = parquet.ParquetFile(path).num_row_groups
+        return [(fmt, path, (i,)) for i in range(row_groups)]
+    if fmt == "csv":
+        with open(path, "rb") as f:
+            header_line = f.readline()
+        header = tuple(next(csv.reader([header_line.decode("utf-8")])))
+        missing = [name for name in INPUT_COLUMNS + ((label,) if label else ()) if name not in header]
+        if missing:
+            raise ValueError(f"Отсутствуют колонки: {', '.join(missing)}")
+        ranges = split_ranges(path, len(header_line), chunk_bytes, quote_aware=True)
+        return [(fmt, path, (start, end, header)) for start, end in ranges]
+    if fmt == "ndjson":
+        return [(fmt, path, (start, end)) for start, end in split_ranges(path, 0, chunk_bytes, quote_aware=False)]
+    raise ValueError(f"Неподдерживаемый формат: {fmt}")
+
+
+def _read_range(path: str, start: int, end: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode("utf-8")
+
+
+def _read_csv(path: str, start: int, end: int, header: Sequence[str], label: Optional[str] = None) -> Dict[str, np.ndarray]:
+    rows = [row for row in csv.reader(io.StringIO(_read_range(path, start, end), newline="")) if row]
+    values = list(zip(*rows)) if rows else [()] * len(header)
+    columns = {name: values[header.index(name)] for name in INPUT_COLUMNS}
+    result = {}
+    if label:
+        result[label] = np.fromiter(
+            (value in TRUE_VALUES for value in values[header.index(label)]), dtype=np.int64, count=len(rows)
+        )
+    return {
+        **result,
+        "seller_id": np.asarray(columns["seller_id"], dtype=np.int64),
+        "item_id": np.asarray(columns["item_id"], dtype=np.int64),
+        "is_verified_seller": np.fromiter(
+            (value in TRUE_VALUES for value in columns["is_verified_seller"]), dtype=bool, count=len(rows)
+        ),
+        "images_qty": np.asarray(columns["images_qty"], dtype=np.int64),
+        "description_length": np.fromiter(map(len, columns["description"]), dtype=np.int64, count=len(rows)),
+        "category": np.asarray(columns["category"], dtype=np.int64),
+    }
+
+
+def _read_ndjson(path: str, start: int, end: int, label: Optional[str] = None) -> Dict[str, np.ndarray]:
+    records = [json.loads(line) for line in _read_range(path, start, end).splitlines() if line.strip()]
+    result = {}
+    if label:
+        result[label] = np.fromiter((r[label] for r in records), dtype=np.int64, count=len(records))
+    return {
+        **result,
+        "seller_id": np.fromiter((r["seller_id"] for r in records), dtype=np.int64, count=len(records)),
+        "item_id": np.fromiter((r["item_id"] for r in records), dtype=np.int64, count=len(records)),
+        "is_verified_seller": np.fromiter((r["is_verified_seller"] for r in records), dtype=bool, count=len(records)),
+        "images_qty": np.fromiter((r["images_qty"] for r in records), dtype=np.int64, count=len(records)),
+        "description_length": np.fromiter((len(r["description"]) for r in records), dtype=np.int64, count=len(records)),
+        "category": np.fromiter((r["category"] for r in records), dtype=np.int64, count=len(records)),
+    }
+
+
+def _read_parquet(path: str, row_groups: Sequence[int], label: Optional[str] = None) -> Dict[str, np.ndarray]:
+    pyarrow, parquet = _import_parquet()
+    import pyarrow.compute
+
+    names = list(INPUT_COLUMNS) + ([label] if label else [])
+    table = parquet.ParquetFile(path).read_row_groups(list(row_groups), columns=names)
+    columns = {
+        name: table.column(name).to_numpy()
+        for name in ("seller_id", "item_id", "is_verified_seller", "images_qty", "category")
+    }
+    columns["description_length"] = pyarrow.compute.utf8_length(table.column("description")).to_numpy()
+    if label:
+        columns[label] = table.column(label).to_numpy().astype(np.int64)
+    return columns
+
+
+def read_task(task: Task, label: Optional[str] = None) -> Dict[str, np.ndarray]:
+    fmt, path, spec = task
+    if fmt == "csv":
+        return _read_csv(path, *spec, label=label)
+    if fmt == "ndjson":
+        return _read_ndjson(path, *spec, label=label)
+    return _read_parquet(path, spec, label)
+
+
+def score_task(task: Task) -> Dict[str, np.ndarray]:
+    columns = read_task(task)
+    probabilities, violations = ModerationService.score_columns(columns)
+    return {
+        "seller_id": columns["seller_id"],
+        "item_id": columns["item_id"],
+        "is_violation": violations,
+        "probability": probabilities,
+    }
+
+
+def load_scoring_state(model_name: str, model_path: str, policy_path: str = ""):
+    if policy_path:
+        ModerationService.policy = ThresholdPolicy.from_file(policy_path)
+    ModerationService.load_model(model_name, model_path)
+
+
+def _init_worker(model_name: str, model_path: str, policy_path: str):
+    load_scoring_state(model_name, model_path, policy_path)
+
+
+class ResultWriter(abc.ABC):
+    @abc.abstractmethod
+    def write(self, result: Dict[str, np.ndarray]):
+        pass
+
+    @abc.abstractmethod
+    def close(self):
+        pass
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TextResultWriter(ResultWriter):
+    header = ""
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._file.write(self.header)
+
+    def close(self):
+        self._file.close()
+
+
+class CsvResultWriter(TextResultWriter):
+    header = "seller_id,item_id,is_violation,probability\n"
+
+    def write(self, result: Dict[str, np.ndarray]):
+        self._file.write("".join(
+            f"{seller_id},{item_id},{'true' if is_violation else 'false'},{probability!r}\n"
+            for seller_id, item_id, is_violation, probability in zip(
+                result["seller_id"].tolist(),
+                result["item_id"].tolist(),
+                result["is_violation"].tolist(),
+                result["probability"].tolist(),
+            )
+        ))
+
+
+class NdjsonResultWriter(TextResultWriter):
+    def write(self, result: Dict[str, np.ndarray]):
+        self._file.write("".join(
+            f'{{"seller_id":{seller_id},"item_id":{item_id},'
+            f'"is_violation":{"true" if is_violation else "false"},"probability":{probability!r}}}\n'
+            for seller_id, item_id, is_violation, probability in zip(
+                result["seller_id"].tolist(),
+                result["item_id"].tolist(),
+                result["is_violation"].tolist(),
+                result["probability"].tolist(),
+            )
+        ))
+
+
+class ParquetResultWriter(ResultWriter):
+    def __init__(self, path: str):
+        pyarrow, parquet = _import_parquet()
+        self._pyarrow = pyarrow
+        self._writer = parquet.ParquetWriter(path, pyarrow.schema([
+            ("seller_id", pyarrow.int64()),
+            ("item_id", pyarrow.int64()),
+            ("is_violation", pyarrow.bool_()),
+            ("probability", pyarrow.float64()),
+        ]))
+
+    def write(self, result: Dict[str, np.ndarray]):
+        self._writer.write_table(self._pyarrow.table(result, schema=self._writer.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {"csv": CsvResultWriter, "ndjson": NdjsonResultWriter, "parquet": ParquetResultWriter}
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    processes: int = 1,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    chunk_bytes: int = 8 * 1024 * 1024,
+    model_name: str = config.MODEL_NAME,
+    model_path: str = config.MODEL_PATH,
+    policy_path: str = config.POLICY_PATH,
+) -> int:
+    tasks = plan_tasks(input_path, detect_format(input_path, input_format), chunk_bytes)
+    rows = 0
+    with WRITERS[detect_format(output_path, output_format)](output_path) as writer:
+        load_scoring_state(model_name, model_path, policy_path)
+        if processes <= 1:
+            for result in map(score_task, tasks):
+                writer.write(result)
+                rows += len(result["probability"])
+        else:
+            with Pool(processes, initializer=_init_worker, initargs=(model_name, model_path, policy_path)) as pool:
+                for result in pool.imap(score_task, tasks):
+                    writer.write(result)
+                    rows += len(result["probability"])
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетная оценка объявлений моделью модерации")
+    parser.add_argument("input", help="Входной файл: csv, parquet или ndjson")
+    parser.add_argument("output", help="Выходной файл: csv, parquet или ndjson")
+    parser.add_argument("--input-format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--output-format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-bytes", type=int, default=8 * 1024 * 1024)
+    parser.add_argument("--model-name", default=config.MODEL_NAME)
+    parser.add_argument("--model-path", default=config.MODEL_PATH)
+    parser.add_argument("--policy", dest="policy_path", default=config.POLICY_PATH, help="JSON-файл правил порогов")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = score_file(
+        args.input,
+        args.output,
+        processes=args.processes,
+        input_format=args.input_format,
+        output_format=args.output_format,
+        chunk_bytes=args.chunk_bytes,
+        model_name=args.model_name,
+        model_path=args.model_path,
+        policy_path=args.policy_path,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Обработано строк: {rows} за {elapsed:.2f} с ({rows / elapsed:,.0f} строк/с)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+import config
+from artifact_cache import file_lock
+from logging_config import ensure_logging
+from main import app
+from services.moderation_service import ModerationService
+from services.workers import worker_stats
+
+MIN_WORKER_LIFETIME = 1.0
+
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def bootstrap_model(model_path: str, rows: int) -> bool:
+    if rows <= 0 or os.path.exists(model_path):
+        return False
+    with file_lock(f"{model_path}.lock"):
+        if os.path.exists(model_path):
+            return False
+        from training import iter_synthetic_chunks, publish, train
+
+        model, stats = train(lambda: iter_synthetic_chunks(rows))
+        version = publish(model, model_path)
+        log(f"Модель обучена при запуске - строк: {stats.rows}, версия: {version}, файл: {model_path}")
+        return True
+
+
+def preload_model(model_path: str, bootstrap_rows: int = 0):
+    if config.USE_MLFLOW:
+        ModerationService.load_model(config.MODEL_NAME)
+    else:
+        bootstrap_model(model_path, bootstrap_rows)
+        ModerationService.load_model(model_path=model_path)
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(index: int, sock: socket.socket, stats_dir: str, log_level: str):
+    ensure_logging()
+    worker_stats.configure(index, stats_dir)
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level.lower(), lifespan="on"))
+    server.run(sockets=[sock])
+
+
+class Supervisor:
+    def __init__(self, sock: socket.socket, workers: int, stats_dir: str, log_level: str = config.LOG_LEVEL):
+        if workers < 1:
+            raise ValueError("Количество воркеров должно быть не меньше 1")
+        self.sock = sock
+        self.workers = workers
+        self.stats_dir = stats_dir
+        self.log_level = log_level
+        self.stopping = False
+        self.restarts = 0
+        self.children: Dict[int, int] = {}
+        self._started: Dict[int, float] = {}
+
+    def spawn(self, index: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                run_worker(index, self.sock, self.stats_dir, self.log_level)
+            except BaseException as e:
+                log(f"Воркер {index} завершился с ошибкой: {e}")
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        self.children[pid] = index
+        self._started[pid] = time.monotonic()
+        return pid
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        gc.freeze()
+        for index in range(self.workers):
+            self.spawn(index)
+        log(f"Запущено воркеров: {self.workers}, pid: {sorted(self.children)}, статистика: {self.stats_dir}")
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self.children.pop(pid, None)
+            started = self._started.pop(pid, time.monotonic())
+            if index is None or self.stopping:
+                continue
+            log(f"Воркер {index} (pid {pid}) завершился с кодом {os.waitstatus_to_exitcode(status)}, перезапуск")
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            self.restarts += 1
+            self.spawn(index)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Запуск сервиса модерации в нескольких процессах с общей моделью")
+    parser.add_argument("--workers", type=int, default=config.WORKERS)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8003)
+    parser.add_argument("--model-path", default=config.MODEL_PATH)
+    parser.add_argument("--bootstrap-rows", type=int, default=config.BOOTSTRAP_ROWS,
+                        help="Обучить модель на синтетических данных, если файл модели отсутствует")
+    parser.add_argument("--stats-dir", default=config.WORKER_STATS_DIR)
+    parser.add_argument("--log-level", default=config.LOG_LEVEL)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers должно быть не меньше 1")
+
+    started = time.perf_counter()
+    preload_model(args.model_path, args.bootstrap_rows)
+    log(f"Модель загружена в родительском процессе за {time.perf_counter() - started:.3f} с, "
+        f"версия: {ModerationService.model_version}")
+
+    stats_dir = args.stats_dir or tempfile.mkdtemp(prefix="moderation-workers-")
+    sock = bind_socket(args.host, args.port)
+    try:
+        Supervisor(sock, args.workers, stats_dir, args.log_level).run()
+    finally:
+        sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
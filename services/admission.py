@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+
+import config
+from errors import ServiceOverloadedError
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+LAG_SAMPLES_PER_INTERVAL = 10
+
+
+class WindowedMin:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last = 0.0
+        self._start = time.monotonic()
+        self._min = math.inf
+
+    def _roll(self, now: float):
+        elapsed = now - self._start
+        if elapsed < self.interval:
+            return
+        self.last = self._min if elapsed < 2 * self.interval and self._min != math.inf else 0.0
+        self._start = now
+        self._min = math.inf
+
+    def observe(self, value: float, now: float):
+        self._roll(now)
+        if value < self._min:
+            self._min = value
+
+    def value(self, now: float) -> float:
+        self._roll(now)
+        return self.last
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        target_ms: float = config.ADMISSION_TARGET_MS,
+        interval_ms: float = config.ADMISSION_INTERVAL_MS,
+        max_retry_after: int = config.ADMISSION_MAX_RETRY_AFTER,
+    ):
+        if target_ms < 0 or interval_ms <= 0:
+            raise ValueError("Некорректные параметры контроля допуска")
+        self.target = target_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self.max_retry_after = max_retry_after
+        self.shed = 0
+        self._queue = WindowedMin(self.interval)
+        self._lag = WindowedMin(self.interval)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.target > 0
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._sample_loop_lag())
+        logger.info(
+            f"Контроль допуска включён - целевая задержка очереди: {self.target * 1000:.1f} мс, "
+            f"окно: {self.interval * 1000:.0f} мс"
+        )
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _sample_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        period = self.interval / LAG_SAMPLES_PER_INTERVAL
+        while True:
+            scheduled = loop.time() + period
+            await asyncio.sleep(period)
+            self._lag.observe(max(loop.time() - scheduled, 0.0), time.monotonic())
+
+    def observe_queue(self, delay: float):
+        if self.enabled:
+            self._queue.observe(delay, time.monotonic())
+
+    def queue_latency(self) -> float:
+        now = time.monotonic()
+        return max(self._queue.value(now), self._lag.value(now))
+
+    def retry_after(self, latency: float) -> int:
+        return min(self.max_retry_after, max(1, math.ceil(latency)))
+
+    def check(self):
+        if not self.enabled:
+            return
+        latency = self.queue_latency()
+        if latency > self.target:
+            self.shed += 1
+            raise ServiceOverloadedError(
+                f"Сервис перегружен: задержка очереди {latency * 1000:.0f} мс, повторите запрос позже.",
+                self.retry_after(latency),
+            )
+
+
+admission = AdmissionController()
+
+metrics.registry.register(metrics.Gauge(
+    "moderation_admission_queue_latency_seconds", "Minimum queue latency over the last admission window",
+    callback=lambda: {(): admission.queue_latency()} if admission.enabled else {},
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_admission_shed_total", "Requests rejected by admission control",
+    callback=lambda: {(): admission.shed}, kind="counter",
+))
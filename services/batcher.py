@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import List, Optional, Set, Tuple
+
+import config
+from errors import ServiceOverloadedError
+from models.moderation import PredictionRequest, PredictionResponse
+from services import metrics
+from services.moderation_service import ModerationService
+from services.executor import InferenceExecutor, executor as default_executor
+
+logger = logging.getLogger(__name__)
+
+_Pending = Tuple[PredictionRequest, asyncio.Future]
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        max_batch_size: int = config.BATCH_MAX_SIZE,
+        max_wait_ms: float = config.BATCH_MAX_WAIT_MS,
+        executor: Optional[InferenceExecutor] = None,
+        max_queue: int = config.BATCH_MAX_QUEUE,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size должен быть положительным")
+        if max_queue < 1:
+            raise ValueError("max_queue должен быть положительным")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue = max_queue
+        self.executor = executor or default_executor
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Микробатчинг запущен - max_batch_size: {self.max_batch_size}, "
+            f"max_wait_ms: {self.max_wait * 1000:.1f}, max_queue: {self.max_queue}"
+        )
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Микробатчинг остановлен"))
+        logger.info("Микробатчинг остановлен")
+
+    async def submit(self, request: PredictionRequest) -> PredictionResponse:
+        if not self.running:
+            raise RuntimeError("Микробатчинг не запущен")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((request, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ServiceOverloadedError("Сервис перегружен, повторите запрос позже.")
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[_Pending]):
+        pending = [(request, future) for request, future in batch if not future.done()]
+        if not pending:
+            return
+        self.batches += 1
+        self.items += len(pending)
+        try:
+            results = await self.executor.run(ModerationService.predict_batch, [request for request, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+batcher = MicroBatcher()
+
+metrics.registry.register(metrics.Gauge(
+    "moderation_batcher_queue_depth", "Requests waiting in the micro-batcher queue",
+    callback=lambda: {(): batcher.queue_depth},
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_batcher_rejected_total", "Requests rejected because the micro-batcher queue was full",
+    callback=lambda: {(): batcher.rejected}, kind="counter",
+))
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+import config
+from models.moderation import PredictionRequest, PredictionResponse
+from services import metrics
+from services.moderation_service import ModerationService
+
+Compute = Callable[[PredictionRequest], Awaitable[PredictionResponse]]
+
+
+def request_key(request: PredictionRequest) -> Tuple[int, int, bool, str, str, int, int]:
+    return (
+        request.item_id,
+        request.seller_id,
+        request.is_verified_seller,
+        request.name,
+        request.description,
+        request.category,
+        request.images_qty,
+    )
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        enabled: bool = config.DEDUP_ENABLED,
+        window_ms: float = config.DEDUP_WINDOW_MS,
+        max_entries: int = config.DEDUP_MAX_ENTRIES,
+    ):
+        if window_ms < 0 or max_entries < 1:
+            raise ValueError("Некорректные параметры дедупликации запросов")
+        self.enabled = enabled
+        self.window = window_ms / 1000.0
+        self.max_entries = max_entries
+        self.executed = 0
+        self.coalesced = 0
+        self.window_hits = 0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    async def run(self, request: PredictionRequest, compute: Compute) -> PredictionResponse:
+        if not self.enabled:
+            return await compute(request)
+        key = request_key(request)
+        response = self._recent(key)
+        if response is not None:
+            self.window_hits += 1
+            return response
+        task = self._inflight.get(key)
+        if task is None:
+            self.executed += 1
+            model, policy = ModerationService.model, ModerationService.policy
+            task = asyncio.ensure_future(compute(request))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, model, policy))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _recent(self, key: Hashable):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        expires_at, model, policy, response = entry
+        if expires_at <= time.monotonic() or model is not ModerationService.model or policy is not ModerationService.policy:
+            del self._results[key]
+            return None
+        return response
+
+    def _finish(self, key: Hashable, task: asyncio.Future, model, policy):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None or self.window <= 0:
+            return
+        if model is not ModerationService.model or policy is not ModerationService.policy:
+            return
+        self._results[key] = (time.monotonic() + self.window, model, policy, task.result())
+        self._results.move_to_end(key)
+        now = time.monotonic()
+        while self._results and (len(self._results) > self.max_entries or next(iter(self._results.values()))[0] <= now):
+            self._results.popitem(last=False)
+
+    def clear(self):
+        self._results.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window * 1000,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "window_hits": self.window_hits,
+            "in_flight": len(self._inflight),
+            "window_size": len(self._results),
+        }
+
+
+dedup = SingleFlight()
+
+metrics.registry.register(metrics.Gauge(
+    "moderation_dedup_requests_total", "Single prediction requests by deduplication outcome", ("outcome",),
+    callback=lambda: {
+        ("executed",): dedup.executed,
+        ("coalesced",): dedup.coalesced,
+        ("window_hit",): dedup.window_hits,
+    } if dedup.enabled else {},
+    kind="counter",
+))
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import pickle
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+import config
+from errors import ServiceOverloadedError
+from logging_config import ensure_logging
+from services import metrics
+from services.admission import admission
+from services.moderation_service import ModerationService
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+INFERENCE_MODES = ("inline", "thread", "process")
+
+
+def _init_worker(model_bytes: Optional[bytes], policy_bytes: bytes, registry_bytes: bytes):
+    ensure_logging()
+    ModerationService.model = pickle.loads(model_bytes) if model_bytes is not None else None
+    ModerationService.policy = pickle.loads(policy_bytes)
+    ModerationService.registry = pickle.loads(registry_bytes)
+    metrics.registry.drain()
+
+
+def _timed_call(submitted: float, fn: Callable[..., T], *args):
+    return time.monotonic() - submitted, fn(*args)
+
+
+def _process_call(submitted: float, fn: Callable[..., T], *args):
+    delay, result = _timed_call(submitted, fn, *args)
+    return delay, result, metrics.registry.drain()
+
+
+class InferenceExecutor:
+    def __init__(
+        self,
+        mode: str = config.INFERENCE_MODE,
+        pool_size: int = config.INFERENCE_POOL_SIZE,
+        queue_depth: int = config.INFERENCE_QUEUE_DEPTH,
+    ):
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Неизвестный режим инференса: {mode}")
+        if pool_size < 1 or queue_depth < 0:
+            raise ValueError("Некорректный размер пула или очереди")
+        self.mode = mode
+        self.pool_size = pool_size
+        self.queue_depth = queue_depth
+        self.in_flight = 0
+        self.rejected = 0
+        self._pool: Optional[Executor] = None
+
+    @property
+    def max_in_flight(self) -> int:
+        return self.pool_size + self.queue_depth
+
+    def _create_pool(self) -> Executor:
+        if self.mode == "thread":
+            return ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="inference")
+        model = ModerationService.model
+        return ProcessPoolExecutor(
+            max_workers=self.pool_size,
+            initializer=_init_worker,
+            initargs=(
+                pickle.dumps(model) if model is not None else None,
+                pickle.dumps(ModerationService.policy),
+                pickle.dumps(ModerationService.registry),
+            ),
+        )
+
+    def start(self):
+        if self._pool is not None or self.mode == "inline":
+            return
+        self._pool = self._create_pool()
+        logger.info(
+            f"Пул инференса запущен - режим: {self.mode}, "
+            f"размер пула: {self.pool_size}, глубина очереди: {self.queue_depth}"
+        )
+
+    def refresh(self):
+        if self.mode != "process" or self._pool is None:
+            return
+        previous, self._pool = self._pool, self._create_pool()
+        previous.shutdown(wait=False)
+
+    def shutdown(self):
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+        logger.info("Пул инференса остановлен")
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            raise ServiceOverloadedError("Сервис перегружен, повторите запрос позже.")
+        self.in_flight += 1
+        try:
+            if self._pool is None:
+                return fn(*args)
+            loop = asyncio.get_running_loop()
+            if self.mode == "process":
+                delay, result, drained = await loop.run_in_executor(
+                    self._pool, _process_call, time.monotonic(), fn, *args
+                )
+                metrics.registry.merge(drained)
+            else:
+                delay, result = await loop.run_in_executor(self._pool, _timed_call, time.monotonic(), fn, *args)
+            admission.observe_queue(delay)
+            return result
+        finally:
+            self.in_flight -= 1
+
+
+executor = InferenceExecutor()
+
+metrics.registry.register(metrics.Gauge(
+    "moderation_inference_in_flight", "Inference calls currently running or queued",
+    callback=lambda: {(): executor.in_flight},
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_inference_rejected_total", "Inference calls rejected because the executor was full",
+    callback=lambda: {(): executor.rejected}, kind="counter",
+))
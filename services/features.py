@@ -0,0 +1,94 @@
+import threading
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.moderation import PredictionRequest
+
+FEATURE_NAMES = ("is_verified_seller", "images_qty", "description_length", "category")
+FEATURE_SCALES = np.array([1.0, 10.0, 1000.0, 100.0])
+N_FEATURES = len(FEATURE_NAMES)
+KEY_LIMITS = np.array([1, 10, 1000, 100])
+
+
+class FeatureEncoder:
+    def __init__(self):
+        self._local = threading.local()
+
+    def _row_buffer(self) -> np.ndarray:
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.empty(N_FEATURES, dtype=np.float64)
+        return row
+
+    @staticmethod
+    def _batch_buffer(n: int, out: Optional[np.ndarray]) -> np.ndarray:
+        if out is None:
+            return np.empty((n, N_FEATURES), dtype=np.float64)
+        if out.shape[0] < n or out.shape[1:] != (N_FEATURES,) or out.dtype != np.float64:
+            raise ValueError(f"Буфер признаков должен иметь форму (>={n}, {N_FEATURES}) и тип float64")
+        return out[:n]
+
+    def encode(self, request: PredictionRequest) -> np.ndarray:
+        row = self._row_buffer()
+        row[0] = 1.0 if request.is_verified_seller else 0.0
+        row[1] = min(max(request.images_qty / 10.0, 0.0), 1.0)
+        row[2] = min(len(request.description) / 1000.0, 1.0)
+        row[3] = min(max(request.category / 100.0, 0.0), 1.0)
+        return row
+
+    @staticmethod
+    def key(request: PredictionRequest) -> Tuple[bool, int, int, int]:
+        return (
+            request.is_verified_seller,
+            min(request.images_qty, 10),
+            min(len(request.description), 1000),
+            min(max(request.category, 0), 100),
+        )
+
+    def encode_keys(self, requests: Sequence[PredictionRequest]) -> np.ndarray:
+        n = len(requests)
+        keys = np.empty((n, N_FEATURES), dtype=np.int64)
+        keys[:, 0] = np.fromiter((r.is_verified_seller for r in requests), dtype=np.int64, count=n)
+        keys[:, 1] = np.fromiter((r.images_qty for r in requests), dtype=np.int64, count=n)
+        keys[:, 2] = np.fromiter((len(r.description) for r in requests), dtype=np.int64, count=n)
+        keys[:, 3] = np.fromiter((r.category for r in requests), dtype=np.int64, count=n)
+        np.clip(keys, 0, KEY_LIMITS, out=keys)
+        return keys
+
+    def encode_batch(self, requests: Sequence[PredictionRequest], out: Optional[np.ndarray] = None) -> np.ndarray:
+        n = len(requests)
+        features = self._batch_buffer(n, out)
+        features[:, 0] = np.fromiter((r.is_verified_seller for r in requests), dtype=np.float64, count=n)
+        features[:, 1] = np.fromiter((r.images_qty for r in requests), dtype=np.float64, count=n)
+        features[:, 2] = np.fromiter((len(r.description) for r in requests), dtype=np.float64, count=n)
+        features[:, 3] = np.fromiter((r.category for r in requests), dtype=np.float64, count=n)
+        return self._finish(features)
+
+    def encode_columns(self, columns: Mapping[str, Sequence], out: Optional[np.ndarray] = None) -> np.ndarray:
+        n = self._check_columns(columns)
+        features = self._batch_buffer(n, out)
+        for i, name in enumerate(FEATURE_NAMES):
+            features[:, i] = columns[name]
+        return self._finish(features)
+
+    def encode_column_keys(self, columns: Mapping[str, Sequence]) -> np.ndarray:
+        n = self._check_columns(columns)
+        keys = np.empty((n, N_FEATURES), dtype=np.int64)
+        for i, name in enumerate(FEATURE_NAMES):
+            keys[:, i] = columns[name]
+        np.clip(keys, 0, KEY_LIMITS, out=keys)
+        return keys
+
+    @staticmethod
+    def _check_columns(columns: Mapping[str, Sequence]) -> int:
+        missing = [name for name in FEATURE_NAMES if name not in columns]
+        if missing:
+            raise ValueError(f"Отсутствуют колонки признаков: {', '.join(missing)}")
+        return len(columns[FEATURE_NAMES[0]])
+
+    @staticmethod
+    def _finish(features: np.ndarray) -> np.ndarray:
+        features /= FEATURE_SCALES
+        np.clip(features, 0.0, 1.0, out=features)
+        return features
@@ -0,0 +1,141 @@
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Optional
+
+import config
+from models.moderation import BatchPredictionRequest
+from services.executor import executor
+from services.moderation_service import ModerationService, warmup_requests
+
+logger = logging.getLogger(__name__)
+
+warming_up: contextvars.ContextVar[bool] = contextvars.ContextVar("warming_up", default=False)
+
+
+async def asgi_post(app, path: str, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 0),
+    }
+    status = 0
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            await asyncio.Event().wait()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+class Readiness:
+    def __init__(
+        self,
+        warmup_batch_size: int = config.WARMUP_BATCH_SIZE,
+        poll_interval: float = config.READINESS_POLL_INTERVAL,
+    ):
+        self.warmup_batch_size = warmup_batch_size
+        self.poll_interval = poll_interval
+        self.warmed_up = False
+        self.draining = False
+        self.warmup_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed_up and not self.draining and ModerationService.model is not None
+
+    def status(self) -> dict:
+        if self.draining:
+            reason = "draining"
+        elif ModerationService.model is None:
+            reason = "model_not_loaded"
+        elif not self.warmed_up:
+            reason = "warming_up"
+        else:
+            reason = None
+        return {
+            "ready": reason is None,
+            "reason": reason,
+            "model_version": ModerationService.model_version,
+            "warmup_seconds": self.warmup_seconds,
+            "last_error": self.last_error,
+        }
+
+    async def start(self, app, prefix: str = "/predict"):
+        if self._task is not None:
+            return
+        self.draining = False
+        self._task = asyncio.create_task(self._run(app, prefix))
+
+    async def stop(self):
+        self.draining = True
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, app, prefix: str):
+        while True:
+            if ModerationService.model is not None:
+                try:
+                    await self.warm_up(app, prefix)
+                    return
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.error(f"Ошибка прогрева сервиса: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def warm_up(self, app, prefix: str = "/predict"):
+        started = time.perf_counter()
+        requests = warmup_requests(self.warmup_batch_size)
+        if requests:
+            token = warming_up.set(True)
+            try:
+                batch = BatchPredictionRequest(items=requests).model_dump_json().encode()
+                await asyncio.gather(*(
+                    self._post(app, f"{prefix}/batch", batch)
+                    for _ in range(executor.pool_size if executor.mode != "inline" else 1)
+                ))
+                for request in requests:
+                    await self._post(app, f"{prefix}/", request.model_dump_json().encode())
+            finally:
+                warming_up.reset(token)
+        self.warmup_seconds = time.perf_counter() - started
+        self.warmed_up = True
+        self.last_error = None
+        logger.info(f"Сервис прогрет и готов - запросов: {len(requests)}, время: {self.warmup_seconds:.3f} с")
+
+    @staticmethod
+    async def _post(app, path: str, body: bytes):
+        status = await asgi_post(app, path, body)
+        if status != 200:
+            raise RuntimeError(f"Запрос прогрева {path} завершился с кодом {status}")
+
+
+readiness = Readiness()
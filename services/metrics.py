@@ -0,0 +1,267 @@
+import contextvars
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import config
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+PROBABILITY_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0)
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Sharded:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, labels: LabelValues = (), amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def drain(self) -> Dict[LabelValues, float]:
+        totals = self.values()
+        for shard in list(self._shards):
+            shard.clear()
+        return totals
+
+    def merge(self, totals: Dict[LabelValues, float]):
+        for labels, value in totals.items():
+            self.inc(labels, value)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.values().items())
+        ]
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels: LabelValues = ()):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def snapshot(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        merged: Dict[LabelValues, Tuple[List[int], float]] = {}
+        for shard in list(self._shards):
+            for labels, (counts, total) in list(shard.items()):
+                merged_counts, merged_total = merged.get(labels, ([0] * len(counts), 0.0))
+                merged[labels] = ([a + b for a, b in zip(merged_counts, counts)], merged_total + total)
+        return merged
+
+    def drain(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        merged = self.snapshot()
+        for shard in list(self._shards):
+            shard.clear()
+        return merged
+
+    def merge(self, snapshot: Dict[LabelValues, Tuple[List[int], float]]):
+        shard = self._shard()
+        for labels, (counts, total) in snapshot.items():
+            state = shard.get(labels)
+            if state is None:
+                state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0] = [a + b for a, b in zip(state[0], counts)]
+            state[1] += total
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable] = None,
+        kind: str = "gauge",
+    ):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, labels: LabelValues = ()):
+        self._values[labels] = value
+
+    def values(self) -> Dict[LabelValues, float]:
+        if self.callback is not None:
+            return self.callback()
+        return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.values().items())
+            if value is not None
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def drain(self) -> Dict[str, dict]:
+        drained = {}
+        for metric in self._metrics:
+            if isinstance(metric, _Sharded):
+                state = metric.drain()
+                if state:
+                    drained[metric.name] = state
+        return drained
+
+    def merge(self, drained: Dict[str, dict]):
+        for metric in self._metrics:
+            state = drained.get(metric.name)
+            if state and isinstance(metric, _Sharded):
+                metric.merge(state)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimings:
+    __slots__ = ("started", "handler_started", "handler_finished")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.handler_started: Optional[float] = None
+        self.handler_finished: Optional[float] = None
+
+
+request_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+registry = MetricsRegistry(enabled=config.METRICS_ENABLED)
+
+REQUESTS = registry.register(Counter(
+    "moderation_requests_total", "Prediction requests by route and outcome", ("route", "outcome"),
+))
+PREDICTIONS = registry.register(Counter(
+    "moderation_predictions_total", "Scored listings by decision", ("is_violation",),
+))
+PROBABILITY = registry.register(Histogram(
+    "moderation_probability", "Predicted violation probability", buckets=PROBABILITY_BUCKETS,
+))
+BATCH_VIOLATION_RATE = registry.register(Histogram(
+    "moderation_batch_violation_rate", "Share of violations per scored batch", buckets=PROBABILITY_BUCKETS,
+))
+STAGE_SECONDS = registry.register(Histogram(
+    "moderation_stage_seconds", "Latency of request processing stages", ("stage",),
+))
+
+
+def handler_started():
+    timings = request_timings.get()
+    if timings is not None:
+        timings.handler_started = time.perf_counter()
+        STAGE_SECONDS.observe(timings.handler_started - timings.started, ("validation",))
+
+
+def handler_finished():
+    timings = request_timings.get()
+    if timings is not None:
+        timings.handler_finished = time.perf_counter()
+
+
+def record_request(route: str, outcome: str):
+    if registry.enabled:
+        REQUESTS.inc((route, outcome))
+
+
+def record_prediction(probability: float, is_violation: bool):
+    PREDICTIONS.inc(("true" if is_violation else "false",))
+    PROBABILITY.observe(probability)
+
+
+def record_batch(probabilities: Sequence[float], violations: int):
+    for probability in probabilities:
+        PROBABILITY.observe(probability)
+    PREDICTIONS.inc(("true",), violations)
+    PREDICTIONS.inc(("false",), len(probabilities) - violations)
+    if probabilities:
+        BATCH_VIOLATION_RATE.observe(violations / len(probabilities))
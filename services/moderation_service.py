@@ -1,94 +1,408 @@
 import logging
 import os
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+import config
 from models.moderation import PredictionRequest, PredictionResponse
-from model import load_model_mlflow, save_model_mlflow, train_model, load_model, save_model
+from model import get_model_file_version
+from artifact_cache import load_model_mlflow_cached
+from model_artifact import load_local_model
 from errors import ModelNotLoadedError
 from sklearn.linear_model import LogisticRegression
+from services.scorer import CompiledLogisticScorer, LookupTableScorer, build_lookup_table, compile_scorer
+from services.features import N_FEATURES, FeatureEncoder
+from services.cache import PredictionCache
+from services.policy import DEFAULT_THRESHOLD, ThresholdPolicy
+from services.registry import ModelRegistry
+from services.seller_store import N_SELLER_FEATURES, SellerFeatureCache, create_seller_store
+from logging_config import ensure_logging, should_sample
+from services import metrics
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+ensure_logging()
 
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+MAX_COMPILED_MODELS = 4
 
 
-THRESHOLD = 0.5
+def warmup_requests(n: int) -> List[PredictionRequest]:
+    return [
+        PredictionRequest(
+            seller_id=i,
+            is_verified_seller=i % 2 == 0,
+            item_id=i,
+            name=f"warmup {i}",
+            description="w" * (i * 97 % 1200),
+            category=i * 7 % 120,
+            images_qty=i % 12,
+        )
+        for i in range(n)
+    ]
+
+
+WARMUP_REQUESTS = warmup_requests(8)
 
 
 class ModerationService:
     model: LogisticRegression = None
+    model_version: Optional[str] = None
+    model_loaded_at: Optional[float] = None
+    model_load_duration: Optional[float] = None
+    backend: str = config.INFERENCE_BACKEND
+    encoder: FeatureEncoder = FeatureEncoder()
+    policy: ThresholdPolicy = ThresholdPolicy()
+    registry: ModelRegistry = ModelRegistry()
+    seller_features: SellerFeatureCache = SellerFeatureCache(
+        create_seller_store(config.SELLER_STORE, config.SELLER_STORE_PATH, config.SELLER_AGGREGATES_PATH),
+        config.SELLER_CACHE_SIZE,
+    )
+    cache: Optional[PredictionCache] = (
+        PredictionCache(config.PREDICTION_CACHE_SIZE, config.PREDICTION_CACHE_TTL)
+        if config.PREDICTION_CACHE_SIZE > 0 else None
+    )
+    _compiled: Dict[int, Tuple[object, str, Optional[CompiledLogisticScorer]]] = {}
+    _versioned: Tuple[Optional[LogisticRegression], int] = (None, 0)
 
     @classmethod
     def load_model(cls, model_name: str = "moderation_model", model_path: str = "model.pkl"):
         use_mlflow = os.getenv("USE_MLFLOW", "false") == "true"
-        
+        started = time.perf_counter()
+
         if use_mlflow:
             try:
-                cls.model = load_model_mlflow(model_name)
-                logger.info(f"Модель загружена из MLflow: {model_name}")
+                model, version = load_model_mlflow_cached(model_name)
             except FileNotFoundError:
-                logger.info(f"Модель не найдена в MLflow: {model_name}. Запускаем обучение")
-                try:
-                    model = train_model()
-                    logger.info(f"Модель обучена, сохраняем в MLflow: {model_name}")
-                    save_model_mlflow(model, model_name)
-                    cls.model = model
-                    logger.info(f"Модель сохранена и загружена: {model_name}")
-                except Exception as e:
-                    logger.error(f"Ошибка при сохранении модели в MLflow: {e}")
-                    raise
+                logger.error(f"Модель не найдена в MLflow: {model_name}. Опубликуйте её: python training.py train")
+                raise
+            logger.info(f"Модель загружена из MLflow: {model_name}, версия: {version}")
         else:
             try:
-                cls.model = load_model(model_path)
-                logger.info(f"Модель загружена из локального файла: {model_path}")
+                model = load_local_model(model_path)
             except FileNotFoundError:
-                logger.info(f"Модель не найдена локально: {model_path}. Запускаем обучение")
-                model = train_model()
-                logger.info(f"Модель обучена, сохраняем локально: {model_path}")
-                save_model(model, model_path)
-                cls.model = model
-                logger.info(f"Модель сохранена и загружена: {model_path}")
-    
+                logger.error(f"Модель не найдена локально: {model_path}. Опубликуйте её: python training.py train")
+                raise
+            logger.info(f"Модель загружена из локального файла: {model_path}")
+            version = get_model_file_version(model_path)
+
+        cls.swap_model(model, version, time.perf_counter() - started)
+        if cls._get_scorer(cls.model) is not None:
+            logger.info("Модель скомпилирована в быстрый скорер")
+
+    @classmethod
+    def warm_up(
+        cls, model=None, requests: Sequence[PredictionRequest] = WARMUP_REQUESTS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        model = cls.model if model is None else model
+        if model is None:
+            raise ModelNotLoadedError("Модель не загружена.")
+        for request in requests:
+            cls._score_one(model, request, None, False, timed=False)
+            cls.policy.threshold(request.seller_id, request.category)
+        probabilities = cls._score_batch(model, requests, timed=False)
+        return probabilities, cls._apply_policy(probabilities, requests)
+
+    @classmethod
+    def swap_model(cls, model, version: Optional[str] = None, load_duration: Optional[float] = None):
+        cls.warm_up(model)
+        threshold = getattr(model, "threshold", DEFAULT_THRESHOLD)
+        if cls.policy.version is None and cls.policy.default != threshold:
+            cls.policy = ThresholdPolicy(default=threshold)
+            logger.info(f"Порог по умолчанию взят из артефакта модели: {threshold}")
+        cls.model = model
+        cls.model_version = version
+        cls.model_loaded_at = time.time()
+        cls.model_load_duration = load_duration
+        cls._get_model_version(model)
+
+    @classmethod
+    def load_registry_model(cls, version: str, path: Optional[str] = None, model_name: Optional[str] = None):
+        model = cls.registry.load(version, path, model_name)
+        cls.warm_up(model)
+        logger.info(f"Модель добавлена в реестр - версия: {version}, источник: {model_name or path}")
+        return model
+
+    @classmethod
+    def model_info(cls) -> dict:
+        return {
+            "loaded": cls.model is not None,
+            "version": cls.model_version,
+            "loaded_at": cls.model_loaded_at,
+            "load_duration": cls.model_load_duration,
+        }
+
+    @classmethod
+    def _get_model_version(cls, model) -> int:
+        versioned_model, version = cls._versioned
+        if versioned_model is not model:
+            version += 1
+            cls._versioned = (model, version)
+            if cls.cache is not None:
+                cls.cache.clear()
+        return version
+
+    @classmethod
+    def uses_seller_features(cls, model=None) -> bool:
+        model = cls.model if model is None else model
+        return getattr(model, "n_features_in_", N_FEATURES) == N_FEATURES + N_SELLER_FEATURES
+
+    @classmethod
+    def _cache_key(cls, model, request: PredictionRequest) -> tuple:
+        key = cls.encoder.key(request)
+        if cls.uses_seller_features(model):
+            key += tuple(cls.seller_features.get_many([request.seller_id])[0].tolist())
+        return key
+
+    @classmethod
+    def _get_scorer(cls, model) -> Optional[CompiledLogisticScorer]:
+        backend = cls.backend
+        if backend not in ("compiled", "lookup"):
+            return None
+        entry = cls._compiled.get(id(model))
+        if entry is not None and entry[0] is model and entry[1] == backend:
+            return entry[2]
+        scorer = build_lookup_table(model) if backend == "lookup" else compile_scorer(model)
+        if scorer is None:
+            logger.warning(f"Модель {type(model).__name__} не поддерживает режим {backend}, используется sklearn")
+        compiled = dict(cls._compiled)
+        compiled[id(model)] = (model, backend, scorer)
+        while len(compiled) > MAX_COMPILED_MODELS:
+            compiled.pop(next(iter(compiled)))
+        cls._compiled = compiled
+        return scorer
+
+    @classmethod
+    def _score_one(
+        cls, model, request: PredictionRequest, key: Optional[tuple], log_request: bool, timed: bool = True
+    ) -> float:
+        timed = timed and metrics.registry.enabled
+        started = time.perf_counter() if timed else 0.0
+        scorer = cls._get_scorer(model)
+        if isinstance(scorer, LookupTableScorer):
+            key = key or cls.encoder.key(request)
+            encoded = time.perf_counter() if timed else 0.0
+            probability = scorer.predict_key(key)
+        else:
+            prepared_data = cls.encoder.encode(request)
+            if cls.uses_seller_features(model):
+                prepared_data = np.concatenate((prepared_data, cls.seller_features.get_many([request.seller_id])[0]))
+            encoded = time.perf_counter() if timed else 0.0
+
+            if log_request:
+                logger.info("Обработанные признаки для модели", extra={"fields": {"features": prepared_data.tolist()}})
+
+            if scorer is not None:
+                probability = scorer.predict_one(prepared_data)
+            else:
+                probability = float(model.predict_proba(prepared_data.reshape(1, -1))[0][1])
+        if timed:
+            metrics.STAGE_SECONDS.observe(encoded - started, ("features",))
+            metrics.STAGE_SECONDS.observe(time.perf_counter() - encoded, ("model",))
+        return probability
+
+    @classmethod
+    def _score_batch(cls, model, requests: Sequence[PredictionRequest], timed: bool = True) -> np.ndarray:
+        timed = timed and metrics.registry.enabled
+        started = time.perf_counter() if timed else 0.0
+        scorer = cls._get_scorer(model)
+        if isinstance(scorer, LookupTableScorer):
+            keys = cls.encoder.encode_keys(requests)
+            encoded = time.perf_counter() if timed else 0.0
+            probabilities = scorer.predict_keys(keys)
+        else:
+            features = cls.encoder.encode_batch(requests)
+            if cls.uses_seller_features(model):
+                features = np.hstack((features, cls.seller_features.get_many([r.seller_id for r in requests])))
+            encoded = time.perf_counter() if timed else 0.0
+            if scorer is not None:
+                probabilities = scorer.predict_proba(features)
+            else:
+                probabilities = model.predict_proba(features)[:, 1]
+        if timed:
+            metrics.STAGE_SECONDS.observe(encoded - started, ("features_batch",))
+            metrics.STAGE_SECONDS.observe(time.perf_counter() - encoded, ("model_batch",))
+        return probabilities
+
+    @classmethod
+    def _score_cached(cls, model, request: PredictionRequest, log_request: bool) -> float:
+        cache = cls.cache
+        if cache is None:
+            return cls._score_one(model, request, None, log_request)
+        key = cls._cache_key(model, request)
+        cache_key = (cls._get_model_version(model), key)
+        probability = cache.get(cache_key)
+        if probability is None:
+            probability = cls._score_one(model, request, key, log_request)
+            cache.put(cache_key, probability)
+        return probability
+
+    @classmethod
+    def _score_batch_cached(cls, model, requests: List[PredictionRequest]) -> np.ndarray:
+        cache = cls.cache
+        if cache is None:
+            return cls._score_batch(model, requests)
+        version = cls._get_model_version(model)
+        keys = [(version, cls.encoder.key(request)) for request in requests]
+        if cls.uses_seller_features(model):
+            sellers = cls.seller_features.get_many([r.seller_id for r in requests]).tolist()
+            keys = [(version, key + tuple(row)) for (version, key), row in zip(keys, sellers)]
+        cached = [cache.get(key) for key in keys]
+        missing = [i for i, probability in enumerate(cached) if probability is None]
+        if missing:
+            scored = cls._score_batch(model, [requests[i] for i in missing])
+            for i, probability in zip(missing, scored.tolist()):
+                cached[i] = probability
+                cache.put(keys[i], probability)
+        return np.array(cached)
+
     @classmethod
     def predict(cls, request: PredictionRequest) -> PredictionResponse:
-        logger.info(
-            f"Запрос на предсказание - seller_id: {request.seller_id}, "
-            f"item_id: {request.item_id}, "
-            f"is_verified_seller: {request.is_verified_seller}, "
-            f"images_qty: {request.images_qty}, "
-            f"description_length: {len(request.description)}, "
-            f"category: {request.category}"
-        )
-        
-        if cls.model is None:
+        log_request = logger.isEnabledFor(logging.INFO) and should_sample()
+        if log_request:
+            logger.info("Запрос на предсказание", extra={"fields": {
+                "seller_id": request.seller_id,
+                "item_id": request.item_id,
+                "is_verified_seller": request.is_verified_seller,
+                "images_qty": request.images_qty,
+                "description_length": len(request.description),
+                "category": request.category,
+            }})
+
+        model = cls.model
+        if model is None:
             raise ModelNotLoadedError("Модель не загружена.")
 
-        import numpy as np
-        
-        prepared_data = np.array([
-            1.0 if request.is_verified_seller else 0.0,
-            request.images_qty / 10.0,
-            len(request.description) / 1000.0,
-            request.category / 100.0,
-        ])
-        
-        prepared_data = np.clip(prepared_data, 0.0, 1.0)
-
-        logger.info(f"Обработанные признаки для модели: {prepared_data.tolist()}")
-        
-        prediction = cls.model.predict_proba([prepared_data.tolist()])
-        probability = float(prediction[0][1])
-        is_violation = probability > THRESHOLD
-        
-        logger.info(
-            f"Результат предсказания - seller_id: {request.seller_id}, "
-            f"item_id: {request.item_id}, "
-            f"is_violation: {is_violation}, "
-            f"probability: {probability:.4f}"
-        )
-        
+        challenger = cls.registry.route(request.item_id)
+        if challenger is not None:
+            probability = cls._score_one(challenger.model, request, None, log_request)
+        else:
+            probability = cls._score_cached(model, request, log_request)
+
+        is_violation = probability > cls.policy.threshold(request.seller_id, request.category)
+        if metrics.registry.enabled:
+            metrics.record_prediction(probability, is_violation)
+
+        if log_request:
+            logger.info("Результат предсказания", extra={"fields": {
+                "seller_id": request.seller_id,
+                "item_id": request.item_id,
+                "is_violation": is_violation,
+                "probability": round(probability, 4),
+            }})
+
         return PredictionResponse(is_violation=is_violation, probability=probability)
+
+    @classmethod
+    def _apply_policy(cls, probabilities: np.ndarray, requests: List[PredictionRequest]) -> np.ndarray:
+        policy = cls.policy
+        if not policy.rules:
+            return probabilities > policy.default
+        categories = np.fromiter((r.category for r in requests), dtype=np.int64, count=len(requests))
+        seller_ids = np.fromiter((r.seller_id for r in requests), dtype=np.int64, count=len(requests))
+        return probabilities > policy.thresholds(categories, seller_ids)
+
+    @classmethod
+    def score_batch(cls, requests: List[PredictionRequest]) -> Tuple[np.ndarray, np.ndarray]:
+        log_batch = logger.isEnabledFor(logging.INFO)
+        if log_batch:
+            logger.info("Запрос на пакетное предсказание", extra={"fields": {"batch_size": len(requests)}})
+
+        model = cls.model
+        if model is None:
+            raise ModelNotLoadedError("Модель не загружена.")
+
+        if not requests:
+            return np.empty(0), np.empty(0, dtype=bool)
+
+        challenger, routed = cls.registry.route_batch([r.item_id for r in requests])
+        if challenger is None:
+            probabilities = cls._score_batch_cached(model, requests)
+        else:
+            probabilities = np.empty(len(requests))
+            champion = np.flatnonzero(~routed)
+            if len(champion):
+                probabilities[champion] = cls._score_batch_cached(model, [requests[i] for i in champion])
+            routed = np.flatnonzero(routed)
+            probabilities[routed] = cls._score_batch(challenger.model, [requests[i] for i in routed])
+        violations = cls._apply_policy(probabilities, requests)
+        if metrics.registry.enabled:
+            metrics.record_batch(probabilities.tolist(), int(violations.sum()))
+
+        if log_batch:
+            logger.info("Результат пакетного предсказания", extra={"fields": {
+                "batch_size": len(requests),
+                "violations": int(violations.sum()),
+            }})
+
+        return probabilities, violations
+
+    @classmethod
+    def score_shadow(cls, requests: List[PredictionRequest]) -> Optional[Tuple[str, np.ndarray, np.ndarray]]:
+        challenger = cls.registry.active
+        if challenger is None or not requests:
+            return None
+        probabilities = cls._score_batch(challenger.model, requests)
+        return challenger.version, probabilities, cls._apply_policy(probabilities, requests)
+
+    @classmethod
+    def score_columns(cls, columns: Mapping[str, Sequence]) -> Tuple[np.ndarray, np.ndarray]:
+        model = cls.model
+        if model is None:
+            raise ModelNotLoadedError("Модель не загружена.")
+
+        scorer = cls._get_scorer(model)
+        if isinstance(scorer, LookupTableScorer):
+            probabilities = scorer.predict_keys(cls.encoder.encode_column_keys(columns))
+        else:
+            features = cls.encoder.encode_columns(columns)
+            if cls.uses_seller_features(model):
+                features = np.hstack((features, cls.seller_features.get_many(np.asarray(columns["seller_id"]).tolist())))
+            if scorer is not None:
+                probabilities = scorer.predict_proba(features)
+            else:
+                probabilities = model.predict_proba(features)[:, 1]
+
+        policy = cls.policy
+        if not policy.rules:
+            return probabilities, probabilities > policy.default
+        return probabilities, probabilities > policy.thresholds(columns["category"], columns.get("seller_id"))
+
+    @classmethod
+    def predict_batch(cls, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        probabilities, violations = cls.score_batch(requests)
+        return [
+            PredictionResponse(is_violation=is_violation, probability=probability)
+            for is_violation, probability in zip(violations.tolist(), probabilities.tolist())
+        ]
+
+
+metrics.registry.register(metrics.Gauge(
+    "moderation_model_info", "Active model version", ("version",),
+    callback=lambda: {(str(ModerationService.model_version),): 1} if ModerationService.model is not None else {},
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_challenger_traffic_share", "Share of traffic routed to the challenger model", ("version",),
+    callback=lambda: {
+        (active.version,): active.traffic_share,
+    } if (active := ModerationService.registry.active) is not None else {},
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_model_load_seconds", "Duration of the last model load",
+    callback=lambda: {(): ModerationService.model_load_duration},
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_policy_rules", "Threshold policy rules by kind", ("version", "kind"),
+    callback=lambda: {
+        (str(ModerationService.policy.version), "categories"): ModerationService.policy.category_rules,
+        (str(ModerationService.policy.version), "sellers"): len(ModerationService.policy.sellers),
+    },
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_seller_features", "Seller feature LRU size, hit/miss counters and store queries", ("stat",),
+    callback=lambda: {(name,): value for name, value in ModerationService.seller_features.stats().items()},
+))
+metrics.registry.register(metrics.Gauge(
+    "moderation_cache", "Prediction cache size and hit/miss/eviction counters", ("stat",),
+    callback=lambda: {
+        (name,): value for name, value in ModerationService.cache.stats().items()
+    } if ModerationService.cache is not None else {},
+))
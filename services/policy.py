@@ -0,0 +1,101 @@
+import hashlib
+import json
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+import config
+
+DEFAULT_THRESHOLD = 0.5
+
+
+def _check_threshold(value) -> float:
+    try:
+        threshold = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Порог должен быть числом: {value!r}")
+    if not 0.0 <= threshold <= 1.0:
+        raise ValueError(f"Порог должен быть в диапазоне [0, 1]: {value}")
+    return threshold
+
+
+class ThresholdPolicy:
+    def __init__(
+        self,
+        default: float = DEFAULT_THRESHOLD,
+        categories: Optional[Mapping[int, float]] = None,
+        sellers: Optional[Mapping[int, float]] = None,
+        version: Optional[str] = None,
+        max_category: int = config.POLICY_MAX_CATEGORY,
+    ):
+        categories = {int(category): _check_threshold(value) for category, value in (categories or {}).items()}
+        if any(category < 0 for category in categories):
+            raise ValueError("Категория в правилах не может быть отрицательной")
+        if categories and max(categories) > max_category:
+            raise ValueError(f"Категория в правилах больше допустимой ({max_category}): {max(categories)}")
+        self.default = _check_threshold(default)
+        self.version = version
+        self.sellers = {int(seller_id): _check_threshold(value) for seller_id, value in (sellers or {}).items()}
+        self._size = max(categories) + 1 if categories else 0
+        self._categories = np.full(self._size + 1, self.default)
+        for category, threshold in categories.items():
+            self._categories[category] = threshold
+        self._category_list = self._categories.tolist()
+        seller_ids = np.fromiter(self.sellers.keys(), dtype=np.int64, count=len(self.sellers))
+        order = np.argsort(seller_ids)
+        self._seller_ids = seller_ids[order]
+        self._seller_thresholds = np.fromiter(self.sellers.values(), dtype=np.float64, count=len(self.sellers))[order]
+        self.rules = len(categories) + len(self.sellers)
+        self.category_rules = len(categories)
+
+    @classmethod
+    def from_json(cls, data: bytes, version: Optional[str] = None) -> "ThresholdPolicy":
+        try:
+            rules = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Некорректный файл правил: {e}")
+        if not isinstance(rules, dict):
+            raise ValueError("Файл правил должен содержать JSON-объект")
+        for section in ("categories", "sellers"):
+            if not isinstance(rules.get(section, {}), dict):
+                raise ValueError(f"Раздел {section} в файле правил должен быть JSON-объектом")
+        return cls(
+            default=rules.get("default", DEFAULT_THRESHOLD),
+            categories=rules.get("categories"),
+            sellers=rules.get("sellers"),
+            version=version or hashlib.sha256(data).hexdigest()[:12],
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "ThresholdPolicy":
+        with open(path, "rb") as f:
+            return cls.from_json(f.read())
+
+    def threshold(self, seller_id: int, category: int) -> float:
+        threshold = self.sellers.get(seller_id)
+        if threshold is not None:
+            return threshold
+        if 0 <= category < self._size:
+            return self._category_list[category]
+        return self.default
+
+    def thresholds(self, categories: np.ndarray, seller_ids: Optional[Sequence[int]] = None) -> np.ndarray:
+        categories = np.asarray(categories, dtype=np.int64)
+        index = np.where((categories >= 0) & (categories < self._size), categories, self._size)
+        thresholds = self._categories[index]
+        if self.sellers and seller_ids is not None:
+            seller_ids = np.asarray(seller_ids, dtype=np.int64)
+            order = np.argsort(seller_ids)
+            ordered = seller_ids[order]
+            positions = np.minimum(np.searchsorted(self._seller_ids, ordered), len(self._seller_ids) - 1)
+            matched = self._seller_ids[positions] == ordered
+            thresholds[order[matched]] = self._seller_thresholds[positions[matched]]
+        return thresholds
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "default": self.default,
+            "categories": self.category_rules,
+            "sellers": len(self.sellers),
+        }
@@ -0,0 +1,127 @@
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from artifact_cache import load_model_mlflow_cached
+from model_artifact import load_local_model
+
+ROUTING_MULTIPLIER = 2654435761
+ROUTING_BUCKETS = 2 ** 32
+
+
+def resolve_model_path(path: str, directory: str) -> str:
+    root = os.path.realpath(directory)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise PermissionError(f"Путь к модели должен находиться в каталоге {directory}: {path}")
+    return resolved
+
+
+class Challenger(NamedTuple):
+    version: str
+    model: object
+    traffic_share: float
+    shadow: bool
+
+
+def routing_bucket(item_id: int) -> float:
+    return (item_id * ROUTING_MULTIPLIER) % ROUTING_BUCKETS / ROUTING_BUCKETS
+
+
+def routing_buckets(item_ids: Sequence[int]) -> np.ndarray:
+    ids = np.asarray(item_ids, dtype=np.int64).astype(np.uint64)
+    return (ids * np.uint64(ROUTING_MULTIPLIER) % np.uint64(ROUTING_BUCKETS)) / ROUTING_BUCKETS
+
+
+class ModelRegistry:
+    def __init__(self):
+        self.models: Dict[str, object] = {}
+        self.active: Optional[Challenger] = None
+        self.routed = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"active": self.active}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.active = state["active"]
+        if self.active is not None:
+            self.models[self.active.version] = self.active.model
+
+    def register(self, version: str, model) -> object:
+        with self._lock:
+            self.models[version] = model
+            active = self.active
+            if active is not None and active.version == version:
+                self.active = active._replace(model=model)
+        return model
+
+    def load(self, version: str, path: Optional[str] = None, model_name: Optional[str] = None) -> object:
+        if model_name:
+            model, _ = load_model_mlflow_cached(model_name, version)
+        elif path:
+            model = load_local_model(path)
+        else:
+            raise ValueError("Нужно указать путь к модели или имя модели в MLflow")
+        return self.register(version, model)
+
+    def remove(self, version: str):
+        with self._lock:
+            if version not in self.models:
+                raise KeyError(f"Модель не найдена в реестре: {version}")
+            if self.active is not None and self.active.version == version:
+                raise ValueError(f"Модель {version} используется как претендент")
+            del self.models[version]
+
+    def set_challenger(self, version: str, traffic_share: float = 0.0, shadow: bool = True):
+        if not 0.0 <= traffic_share <= 1.0:
+            raise ValueError(f"Доля трафика должна быть в диапазоне [0, 1]: {traffic_share}")
+        with self._lock:
+            model = self.models.get(version)
+            if model is None:
+                raise KeyError(f"Модель не найдена в реестре: {version}")
+            self.active = Challenger(version, model, float(traffic_share), bool(shadow))
+            self.routed = 0
+
+    def clear_challenger(self):
+        with self._lock:
+            self.active = None
+            self.routed = 0
+
+    def routes(self, item_id: int) -> bool:
+        active = self.active
+        return active is not None and routing_bucket(item_id) < active.traffic_share
+
+    def route(self, item_id: int) -> Optional[Challenger]:
+        active = self.active
+        if active is None or not active.traffic_share or routing_bucket(item_id) >= active.traffic_share:
+            return None
+        self.routed += 1
+        return active
+
+    def route_batch(self, item_ids: Sequence[int]) -> Tuple[Optional[Challenger], Optional[np.ndarray]]:
+        active = self.active
+        if active is None or not active.traffic_share:
+            return None, None
+        mask = routing_buckets(item_ids) < active.traffic_share
+        routed = int(mask.sum())
+        if not routed:
+            return None, None
+        self.routed += routed
+        return active, mask
+
+    def versions(self) -> List[str]:
+        return sorted(self.models)
+
+    def describe(self) -> dict:
+        active = self.active
+        return {
+            "versions": self.versions(),
+            "challenger": active.version if active is not None else None,
+            "traffic_share": active.traffic_share if active is not None else 0.0,
+            "shadow": active.shadow if active is not None else False,
+            "routed": self.routed,
+        }
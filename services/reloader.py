@@ -0,0 +1,147 @@
+import abc
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+
+import config
+from artifact_cache import load_model_mlflow_cached
+from model import get_latest_model_version, get_model_file_version
+from model_artifact import load_local_model
+from services.executor import executor
+from services.moderation_service import ModerationService
+from services.policy import ThresholdPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicReloader(abc.ABC):
+    subject = ""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    @abc.abstractmethod
+    def source(self) -> str:
+        pass
+
+    @abc.abstractmethod
+    def reload(self, force: bool = False) -> bool:
+        pass
+
+    async def start(self):
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._poll())
+        logger.info(f"Фоновая перезагрузка {self.subject} запущена - источник: {self.source}, интервал: {self.interval} с")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Ошибка при перезагрузке {self.subject}: {e}")
+
+
+class ModelReloader(PeriodicReloader):
+    subject = "модели"
+
+    def __init__(
+        self,
+        model_name: str = config.MODEL_NAME,
+        model_path: str = config.MODEL_PATH,
+        interval: float = config.MODEL_RELOAD_INTERVAL,
+        use_mlflow: bool = config.USE_MLFLOW,
+    ):
+        super().__init__(interval)
+        self.model_name = model_name
+        self.model_path = model_path
+        self.use_mlflow = use_mlflow
+
+    @property
+    def source(self) -> str:
+        return f"mlflow:{self.model_name}" if self.use_mlflow else self.model_path
+
+    def source_version(self) -> Optional[str]:
+        if self.use_mlflow:
+            return get_latest_model_version(self.model_name)
+        return get_model_file_version(self.model_path)
+
+    def reload(self, force: bool = False) -> bool:
+        with self._lock:
+            version = self.source_version()
+            if version is None:
+                raise FileNotFoundError(f"Модель не найдена: {self.source}")
+            if not force and version == ModerationService.model_version:
+                return False
+
+            started = time.perf_counter()
+            if self.use_mlflow:
+                model, version = load_model_mlflow_cached(self.model_name, version)
+            else:
+                model = load_local_model(self.model_path)
+            ModerationService.swap_model(model, version, time.perf_counter() - started)
+            executor.refresh()
+            self.reloads += 1
+            self.last_error = None
+            logger.info(
+                f"Модель перезагружена - источник: {self.source}, версия: {version}, "
+                f"время загрузки: {ModerationService.model_load_duration:.3f} с"
+            )
+            return True
+
+
+class PolicyReloader(PeriodicReloader):
+    subject = "правил"
+
+    def __init__(self, path: str = config.POLICY_PATH, interval: float = config.POLICY_RELOAD_INTERVAL):
+        super().__init__(interval)
+        self.path = path
+
+    @property
+    def source(self) -> str:
+        return self.path
+
+    def reload(self, force: bool = False) -> bool:
+        with self._lock:
+            if not self.path:
+                raise FileNotFoundError("Файл правил не задан")
+            with open(self.path, "rb") as f:
+                data = f.read()
+            version = hashlib.sha256(data).hexdigest()[:12]
+            if not force and version == ModerationService.policy.version:
+                return False
+
+            policy = ThresholdPolicy.from_json(data, version)
+            ModerationService.policy = policy
+            executor.refresh()
+            self.reloads += 1
+            self.last_error = None
+            logger.info(
+                f"Правила порогов перезагружены - источник: {self.path}, версия: {version}, "
+                f"категорий: {policy.category_rules}, продавцов: {len(policy.sellers)}"
+            )
+            return True
+
+
+reloader = ModelReloader()
+policy_reloader = PolicyReloader()
@@ -0,0 +1,76 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from model_artifact import LinearModelArtifact
+
+
+class CompiledLogisticScorer:
+    def __init__(self, coef: np.ndarray, intercept: float):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        z = features @ self.coef
+        z += self.intercept
+        with np.errstate(over="ignore"):
+            np.negative(z, out=z)
+            np.exp(z, out=z)
+        z += 1.0
+        return np.reciprocal(z, out=z)
+
+    def predict_one(self, features: np.ndarray) -> float:
+        z = float(features @ self.coef) + self.intercept
+        if z < -700.0:
+            return 0.0
+        return 1.0 / (1.0 + math.exp(-z))
+
+
+def compile_scorer(model) -> Optional[CompiledLogisticScorer]:
+    if isinstance(model, SGDClassifier):
+        if model.loss != "log_loss":
+            return None
+    elif not isinstance(model, (LogisticRegression, LinearModelArtifact)):
+        return None
+    coef = getattr(model, "coef_", None)
+    classes = getattr(model, "classes_", None)
+    if coef is None or classes is None or coef.shape[0] != 1 or list(classes) != [0, 1]:
+        return None
+    return CompiledLogisticScorer(coef[0], model.intercept_[0])
+
+
+class LookupTableScorer(CompiledLogisticScorer):
+    def __init__(self, coef: np.ndarray, intercept: float):
+        super().__init__(coef, intercept)
+        verified = np.array([0.0, 1.0]) * self.coef[0]
+        images = np.arange(11) / 10.0 * self.coef[1]
+        categories = np.arange(101) / 100.0 * self.coef[3]
+        self.table = self.intercept + verified[:, None, None] + images[None, :, None] + categories[None, None, :]
+        self.length_terms = np.arange(1001) / 1000.0 * self.coef[2]
+        self._table = self.table.ravel().tolist()
+        self._length_terms = self.length_terms.tolist()
+
+    def predict_key(self, key: Tuple[bool, int, int, int]) -> float:
+        verified, images, length, category = key
+        z = self._table[(verified * 11 + images) * 101 + category] + self._length_terms[length]
+        if z < -700.0:
+            return 0.0
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def predict_keys(self, keys: np.ndarray) -> np.ndarray:
+        z = self.table[keys[:, 0], keys[:, 1], keys[:, 3]]
+        z += self.length_terms[keys[:, 2]]
+        with np.errstate(over="ignore"):
+            np.negative(z, out=z)
+            np.exp(z, out=z)
+        z += 1.0
+        return np.reciprocal(z, out=z)
+
+
+def build_lookup_table(model) -> Optional[LookupTableScorer]:
+    scorer = compile_scorer(model)
+    if scorer is None or scorer.coef.shape != (4,):
+        return None
+    return LookupTableScorer(scorer.coef, scorer.intercept)
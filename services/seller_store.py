@@ -0,0 +1,192 @@
+import asyncio
+import csv
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+SELLER_FEATURE_NAMES = ("seller_violation_rate", "seller_listing_count")
+N_SELLER_FEATURES = len(SELLER_FEATURE_NAMES)
+LISTING_COUNT_SCALE = 1000.0
+SQLITE_MAX_VARIABLES = 900
+AGGREGATE_COLUMNS = ("seller_id", "violation_rate", "listing_count")
+
+SellerAggregates = Tuple[float, int]
+
+
+def encode_seller_features(violation_rate: float, listing_count: int) -> Tuple[float, float]:
+    return (
+        min(max(float(violation_rate), 0.0), 1.0),
+        min(max(listing_count / LISTING_COUNT_SCALE, 0.0), 1.0),
+    )
+
+
+DEFAULT_SELLER_FEATURES = encode_seller_features(0.0, 0)
+
+
+class InMemorySellerStore:
+    def __init__(self, aggregates: Optional[Mapping[int, SellerAggregates]] = None):
+        self.aggregates: Dict[int, SellerAggregates] = dict(aggregates or {})
+
+    def put_many(self, rows: Iterable[Tuple[int, float, int]]):
+        for seller_id, violation_rate, listing_count in rows:
+            self.aggregates[seller_id] = (violation_rate, listing_count)
+
+    def fetch_many(self, seller_ids: Sequence[int]) -> Dict[int, SellerAggregates]:
+        get = self.aggregates.get
+        return {seller_id: row for seller_id, row in zip(seller_ids, map(get, seller_ids)) if row is not None}
+
+
+class SQLiteSellerStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS seller_features ("
+                "seller_id INTEGER PRIMARY KEY, violation_rate REAL NOT NULL, listing_count INTEGER NOT NULL)"
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def put_many(self, rows: Iterable[Tuple[int, float, int]]):
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO seller_features (seller_id, violation_rate, listing_count) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def fetch_many(self, seller_ids: Sequence[int]) -> Dict[int, SellerAggregates]:
+        connection = self._connection()
+        result = {}
+        for start in range(0, len(seller_ids), SQLITE_MAX_VARIABLES):
+            chunk = seller_ids[start:start + SQLITE_MAX_VARIABLES]
+            rows = connection.execute(
+                "SELECT seller_id, violation_rate, listing_count FROM seller_features "
+                f"WHERE seller_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            result.update((seller_id, (violation_rate, listing_count)) for seller_id, violation_rate, listing_count in rows)
+        return result
+
+
+def read_seller_aggregates(path: str) -> Iterator[Tuple[int, float, int]]:
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or not set(AGGREGATE_COLUMNS) <= set(reader.fieldnames):
+            raise ValueError(f"Файл агрегатов продавцов должен содержать колонки {', '.join(AGGREGATE_COLUMNS)}: {path}")
+        for row in reader:
+            yield int(row["seller_id"]), float(row["violation_rate"]), int(row["listing_count"])
+
+
+def write_seller_aggregates(path: str, rows: Iterable[Tuple[int, float, int]]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(AGGREGATE_COLUMNS) + "\n")
+        for seller_id, violation_rate, listing_count in rows:
+            f.write(f"{seller_id},{violation_rate!r},{listing_count}\n")
+            count += 1
+    return count
+
+
+def create_seller_store(kind: str, path: str = "", aggregates_path: str = ""):
+    if kind == "memory":
+        store = InMemorySellerStore()
+    elif kind == "sqlite":
+        store = SQLiteSellerStore(path)
+    else:
+        raise ValueError(f"Неизвестное хранилище признаков продавцов: {kind}")
+    if aggregates_path:
+        store.put_many(read_seller_aggregates(aggregates_path))
+    return store
+
+
+class SellerFeatureCache:
+    def __init__(self, store, max_size: int):
+        self.store = store
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self._entries: "OrderedDict[int, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: Optional[Set[int]] = None
+        self._flush: Optional[asyncio.Future] = None
+
+    def __getstate__(self):
+        return {"store": self.store, "max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["store"], state["max_size"])
+
+    def get_many(self, seller_ids: Sequence[int]) -> np.ndarray:
+        rows: List[Optional[Tuple[float, float]]] = [None] * len(seller_ids)
+        missing: Dict[int, List[int]] = {}
+        with self._lock:
+            entries = self._entries
+            for i, seller_id in enumerate(seller_ids):
+                row = entries.get(seller_id)
+                if row is None:
+                    missing.setdefault(seller_id, []).append(i)
+                else:
+                    entries.move_to_end(seller_id)
+                    rows[i] = row
+            self.hits += len(seller_ids) - sum(map(len, missing.values()))
+            self.misses += len(missing)
+
+        if missing:
+            fetched = self.store.fetch_many(list(missing))
+            with self._lock:
+                self.queries += 1
+                entries = self._entries
+                for seller_id, positions in missing.items():
+                    aggregates = fetched.get(seller_id)
+                    row = encode_seller_features(*aggregates) if aggregates is not None else DEFAULT_SELLER_FEATURES
+                    for i in positions:
+                        rows[i] = row
+                    entries[seller_id] = row
+                while len(entries) > self.max_size:
+                    entries.popitem(last=False)
+        return np.array(rows, dtype=np.float64).reshape(len(seller_ids), N_SELLER_FEATURES)
+
+    async def prefetch(self, seller_ids: Iterable[int]):
+        missing = [seller_id for seller_id in seller_ids if seller_id not in self._entries]
+        if not missing:
+            return
+        if self._pending is None:
+            self._pending = set()
+            self._flush = asyncio.ensure_future(self._flush_pending())
+        self._pending.update(missing)
+        await asyncio.shield(self._flush)
+
+    async def _flush_pending(self):
+        await asyncio.sleep(0)
+        seller_ids, self._pending = self._pending, None
+        await asyncio.to_thread(self.get_many, list(seller_ids))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "queries": self.queries,
+        }
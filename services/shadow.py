@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import config
+from models.moderation import PredictionRequest
+from services import metrics
+from services.moderation_service import ModerationService
+
+logger = logging.getLogger(__name__)
+
+_Scored = Tuple[PredictionRequest, float, bool]
+
+
+class ShadowScorer:
+    def __init__(
+        self,
+        queue_size: int = config.SHADOW_QUEUE_SIZE,
+        max_batch_size: int = config.SHADOW_BATCH_SIZE,
+        max_wait_ms: float = config.SHADOW_MAX_WAIT_MS,
+    ):
+        if queue_size < 1 or max_batch_size < 1:
+            raise ValueError("Размер очереди и пакета теневой оценки должен быть положительным")
+        self.queue_size = queue_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._reset(None)
+
+    def _reset(self, version: Optional[str]):
+        self.version = version
+        self.submitted = 0
+        self.dropped = 0
+        self.compared = 0
+        self.agreed = 0
+        self.errors = 0
+        self.abs_diff_sum = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Теневая оценка запущена - размер очереди: {self.queue_size}, "
+            f"max_batch_size: {self.max_batch_size}, max_wait_ms: {self.max_wait * 1000:.1f}"
+        )
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+        logger.info("Теневая оценка остановлена")
+
+    def _accepts(self) -> bool:
+        if not self.running:
+            return False
+        active = ModerationService.registry.active
+        if active is None or not active.shadow:
+            return False
+        if active.version != self.version:
+            self._reset(active.version)
+        return True
+
+    def _put(self, item: _Scored):
+        try:
+            self._queue.put_nowait(item)
+            self.submitted += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def submit(self, request: PredictionRequest, probability: float, is_violation: bool):
+        if self._accepts() and not ModerationService.registry.routes(request.item_id):
+            self._put((request, probability, is_violation))
+
+    def submit_batch(self, requests: Sequence[PredictionRequest], probabilities: np.ndarray, violations: np.ndarray):
+        if not self._accepts():
+            return
+        routes = ModerationService.registry.routes
+        for item in zip(requests, probabilities.tolist(), violations.tolist()):
+            if not routes(item[0].item_id):
+                self._put(item)
+
+    async def wait_idle(self):
+        if self.running:
+            await self._queue.join()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._score(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _score(self, batch: List[_Scored]):
+        requests = [request for request, _, _ in batch]
+        try:
+            result = await asyncio.to_thread(ModerationService.score_shadow, requests)
+        except Exception as e:
+            self.errors += len(batch)
+            logger.error(f"Ошибка теневой оценки: {e}")
+            return
+        if result is None:
+            return
+        version, probabilities, violations = result
+        if version != self.version:
+            return
+        champion = np.fromiter((probability for _, probability, _ in batch), dtype=np.float64, count=len(batch))
+        champion_violations = np.fromiter((violation for _, _, violation in batch), dtype=bool, count=len(batch))
+        self.compared += len(batch)
+        self.agreed += int((champion_violations == violations).sum())
+        self.abs_diff_sum += float(np.abs(champion - probabilities).sum())
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "compared": self.compared,
+            "agreed": self.agreed,
+            "errors": self.errors,
+            "agreement_rate": self.agreed / self.compared if self.compared else None,
+            "mean_abs_diff": self.abs_diff_sum / self.compared if self.compared else None,
+        }
+
+
+shadow = ShadowScorer()
+
+metrics.registry.register(metrics.Gauge(
+    "moderation_shadow", "Shadow scoring counters against the challenger model", ("version", "stat"),
+    callback=lambda: {
+        (str(shadow.version), name): value
+        for name, value in shadow.stats().items()
+        if name != "version" and value is not None
+    } if shadow.version is not None else {},
+))
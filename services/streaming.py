@@ -0,0 +1,84 @@
+import json
+from typing import AsyncIterator, List, Optional, Union
+
+from pydantic import ValidationError
+
+import config
+from models.moderation import PredictionRequest, render_prediction
+from services.executor import InferenceExecutor, executor as default_executor
+from services.moderation_service import ModerationService
+
+
+class LineTooLongError(Exception):
+    ...
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = config.STREAM_MAX_LINE_BYTES) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            yield bytes(buffer[start:end])
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise LineTooLongError(f"Строка длиннее {max_line_bytes} байт")
+    if buffer:
+        yield bytes(buffer)
+
+
+def _error_line(line_number: int, message: str) -> bytes:
+    return json.dumps({"line": line_number, "error": message}, ensure_ascii=False).encode() + b"\n"
+
+
+def _render_chunk(entries: List[Union[PredictionRequest, bytes]], probabilities, violations) -> bytes:
+    out = []
+    scored = iter(zip(violations.tolist(), probabilities.tolist()))
+    for entry in entries:
+        if isinstance(entry, bytes):
+            out.append(entry)
+        else:
+            is_violation, probability = next(scored)
+            out.append(render_prediction(is_violation, probability) + b"\n")
+    return b"".join(out)
+
+
+async def score_ndjson(
+    chunks: AsyncIterator[bytes],
+    chunk_size: int = config.STREAM_CHUNK_SIZE,
+    executor: Optional[InferenceExecutor] = None,
+) -> AsyncIterator[bytes]:
+    executor = executor or default_executor
+    entries: List[Union[PredictionRequest, bytes]] = []
+    requests: List[PredictionRequest] = []
+    line_number = 0
+
+    async def flush() -> bytes:
+        probabilities, violations = await executor.run(ModerationService.score_batch, requests)
+        rendered = _render_chunk(entries, probabilities, violations)
+        entries.clear()
+        requests.clear()
+        return rendered
+
+    try:
+        async for line in iter_lines(chunks):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                request = PredictionRequest.model_validate_json(line)
+            except ValidationError as e:
+                entries.append(_error_line(line_number, str(e.errors(include_url=False, include_context=False))))
+            else:
+                entries.append(request)
+                requests.append(request)
+            if len(entries) >= chunk_size:
+                yield await flush()
+        if entries:
+            yield await flush()
+    except Exception as e:
+        yield _error_line(line_number, f"Ошибка при обработке запроса: {str(e)}")
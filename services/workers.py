@@ -0,0 +1,120 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+import config
+from model_artifact import write_atomic
+from services import metrics
+from services.moderation_service import ModerationService
+
+logger = logging.getLogger(__name__)
+
+MEMORY_FIELDS = {
+    "Rss": "rss_kb",
+    "Pss": "pss_kb",
+    "Shared_Clean": "shared_clean_kb",
+    "Shared_Dirty": "shared_dirty_kb",
+    "Private_Clean": "private_clean_kb",
+    "Private_Dirty": "private_dirty_kb",
+}
+
+
+def process_memory(pid: Optional[int] = None) -> Dict[str, int]:
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    usage = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in MEMORY_FIELDS:
+                    usage[MEMORY_FIELDS[key]] = int(value.split()[0])
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        return {}
+    if usage:
+        usage["private_kb"] = usage.get("private_clean_kb", 0) + usage.get("private_dirty_kb", 0)
+        usage["shared_kb"] = usage.get("shared_clean_kb", 0) + usage.get("shared_dirty_kb", 0)
+    return usage
+
+
+class WorkerStats:
+    def __init__(self, interval: float = config.WORKER_STATS_INTERVAL):
+        self.interval = interval
+        self.index: Optional[int] = None
+        self.directory: Optional[str] = None
+        self.started_at = time.time()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def configure(self, index: int, directory: str):
+        self.index = index
+        self.directory = directory
+        self.started_at = time.time()
+
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"worker-{self.index}.json")
+
+    def snapshot(self) -> dict:
+        return {
+            "index": self.index,
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "uptime_seconds": time.time() - self.started_at,
+            "updated_at": time.time(),
+            "model_version": ModerationService.model_version,
+            "requests": int(sum(metrics.REQUESTS.values().values())),
+            "memory": process_memory(),
+        }
+
+    def write(self):
+        write_atomic(self._path(), json.dumps(self.snapshot()).encode())
+
+    def collect(self) -> List[dict]:
+        if not self.enabled:
+            return [self.snapshot()]
+        self.write()
+        workers = []
+        for path in sorted(glob.glob(os.path.join(self.directory, "worker-*.json"))):
+            try:
+                with open(path) as f:
+                    workers.append(json.load(f))
+            except (FileNotFoundError, ValueError):
+                continue
+        return sorted(workers, key=lambda worker: worker["index"])
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self.write()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            os.unlink(self._path())
+        except FileNotFoundError:
+            pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning(f"Не удалось записать статистику воркера {self.index}: {e}")
+
+
+worker_stats = WorkerStats()
@@ -1,9 +1,18 @@
 from typing import Generator
 import pytest
 from fastapi.testclient import TestClient
+import config
 from main import app
 
+ADMIN_TOKEN = "test-admin-token"
+
 
 @pytest.fixture
 def app_client() -> Generator[TestClient, None, None]:
     return TestClient(app)
+
+
+@pytest.fixture
+def admin_client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(config, "ADMIN_TOKEN", ADMIN_TOKEN)
+    return TestClient(app, headers={"X-Admin-Token": ADMIN_TOKEN})
@@ -0,0 +1,105 @@
+import os
+import pickle
+import subprocess
+import sys
+import pytest
+import numpy as np
+from unittest.mock import patch
+from artifact_cache import ArtifactCache, load_model_mlflow_cached
+from services.moderation_service import ModerationService
+from model import train_model
+import config
+
+
+def registry_unavailable(*args, **kwargs):
+    raise AssertionError("Реестр моделей не должен вызываться")
+
+
+class TestArtifactCache:
+    def test_put_and_resolve(self, tmp_path):
+        cache = ArtifactCache(str(tmp_path))
+
+        digest = cache.put("moderation_model", "3", b"payload")
+
+        assert cache.resolve("moderation_model") == ("3", digest)
+        assert cache.resolve("moderation_model", "3") == ("3", digest)
+        assert cache.resolve("moderation_model", "4") is None
+        assert cache.resolve("other_model") is None
+        assert cache.read(digest) == b"payload"
+
+    def test_same_content_is_stored_once(self, tmp_path):
+        cache = ArtifactCache(str(tmp_path))
+
+        first = cache.put("moderation_model", "1", b"payload")
+        second = cache.put("moderation_model", "2", b"payload")
+
+        assert first == second
+        assert cache.resolve("moderation_model") == ("2", first)
+        assert len(os.listdir(os.path.join(str(tmp_path), "objects", first[:2]))) == 1
+
+    def test_corrupted_object_is_rejected(self, tmp_path):
+        cache = ArtifactCache(str(tmp_path))
+        digest = cache.put("moderation_model", "1", b"payload")
+        with open(cache._object_path(digest), "wb") as f:
+            f.write(b"tampered")
+
+        with pytest.raises(ValueError):
+            cache.read(digest)
+
+
+class TestLoadModelMlflowCached:
+    def test_miss_downloads_and_populates_cache(self, tmp_path):
+        cache = ArtifactCache(str(tmp_path))
+        model = train_model()
+
+        with patch("artifact_cache.get_latest_model_version", return_value="5"), \
+                patch("artifact_cache.load_model_mlflow", return_value=model) as download:
+            loaded, version = load_model_mlflow_cached("moderation_model", cache=cache)
+
+        download.assert_called_once_with("moderation_model", version="5")
+        assert loaded is model
+        assert version == "5"
+        assert cache.resolve("moderation_model")[0] == "5"
+
+    def test_hit_does_not_contact_registry(self, tmp_path):
+        cache = ArtifactCache(str(tmp_path))
+        model = train_model()
+        cache.put("moderation_model", "5", pickle.dumps(model))
+
+        with patch("artifact_cache.get_latest_model_version", side_effect=registry_unavailable), \
+                patch("artifact_cache.load_model_mlflow", side_effect=registry_unavailable):
+            loaded, version = load_model_mlflow_cached("moderation_model", cache=cache)
+            pinned, _ = load_model_mlflow_cached("moderation_model", version="5", cache=cache)
+
+        assert version == "5"
+        np.testing.assert_array_equal(loaded.coef_, model.coef_)
+        np.testing.assert_array_equal(pinned.coef_, model.coef_)
+
+    def test_service_loads_from_cache_on_mlflow_path(self, tmp_path, monkeypatch):
+        cache = ArtifactCache(str(tmp_path))
+        cache.put("moderation_model", "7", pickle.dumps(train_model()))
+        monkeypatch.setenv("USE_MLFLOW", "true")
+        monkeypatch.setattr(config, "MODEL_CACHE_DIR", str(tmp_path))
+
+        with patch("artifact_cache.get_latest_model_version", side_effect=registry_unavailable), \
+                patch("artifact_cache.load_model_mlflow", side_effect=registry_unavailable):
+            ModerationService.load_model("moderation_model")
+
+        try:
+            assert ModerationService.model_version == "7"
+        finally:
+            ModerationService.model = None
+            ModerationService.model_version = None
+
+
+def test_service_import_does_not_import_mlflow():
+    code = "import sys, main; print('mlflow' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "False"
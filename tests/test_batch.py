@@ -0,0 +1,118 @@
+import pytest
+import numpy as np
+from models.moderation import PredictionRequest, PredictionResponse
+from services.moderation_service import ModerationService
+from errors import ModelNotLoadedError
+
+
+def make_request(**overrides) -> PredictionRequest:
+    data = {
+        "seller_id": 1,
+        "is_verified_seller": False,
+        "item_id": 100,
+        "name": "Test Item",
+        "description": "Short description",
+        "category": 1,
+        "images_qty": 0,
+    }
+    data.update(overrides)
+    return PredictionRequest(**data)
+
+
+BATCH = [
+    make_request(item_id=1),
+    make_request(item_id=2, is_verified_seller=True, images_qty=5, description="B" * 500, category=50),
+    make_request(item_id=3, images_qty=25, description="C" * 5000, category=250),
+    make_request(item_id=4, category=-3),
+]
+
+
+class TestPredictBatchService:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_predict_batch_matches_single_predictions(self):
+        results = ModerationService.predict_batch(BATCH)
+
+        assert len(results) == len(BATCH)
+        for request, result in zip(BATCH, results):
+            expected = ModerationService.predict(request)
+            assert isinstance(result, PredictionResponse)
+            assert result.is_violation == expected.is_violation
+            assert result.probability == pytest.approx(expected.probability, abs=1e-12)
+
+    def test_encoded_batch_clips_values(self):
+        features = ModerationService.encoder.encode_batch(BATCH)
+
+        assert features.shape == (len(BATCH), 4)
+        assert features.dtype == np.float64
+        np.testing.assert_allclose(features[2], [0.0, 1.0, 1.0, 1.0])
+        np.testing.assert_allclose(features[3], [0.0, 0.0, 0.017, 0.0])
+
+    def test_predict_batch_calls_model_once(self):
+        calls = []
+        original = ModerationService.model.predict_proba
+
+        def counting_predict_proba(X):
+            calls.append(np.asarray(X).shape)
+            return original(X)
+
+        ModerationService.model.predict_proba = counting_predict_proba
+        ModerationService.predict_batch(BATCH)
+
+        assert calls == [(len(BATCH), 4)]
+
+    def test_predict_batch_empty(self):
+        assert ModerationService.predict_batch([]) == []
+
+    def test_predict_batch_model_not_loaded_error(self):
+        ModerationService.model = None
+
+        with pytest.raises(ModelNotLoadedError, match="Модель не загружена"):
+            ModerationService.predict_batch(BATCH)
+
+
+class TestPredictBatchEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_predict_batch_success(self, app_client):
+        response = app_client.post(
+            "/predict/batch",
+            json={"items": [request.model_dump() for request in BATCH]},
+        )
+
+        assert response.status_code == 200
+        predictions = response.json()["predictions"]
+        assert len(predictions) == len(BATCH)
+        for request, prediction in zip(BATCH, predictions):
+            expected = ModerationService.predict(request)
+            assert prediction["is_violation"] == expected.is_violation
+            assert prediction["probability"] == pytest.approx(expected.probability)
+
+    def test_predict_batch_validation_error(self, app_client):
+        items = [request.model_dump() for request in BATCH]
+        items[1]["images_qty"] = -1
+
+        response = app_client.post("/predict/batch", json={"items": items})
+
+        assert response.status_code == 422
+
+    def test_predict_batch_model_not_loaded_error(self, app_client):
+        ModerationService.model = None
+
+        response = app_client.post(
+            "/predict/batch",
+            json={"items": [request.model_dump() for request in BATCH]},
+        )
+
+        assert response.status_code == 503
+        assert "Модель не загружена" in response.json()["detail"]
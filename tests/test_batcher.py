@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from models.moderation import PredictionRequest, PredictionResponse
+from services.moderation_service import ModerationService
+from services.batcher import MicroBatcher
+from errors import ModelNotLoadedError, ServiceOverloadedError
+import config
+
+
+def make_request(item_id: int) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=item_id,
+        is_verified_seller=item_id % 2 == 0,
+        item_id=item_id,
+        name=f"Item {item_id}",
+        description="A" * (item_id * 37 % 1200),
+        category=item_id % 120,
+        images_qty=item_id % 13,
+    )
+
+
+async def run_concurrently(batcher: MicroBatcher, requests):
+    await batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.submit(r) for r in requests), return_exceptions=True)
+    finally:
+        await batcher.stop()
+
+
+class TestMicroBatcher:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_concurrent_requests_are_merged(self):
+        requests = [make_request(i) for i in range(200)]
+        batcher = MicroBatcher(max_batch_size=64, max_wait_ms=50)
+
+        with patch.object(ModerationService, "predict_batch", wraps=ModerationService.predict_batch) as spy:
+            results = asyncio.run(run_concurrently(batcher, requests))
+
+        assert [len(call.args[0]) for call in spy.call_args_list] == [64, 64, 64, 8]
+        assert batcher.batches == 4
+        assert batcher.items == 200
+        for request, result in zip(requests, results):
+            expected = ModerationService.predict(request)
+            assert isinstance(result, PredictionResponse)
+            assert result.is_violation == expected.is_violation
+            assert result.probability == pytest.approx(expected.probability, abs=1e-12)
+
+    def test_partial_batch_flushed_after_max_wait(self):
+        batcher = MicroBatcher(max_batch_size=64, max_wait_ms=1)
+
+        results = asyncio.run(run_concurrently(batcher, [make_request(1)]))
+
+        assert isinstance(results[0], PredictionResponse)
+        assert batcher.batches == 1
+
+    def test_errors_are_propagated_to_every_caller(self):
+        ModerationService.model = None
+        batcher = MicroBatcher(max_batch_size=8, max_wait_ms=5)
+
+        results = asyncio.run(run_concurrently(batcher, [make_request(i) for i in range(3)]))
+
+        assert all(isinstance(result, ModelNotLoadedError) for result in results)
+
+    def test_submit_requires_running_batcher(self):
+        with pytest.raises(RuntimeError):
+            asyncio.run(MicroBatcher().submit(make_request(1)))
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            MicroBatcher(max_batch_size=0)
+
+    def test_invalid_queue_size(self):
+        with pytest.raises(ValueError):
+            MicroBatcher(max_queue=0)
+
+    def test_full_queue_rejects_requests(self):
+        batcher = MicroBatcher(max_batch_size=1, max_wait_ms=1, max_queue=2)
+
+        results = asyncio.run(run_concurrently(batcher, [make_request(i) for i in range(6)]))
+
+        rejected = [result for result in results if isinstance(result, ServiceOverloadedError)]
+        served = [result for result in results if isinstance(result, PredictionResponse)]
+        assert rejected
+        assert len(rejected) + len(served) == 6
+        assert batcher.rejected == len(rejected)
+        assert batcher.items == len(served)
+
+
+class TestPredictEndpointWithBatching:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_predict_through_batcher(self):
+        from main import app
+
+        with patch.object(config, "BATCHING_ENABLED", True), \
+                patch.object(ModerationService, "load_model"), \
+                patch.object(ModerationService, "predict_batch", wraps=ModerationService.predict_batch) as spy:
+            with TestClient(app) as client:
+                response = client.post("/predict/", json=make_request(7).model_dump())
+
+        assert response.status_code == 200
+        assert spy.call_count == 1
+        expected = ModerationService.predict(make_request(7))
+        assert response.json()["probability"] == pytest.approx(expected.probability)
+
+    def test_predict_returns_503_when_queue_is_full(self):
+        from main import app
+        from services.batcher import batcher
+
+        with patch.object(config, "BATCHING_ENABLED", True), \
+                patch.object(ModerationService, "load_model"):
+            with TestClient(app) as client:
+                with patch.object(batcher._queue, "put_nowait", side_effect=asyncio.QueueFull):
+                    response = client.post("/predict/", json=make_request(7).model_dump())
+                metrics_text = client.get("/metrics").text
+
+        assert response.status_code == 503
+        assert "Сервис перегружен" in response.json()["detail"]
+        assert response.headers["Retry-After"] == "1"
+        assert "moderation_batcher_rejected_total" in metrics_text
@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import patch
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.cache import PredictionCache
+
+
+def make_request(**overrides) -> PredictionRequest:
+    data = {
+        "seller_id": 1,
+        "is_verified_seller": False,
+        "item_id": 100,
+        "name": "Test Item",
+        "description": "Short description",
+        "category": 1,
+        "images_qty": 0,
+    }
+    data.update(overrides)
+    return PredictionRequest(**data)
+
+
+class TestPredictionCache:
+    def test_lru_eviction(self):
+        cache = PredictionCache(max_size=2)
+        cache.put("a", 0.1)
+        cache.put("b", 0.2)
+        assert cache.get("a") == 0.1
+        cache.put("c", 0.3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 0.1
+        assert cache.get("c") == 0.3
+        assert cache.stats() == {"size": 2, "max_size": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+    def test_ttl_expiry(self):
+        cache = PredictionCache(max_size=10, ttl_seconds=5)
+        with patch("services.cache.time.monotonic", return_value=100.0):
+            cache.put("a", 0.5)
+        with patch("services.cache.time.monotonic", return_value=104.0):
+            assert cache.get("a") == 0.5
+        with patch("services.cache.time.monotonic", return_value=106.0):
+            assert cache.get("a") is None
+
+        assert len(cache) == 0
+        assert cache.misses == 1
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            PredictionCache(max_size=0)
+
+
+class TestServiceCache:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        ModerationService.cache = PredictionCache(max_size=100)
+        yield
+        ModerationService.model = None
+        ModerationService.model_version = None
+        ModerationService.cache = None
+
+    def test_requests_with_same_clipped_features_share_entry(self):
+        first = make_request(item_id=1, images_qty=12, description="A" * 1200, category=150)
+        second = make_request(item_id=2, seller_id=9, name="Other", images_qty=30, description="B" * 5000, category=101)
+
+        with patch.object(ModerationService.model, "predict_proba", wraps=ModerationService.model.predict_proba) as spy:
+            assert ModerationService.predict(first) == ModerationService.predict(second)
+
+        assert spy.call_count == 1
+        assert ModerationService.cache.stats()["hits"] == 1
+
+    def test_cached_result_matches_uncached(self):
+        request = make_request(is_verified_seller=True, images_qty=4, category=33)
+        cached = [ModerationService.predict(request) for _ in range(3)]
+        ModerationService.cache = None
+
+        assert cached == [ModerationService.predict(request)] * 3
+
+    def test_model_swap_invalidates_cache(self, tmp_path):
+        from model import train_model
+        request = make_request()
+        ModerationService.predict(request)
+        assert len(ModerationService.cache) == 1
+
+        ModerationService.model = None
+        with patch("services.moderation_service.load_local_model") as loader:
+            loader.return_value = train_model()
+            ModerationService.load_model(model_path=str(tmp_path / "model.pkl"))
+
+        assert len(ModerationService.cache) == 0
+        ModerationService.predict(request)
+        assert ModerationService.cache.stats()["misses"] == 2
+
+    def test_batch_mixes_hits_and_misses(self):
+        requests = [make_request(item_id=i, images_qty=i % 4, category=i % 3) for i in range(12)]
+        ModerationService.predict(requests[0])
+        ModerationService.predict(requests[5])
+
+        results = ModerationService.predict_batch(requests)
+        ModerationService.cache = None
+        expected = ModerationService.predict_batch(requests)
+
+        assert results == expected
+
+    def test_cache_stats_endpoint(self, app_client):
+        ModerationService.predict(make_request())
+        ModerationService.predict(make_request())
+
+        response = app_client.get("/admin/cache")
+
+        assert response.status_code == 200
+        assert response.json() == {"enabled": True, "size": 1, "max_size": 100, "hits": 1, "misses": 1, "evictions": 0}
+
+    def test_cache_stats_endpoint_disabled(self, app_client):
+        ModerationService.cache = None
+
+        assert app_client.get("/admin/cache").json() == {"enabled": False}
@@ -0,0 +1,220 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from main import app
+from model import train_model
+from models.moderation import PredictionRequest, PredictionResponse
+from services.dedup import SingleFlight, request_key
+from services.health import asgi_post
+from services.moderation_service import ModerationService
+
+REQUEST = PredictionRequest(
+    seller_id=1,
+    is_verified_seller=False,
+    item_id=100,
+    name="Test Item",
+    description="Short description",
+    category=1,
+    images_qty=0,
+)
+
+
+@pytest.fixture(autouse=True)
+def model():
+    ModerationService.model = train_model()
+    yield
+    ModerationService.model = None
+
+
+class Computation:
+    def __init__(self, delay: float = 0.01, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, request: PredictionRequest) -> PredictionResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return PredictionResponse(is_violation=False, probability=self.calls / 10)
+
+
+class Collides:
+    def __init__(self, request: PredictionRequest):
+        self.key = request_key(request)
+
+    def __hash__(self):
+        return 0
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class TestSingleFlight:
+    def test_concurrent_duplicates_share_one_computation(self):
+        flight = SingleFlight(enabled=True, window_ms=0)
+        compute = Computation()
+
+        async def scenario():
+            return await asyncio.gather(*(flight.run(REQUEST, compute) for _ in range(10)))
+
+        responses = asyncio.run(scenario())
+
+        assert compute.calls == 1
+        assert all(response is responses[0] for response in responses)
+        assert flight.stats()["executed"] == 1
+        assert flight.stats()["coalesced"] == 9
+        assert flight.stats()["in_flight"] == 0
+
+    def test_payload_is_part_of_key(self):
+        flight = SingleFlight(enabled=True, window_ms=0)
+        compute = Computation()
+        changed = REQUEST.model_copy(update={"description": "Other description"})
+
+        async def scenario():
+            return await asyncio.gather(flight.run(REQUEST, compute), flight.run(changed, compute))
+
+        asyncio.run(scenario())
+
+        assert request_key(REQUEST) != request_key(changed)
+        assert request_key(REQUEST) == request_key(REQUEST.model_copy())
+        assert compute.calls == 2
+
+    def test_window_absorbs_retries(self):
+        flight = SingleFlight(enabled=True, window_ms=50)
+        compute = Computation(delay=0)
+
+        async def scenario():
+            first = await flight.run(REQUEST, compute)
+            retry = await flight.run(REQUEST, compute)
+            await asyncio.sleep(0.06)
+            expired = await flight.run(REQUEST, compute)
+            return first, retry, expired
+
+        first, retry, expired = asyncio.run(scenario())
+
+        assert retry is first
+        assert expired is not first
+        assert compute.calls == 2
+        assert flight.window_hits == 1
+
+    def test_window_is_dropped_on_model_swap(self):
+        flight = SingleFlight(enabled=True, window_ms=10_000)
+        compute = Computation(delay=0)
+
+        async def scenario():
+            await flight.run(REQUEST, compute)
+            ModerationService.model = train_model()
+            await flight.run(REQUEST, compute)
+
+        asyncio.run(scenario())
+
+        assert compute.calls == 2
+        assert flight.window_hits == 0
+
+    def test_window_is_bounded(self):
+        flight = SingleFlight(enabled=True, window_ms=10_000, max_entries=3)
+        compute = Computation(delay=0)
+
+        async def scenario():
+            for i in range(5):
+                await flight.run(REQUEST.model_copy(update={"item_id": i}), compute)
+
+        asyncio.run(scenario())
+
+        assert flight.stats()["window_size"] == 3
+
+    def test_errors_are_shared_but_not_cached(self):
+        flight = SingleFlight(enabled=True, window_ms=10_000)
+        compute = Computation(error=ValueError("boom"))
+
+        async def scenario():
+            return await asyncio.gather(*(flight.run(REQUEST, compute) for _ in range(3)), return_exceptions=True)
+
+        errors = asyncio.run(scenario())
+        assert all(isinstance(error, ValueError) for error in errors)
+        assert compute.calls == 1
+
+        compute.error = None
+        asyncio.run(flight.run(REQUEST, compute))
+        assert compute.calls == 2
+
+    def test_cancelled_caller_does_not_cancel_followers(self):
+        flight = SingleFlight(enabled=True, window_ms=0)
+        compute = Computation(delay=0.05)
+
+        async def scenario():
+            leader = asyncio.ensure_future(flight.run(REQUEST, compute))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.run(REQUEST, compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(scenario()).probability == 0.1
+        assert compute.calls == 1
+
+    def test_hash_collision_does_not_merge_payloads(self):
+        flight = SingleFlight(enabled=True, window_ms=10_000)
+        compute = Computation(delay=0)
+        changed = REQUEST.model_copy(update={"description": "Other description"})
+
+        async def scenario():
+            with patch("services.dedup.request_key", lambda request: Collides(request)):
+                first = await flight.run(REQUEST, compute)
+                second = await flight.run(changed, compute)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert compute.calls == 2
+        assert first is not second
+
+    def test_disabled_by_default(self):
+        assert SingleFlight().enabled is False
+
+    def test_disabled(self):
+        flight = SingleFlight(enabled=False)
+        compute = Computation()
+
+        async def scenario():
+            await asyncio.gather(*(flight.run(REQUEST, compute) for _ in range(3)))
+
+        asyncio.run(scenario())
+
+        assert compute.calls == 3
+        assert flight.coalesced == 0
+
+
+class TestDedupRoutes:
+    def test_thousand_concurrent_duplicates_call_model_once(self):
+        flight = SingleFlight(enabled=True, window_ms=0)
+        body = REQUEST.model_dump_json().encode()
+
+        async def scenario():
+            return await asyncio.gather(*(asgi_post(app, "/predict/", body) for _ in range(1000)))
+
+        with patch("routers.moderation.dedup", flight), \
+                patch.object(ModerationService, "predict", wraps=ModerationService.predict) as predict:
+            statuses = asyncio.run(scenario())
+
+        assert statuses == [200] * 1000
+        assert predict.call_count == 1
+        assert flight.stats()["coalesced"] == 999
+
+    def test_counters_are_exported(self, app_client):
+        flight = SingleFlight(enabled=True, window_ms=1_000)
+        with patch("routers.moderation.dedup", flight), patch("services.dedup.dedup", flight):
+            app_client.post("/predict/", json=REQUEST.model_dump())
+            app_client.post("/predict/", json=REQUEST.model_dump())
+            metrics = app_client.get("/metrics").text
+
+        assert 'moderation_dedup_requests_total{outcome="executed"} 1' in metrics
+        assert 'moderation_dedup_requests_total{outcome="window_hit"} 1' in metrics
+
+    def test_admin_stats(self, app_client):
+        response = app_client.get("/admin/dedup")
+
+        assert response.status_code == 200
+        assert {"executed", "coalesced", "window_hits", "in_flight"} <= response.json().keys()
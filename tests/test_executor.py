@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services import metrics
+from services.executor import InferenceExecutor, executor
+from errors import ServiceOverloadedError
+
+
+REQUEST = PredictionRequest(
+    seller_id=1,
+    is_verified_seller=False,
+    item_id=100,
+    name="Test Item",
+    description="Short description",
+    category=1,
+    images_qty=0,
+)
+
+
+class TestInferenceExecutor:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_inline_mode_runs_on_event_loop_thread(self):
+        inference = InferenceExecutor(mode="inline")
+
+        async def scenario():
+            return await inference.run(lambda: threading.current_thread().name)
+
+        assert asyncio.run(scenario()) == threading.main_thread().name
+
+    def test_thread_mode_runs_off_event_loop(self):
+        inference = InferenceExecutor(mode="thread", pool_size=2)
+        inference.start()
+        try:
+            thread_name = asyncio.run(inference.run(lambda: threading.current_thread().name))
+            result = asyncio.run(inference.run(ModerationService.predict, REQUEST))
+        finally:
+            inference.shutdown()
+
+        assert thread_name.startswith("inference")
+        assert result == ModerationService.predict(REQUEST)
+
+    def test_process_mode_uses_loaded_model(self):
+        inference = InferenceExecutor(mode="process", pool_size=1)
+        inference.start()
+        try:
+            result = asyncio.run(inference.run(ModerationService.predict_batch, [REQUEST, REQUEST]))
+        finally:
+            inference.shutdown()
+
+        assert result == [ModerationService.predict(REQUEST)] * 2
+
+    def test_process_mode_uses_threshold_policy(self):
+        from services.policy import ThresholdPolicy
+
+        ModerationService.policy = ThresholdPolicy(sellers={REQUEST.seller_id: 0.0})
+        inference = InferenceExecutor(mode="process", pool_size=1)
+        inference.start()
+        try:
+            result = asyncio.run(inference.run(ModerationService.predict, REQUEST))
+        finally:
+            inference.shutdown()
+            ModerationService.policy = ThresholdPolicy()
+
+        assert result.is_violation
+
+    def test_process_mode_reports_prediction_metrics(self):
+        def totals():
+            stages = metrics.STAGE_SECONDS.snapshot()
+            return (
+                sum(metrics.PREDICTIONS.values().values()),
+                sum(sum(counts) for counts, _ in metrics.PROBABILITY.snapshot().values()),
+                sum(stages.get(("model",), ([0], 0.0))[0]),
+                sum(stages.get(("model_batch",), ([0], 0.0))[0]),
+            )
+
+        ModerationService.predict(REQUEST)
+        before = totals()
+        inference = InferenceExecutor(mode="process", pool_size=1)
+        inference.start()
+
+        async def scenario():
+            for _ in range(5):
+                await inference.run(ModerationService.predict, REQUEST)
+            await inference.run(ModerationService.score_batch, [REQUEST, REQUEST])
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            inference.shutdown()
+
+        assert tuple(after - prior for after, prior in zip(totals(), before)) == (7, 7, 5, 1)
+
+    def test_refresh_swaps_pool_without_inline_window(self):
+        inference = InferenceExecutor(mode="process", pool_size=1)
+        inference.start()
+        previous = inference._pool
+        create_pool = inference._create_pool
+        pools_seen = []
+
+        def create_and_record():
+            pools_seen.append(inference._pool)
+            return create_pool()
+
+        try:
+            with patch.object(inference, "_create_pool", side_effect=create_and_record):
+                inference.refresh()
+            result = asyncio.run(inference.run(ModerationService.predict, REQUEST))
+        finally:
+            inference.shutdown()
+
+        assert pools_seen == [previous]
+        assert result == ModerationService.predict(REQUEST)
+
+    def test_rejects_requests_over_in_flight_limit(self):
+        inference = InferenceExecutor(mode="thread", pool_size=1, queue_depth=1)
+        inference.start()
+        release = threading.Event()
+
+        async def scenario():
+            blocked = [asyncio.ensure_future(inference.run(release.wait, 5)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(ServiceOverloadedError):
+                await inference.run(release.wait, 5)
+            release.set()
+            await asyncio.gather(*blocked)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            inference.shutdown()
+
+        assert inference.rejected == 1
+        assert inference.in_flight == 0
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            InferenceExecutor(mode="gpu")
+
+
+class TestPredictEndpointOverload:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_predict_returns_503_when_overloaded(self, app_client):
+        with patch.object(executor, "in_flight", executor.max_in_flight):
+            response = app_client.post("/predict/", json=REQUEST.model_dump())
+
+        assert response.status_code == 503
+        assert "Сервис перегружен" in response.json()["detail"]
@@ -0,0 +1,135 @@
+import json
+from unittest.mock import patch
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from errors import ServiceOverloadedError
+from routers.moderation import fast_router, root_router
+from services.moderation_service import ModerationService
+
+VALID = {
+    "seller_id": 1,
+    "is_verified_seller": False,
+    "item_id": 100,
+    "name": "Test Item",
+    "description": "Test description",
+    "category": 5,
+    "images_qty": 0,
+}
+
+INVALID_BODIES = [
+    "",
+    "not json",
+    "[]",
+    json.dumps({"seller_id": 1}),
+    json.dumps({**VALID, "seller_id": "abc"}),
+    json.dumps({**VALID, "name": "", "images_qty": -1}),
+]
+
+
+def make_client(router) -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/predict")
+    return TestClient(app)
+
+
+@pytest.fixture
+def fast_client() -> TestClient:
+    return make_client(fast_router)
+
+
+@pytest.fixture
+def default_client() -> TestClient:
+    return make_client(root_router)
+
+
+class TestFastRoutes:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_predict_matches_default_route(self, fast_client, default_client):
+        for qty in range(0, 12, 3):
+            payload = {**VALID, "images_qty": qty, "is_verified_seller": qty % 2 == 0}
+
+            fast = fast_client.post("/predict/", json=payload)
+            default = default_client.post("/predict/", json=payload)
+
+            assert fast.status_code == 200
+            assert fast.headers["content-type"] == "application/json"
+            assert fast.json() == default.json()
+
+    def test_batch_matches_default_route(self, fast_client, default_client):
+        payload = {"items": [{**VALID, "item_id": i, "category": i * 10} for i in range(12)]}
+
+        fast = fast_client.post("/predict/batch", json=payload)
+        default = default_client.post("/predict/batch", json=payload)
+
+        assert fast.status_code == 200
+        assert fast.json() == default.json()
+
+    def test_empty_batch(self, fast_client):
+        response = fast_client.post("/predict/batch", json={"items": []})
+
+        assert response.status_code == 200
+        assert response.json() == {"predictions": []}
+
+    @pytest.mark.parametrize("body", INVALID_BODIES)
+    def test_validation_errors_match_default_route(self, fast_client, default_client, body):
+        headers = {"Content-Type": "application/json"}
+
+        fast = fast_client.post("/predict/", content=body, headers=headers)
+        default = default_client.post("/predict/", content=body, headers=headers)
+
+        assert fast.status_code == default.status_code == 422
+        if body.startswith("{"):
+            assert fast.json() == default.json()
+
+    @pytest.mark.parametrize("content_type", ["text/plain", None, "application/x-www-form-urlencoded"])
+    def test_non_json_content_type_is_rejected_like_default_route(self, fast_client, default_client, content_type):
+        headers = {"Content-Type": content_type} if content_type else {}
+
+        fast = fast_client.post("/predict/", content=json.dumps(VALID), headers=headers)
+        default = default_client.post("/predict/", content=json.dumps(VALID), headers=headers)
+        batch = fast_client.post("/predict/batch", content=json.dumps({"items": [VALID]}), headers=headers)
+
+        assert fast.status_code == default.status_code == batch.status_code == 422
+        assert fast.json() == default.json()
+
+    @pytest.mark.parametrize("content_type", ["application/json; charset=utf-8", "application/vnd.api+json"])
+    def test_json_content_type_variants_are_accepted(self, fast_client, default_client, content_type):
+        headers = {"Content-Type": content_type}
+
+        fast = fast_client.post("/predict/", content=json.dumps(VALID), headers=headers)
+        default = default_client.post("/predict/", content=json.dumps(VALID), headers=headers)
+
+        assert fast.status_code == default.status_code == 200
+        assert fast.json() == default.json()
+
+    def test_batch_validation_error(self, fast_client):
+        response = fast_client.post("/predict/batch", json={"items": [{"seller_id": 1}]})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][:3] == ["body", "items", 0]
+
+    def test_model_not_loaded(self, fast_client):
+        ModerationService.model = None
+
+        assert fast_client.post("/predict/", json=VALID).status_code == 503
+        assert fast_client.post("/predict/batch", json={"items": [VALID]}).status_code == 503
+
+    def test_overloaded(self, fast_client):
+        with patch("services.executor.executor.run", side_effect=ServiceOverloadedError("Сервис перегружен.")):
+            response = fast_client.post("/predict/", json=VALID)
+
+        assert response.status_code == 503
+
+    def test_general_error(self, fast_client):
+        with patch("services.moderation_service.ModerationService.predict", side_effect=Exception("Database connection failed")):
+            response = fast_client.post("/predict/", json=VALID)
+
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Ошибка при обработке запроса: Database connection failed"
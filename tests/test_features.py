@@ -0,0 +1,118 @@
+import threading
+import tracemalloc
+import pytest
+import numpy as np
+from models.moderation import PredictionRequest
+from services.features import FeatureEncoder, N_FEATURES
+
+
+def make_request(**overrides) -> PredictionRequest:
+    data = {
+        "seller_id": 1,
+        "is_verified_seller": True,
+        "item_id": 100,
+        "name": "Test Item",
+        "description": "D" * 250,
+        "category": 42,
+        "images_qty": 3,
+    }
+    data.update(overrides)
+    return PredictionRequest(**data)
+
+
+def reference_features(request: PredictionRequest) -> list:
+    return np.clip(np.array([
+        1.0 if request.is_verified_seller else 0.0,
+        request.images_qty / 10.0,
+        len(request.description) / 1000.0,
+        request.category / 100.0,
+    ]), 0.0, 1.0).tolist()
+
+
+REQUESTS = [
+    make_request(),
+    make_request(is_verified_seller=False, images_qty=0, description="", category=0),
+    make_request(images_qty=40, description="X" * 4000, category=900),
+    make_request(category=-5),
+]
+
+
+class TestFeatureEncoder:
+    def test_encode_matches_reference(self):
+        encoder = FeatureEncoder()
+
+        for request in REQUESTS:
+            assert encoder.encode(request).tolist() == reference_features(request)
+
+    def test_encode_reuses_thread_local_buffer(self):
+        encoder = FeatureEncoder()
+        first = encoder.encode(REQUESTS[0])
+        second = encoder.encode(REQUESTS[1])
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(encoder.encode(REQUESTS[2])))
+        thread.start()
+        thread.join()
+
+        assert first is second
+        assert other[0] is not first
+
+    def test_encode_batch_matches_reference(self):
+        features = FeatureEncoder().encode_batch(REQUESTS)
+
+        assert features.shape == (len(REQUESTS), N_FEATURES)
+        assert features.tolist() == [reference_features(r) for r in REQUESTS]
+
+    def test_encode_batch_into_preallocated_buffer(self):
+        buffer = np.full((10, N_FEATURES), -1.0)
+
+        features = FeatureEncoder().encode_batch(REQUESTS, out=buffer)
+
+        assert np.shares_memory(features, buffer)
+        assert features.shape == (len(REQUESTS), N_FEATURES)
+        assert (buffer[len(REQUESTS):] == -1.0).all()
+
+    def test_encode_batch_rejects_small_buffer(self):
+        with pytest.raises(ValueError):
+            FeatureEncoder().encode_batch(REQUESTS, out=np.empty((2, N_FEATURES)))
+
+    def test_encode_columns_matches_reference(self):
+        columns = {
+            "is_verified_seller": np.array([r.is_verified_seller for r in REQUESTS]),
+            "images_qty": np.array([r.images_qty for r in REQUESTS]),
+            "description_length": np.array([len(r.description) for r in REQUESTS]),
+            "category": np.array([r.category for r in REQUESTS]),
+        }
+
+        features = FeatureEncoder().encode_columns(columns)
+
+        assert features.tolist() == [reference_features(r) for r in REQUESTS]
+
+    def test_encode_columns_requires_all_features(self):
+        with pytest.raises(ValueError, match="category"):
+            FeatureEncoder().encode_columns({"is_verified_seller": [1], "images_qty": [1], "description_length": [1]})
+
+    def test_encode_does_not_allocate_per_request(self):
+        encoder = FeatureEncoder()
+        request = REQUESTS[0]
+        encoder.encode(request)
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            peaks = []
+            for _ in range(1000):
+                baseline, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                encoder.encode(request)
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        numpy_domain = tracemalloc.DomainFilter(True, np.lib.tracemalloc_domain)
+        new_arrays = after.filter_traces([numpy_domain]).compare_to(
+            before.filter_traces([numpy_domain]), "filename"
+        )
+        assert sum(stat.count_diff for stat in new_arrays) == 0
+        assert max(peaks) < 256
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import pytest
+from unittest.mock import patch
+from main import app
+from model import save_model, train_model
+from models.moderation import PredictionRequest
+from errors import ServiceOverloadedError
+from services.admission import AdmissionController, WindowedMin, admission
+from services.executor import InferenceExecutor
+from services import metrics
+from services.cache import PredictionCache
+from services.dedup import dedup
+from services.health import Readiness, readiness
+from services.shadow import shadow
+from services.moderation_service import ModerationService
+
+REQUEST = PredictionRequest(
+    seller_id=1,
+    is_verified_seller=False,
+    item_id=100,
+    name="Test Item",
+    description="Short description",
+    category=1,
+    images_qty=0,
+)
+
+FIRST_REQUEST_PROBE = """
+import asyncio, json, statistics, time
+from main import app
+from services.health import asgi_post, readiness
+
+
+async def main():
+    async with app.router.lifespan_context(app):
+        while not readiness.ready:
+            await asyncio.sleep(0.01)
+        latencies = []
+        for i in range(150):
+            body = json.dumps({
+                "seller_id": i, "is_verified_seller": i % 2 == 0, "item_id": 10_000 + i, "name": f"Item {i}",
+                "description": "d" * (i * 37 % 900), "category": i % 100, "images_qty": i % 10,
+            }).encode()
+            started = time.perf_counter()
+            assert await asgi_post(app, "/predict/", body) == 200
+            latencies.append(time.perf_counter() - started)
+        print(json.dumps({"first": latencies[0], "p50": statistics.median(latencies[50:])}))
+
+
+asyncio.run(main())
+"""
+
+
+def measure_first_request(tmp_path, warmup_batch_size: int, runs: int = 3) -> dict:
+    model_path = str(tmp_path / "model.pkl")
+    save_model(train_model(), model_path)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_REQUEST_PROBE],
+            cwd=root,
+            env={
+                **os.environ,
+                "PYTHONPATH": root,
+                "MODEL_PATH": model_path,
+                "LOG_LEVEL": "WARNING",
+                "WARMUP_BATCH_SIZE": str(warmup_batch_size),
+            },
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(json.loads(result.stdout.splitlines()[-1]))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+class TestFirstRequestLatency:
+    def test_first_request_after_readiness_matches_steady_state(self, tmp_path):
+        latency = measure_first_request(tmp_path, warmup_batch_size=64)
+
+        assert latency["first"] < 3 * latency["p50"]
+
+    def test_first_request_without_warmup_is_cold(self, tmp_path):
+        latency = measure_first_request(tmp_path, warmup_batch_size=0)
+
+        assert latency["first"] > 3 * latency["p50"]
+
+
+class TestReadiness:
+    @pytest.fixture(autouse=True)
+    def reset_model(self):
+        yield
+        ModerationService.model = None
+        ModerationService.model_version = None
+
+    def test_ready_after_model_load_and_warmup(self):
+        probe = Readiness(warmup_batch_size=16, poll_interval=0.01)
+
+        async def scenario():
+            await probe.start(app)
+            await asyncio.sleep(0.05)
+            before = probe.status()
+            ModerationService.model = train_model()
+            while not probe.ready:
+                await asyncio.sleep(0.01)
+            await probe.stop()
+            return before
+
+        with patch.object(ModerationService, "warm_up", wraps=ModerationService.warm_up) as warm_up_spy, \
+                patch.object(ModerationService, "score_batch", wraps=ModerationService.score_batch) as batch_spy, \
+                patch.object(ModerationService, "predict", wraps=ModerationService.predict) as predict_spy:
+            before = asyncio.run(scenario())
+
+        assert before["reason"] == "model_not_loaded"
+        assert sorted(len(call.args[1]) for call in warm_up_spy.call_args_list) == [1] * 16 + [16]
+        assert batch_spy.call_count == 0
+        assert predict_spy.call_count == 0
+        assert probe.warmup_seconds > 0
+        assert probe.status()["reason"] == "draining"
+
+    def test_failed_warmup_keeps_service_unready(self):
+        ModerationService.model = train_model()
+        probe = Readiness(warmup_batch_size=4, poll_interval=0.01)
+
+        async def scenario():
+            await probe.start(app)
+            await asyncio.sleep(0.1)
+            status = probe.status()
+            await probe.stop()
+            return status
+
+        with patch.object(ModerationService, "warm_up", side_effect=RuntimeError("boom")):
+            status = asyncio.run(scenario())
+
+        assert status["ready"] is False
+        assert status["reason"] == "warming_up"
+        assert status["last_error"] == "boom"
+
+    def test_warmup_leaves_no_request_state(self):
+        ModerationService.model = train_model()
+        ModerationService.cache = PredictionCache(1000)
+        probe = Readiness(warmup_batch_size=16)
+        requests = dict(metrics.REQUESTS.values())
+        predictions = dict(metrics.PREDICTIONS.values())
+        stats = dedup.stats()
+
+        try:
+            with patch.object(shadow, "submit") as submit, patch.object(shadow, "submit_batch") as submit_batch, \
+                    patch("services.moderation_service.logger.info") as log:
+                asyncio.run(probe.warm_up(app))
+            assert ModerationService.cache.stats()["size"] == 0
+        finally:
+            ModerationService.cache = None
+
+        assert probe.ready
+        assert metrics.REQUESTS.values() == requests
+        assert metrics.PREDICTIONS.values() == predictions
+        assert dedup.stats() == stats
+        assert submit.call_count == submit_batch.call_count == log.call_count == 0
+
+    def test_empty_warmup_batch(self):
+        ModerationService.model = train_model()
+        probe = Readiness(warmup_batch_size=0)
+
+        asyncio.run(probe.warm_up(app))
+
+        assert probe.ready
+
+
+class TestHealthEndpoints:
+    @pytest.fixture(autouse=True)
+    def reset_state(self):
+        yield
+        ModerationService.model = None
+        readiness.warmed_up = False
+        readiness.draining = False
+
+    def test_live(self, app_client):
+        response = app_client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_not_ready_without_model(self, app_client):
+        response = app_client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["reason"] == "model_not_loaded"
+
+    def test_ready(self, app_client):
+        ModerationService.model = train_model()
+        readiness.warmed_up = True
+
+        response = app_client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    def test_not_ready_while_draining(self, app_client):
+        ModerationService.model = train_model()
+        readiness.warmed_up = True
+        readiness.draining = True
+
+        assert app_client.get("/health/ready").json()["reason"] == "draining"
+
+
+class TestAdmissionControl:
+    def test_windowed_min(self):
+        window = WindowedMin(1.0)
+        start = window._start
+
+        window.observe(0.3, start + 0.1)
+        window.observe(0.2, start + 0.5)
+        assert window.value(start + 0.9) == 0.0
+        assert window.value(start + 1.1) == 0.2
+        assert window.value(start + 3.5) == 0.0
+
+    def test_disabled_by_default(self):
+        controller = AdmissionController(target_ms=0)
+        controller.observe_queue(10.0)
+
+        controller.check()
+
+    def test_sheds_when_queue_latency_exceeds_target(self):
+        controller = AdmissionController(target_ms=10, interval_ms=20, max_retry_after=5)
+        controller.observe_queue(0.05)
+        controller.observe_queue(2.5)
+        time.sleep(0.025)
+        controller.observe_queue(0.05)
+
+        with pytest.raises(ServiceOverloadedError) as error:
+            controller.check()
+        assert error.value.retry_after == 1
+        assert controller.shed == 1
+
+        time.sleep(0.05)
+        controller.check()
+
+    def test_retry_after_is_capped(self):
+        controller = AdmissionController(target_ms=10, max_retry_after=5)
+
+        assert controller.retry_after(0.5) == 1
+        assert controller.retry_after(3.2) == 4
+        assert controller.retry_after(60) == 5
+
+    def test_loop_lag_is_observed(self):
+        controller = AdmissionController(target_ms=10, interval_ms=50)
+
+        async def scenario():
+            await controller.start()
+            await asyncio.sleep(0.01)
+            deadline = time.perf_counter() + 0.2
+            while time.perf_counter() < deadline:
+                time.sleep(0.03)
+                await asyncio.sleep(0)
+            latency = controller.queue_latency()
+            await controller.stop()
+            return latency
+
+        assert asyncio.run(scenario()) > 0.01
+
+    def test_executor_reports_queue_delay(self):
+        inference = InferenceExecutor(mode="thread", pool_size=1, queue_depth=8)
+        inference.start()
+        delays = []
+
+        async def scenario():
+            await asyncio.gather(*(inference.run(time.sleep, 0.02) for _ in range(4)))
+
+        try:
+            with patch.object(admission, "observe_queue", side_effect=delays.append):
+                asyncio.run(scenario())
+        finally:
+            inference.shutdown()
+
+        assert len(delays) == 4
+        assert max(delays) >= 0.05
+
+    def test_predict_returns_retry_after(self, app_client):
+        ModerationService.model = train_model()
+        try:
+            with patch.object(admission, "check", side_effect=ServiceOverloadedError("Сервис перегружен", 7)):
+                response = app_client.post("/predict/", json=REQUEST.model_dump())
+                batch = app_client.post("/predict/batch", json={"items": [REQUEST.model_dump()]})
+        finally:
+            ModerationService.model = None
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "7"
+        assert batch.status_code == 503
+        assert batch.headers["retry-after"] == "7"
@@ -0,0 +1,117 @@
+import json
+import logging
+import threading
+import pytest
+from unittest.mock import patch
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+import logging_config
+
+
+REQUEST = PredictionRequest(
+    seller_id=7,
+    is_verified_seller=True,
+    item_id=70,
+    name="Test Item",
+    description="D" * 250,
+    category=42,
+    images_qty=3,
+)
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(self.format(record))
+
+
+def collect(**settings) -> CollectingHandler:
+    handler = CollectingHandler()
+    logging_config.setup_logging(handler=handler, **settings)
+    return handler
+
+
+def flush():
+    logging_config.shutdown_logging()
+
+
+class TestServiceLogging:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+        logging_config.setup_logging()
+
+    def test_text_format_keeps_key_value_layout(self):
+        handler = collect(level="INFO", log_format="text", sample_rate=1.0)
+
+        ModerationService.predict(REQUEST)
+        flush()
+
+        assert len(handler.lines) == 3
+        assert handler.lines[0].endswith(
+            "services.moderation_service - INFO - Запрос на предсказание - seller_id: 7, item_id: 70, "
+            "is_verified_seller: True, images_qty: 3, description_length: 250, category: 42"
+        )
+        assert "features: [1.0, 0.3, 0.25, 0.42]" in handler.lines[1]
+        assert "Результат предсказания - seller_id: 7, item_id: 70, is_violation:" in handler.lines[2]
+
+    def test_json_format(self):
+        handler = collect(level="INFO", log_format="json", sample_rate=1.0)
+
+        ModerationService.predict(REQUEST)
+        flush()
+
+        records = [json.loads(line) for line in handler.lines]
+        assert records[0]["message"] == "Запрос на предсказание"
+        assert records[0]["seller_id"] == 7
+        assert records[0]["description_length"] == 250
+        assert records[1]["features"] == [1.0, 0.3, 0.25, 0.42]
+        assert isinstance(records[2]["is_violation"], bool)
+        assert records[2]["level"] == "INFO"
+
+    def test_records_are_written_off_request_thread(self):
+        handler = collect(level="INFO", sample_rate=1.0)
+
+        ModerationService.predict(REQUEST)
+        flush()
+
+        assert handler.lines
+        assert threading.current_thread().name not in handler.threads
+
+    def test_disabled_level_skips_request_logging(self):
+        handler = collect(level="WARNING", sample_rate=1.0)
+
+        with patch("services.moderation_service.should_sample") as sampler:
+            ModerationService.predict(REQUEST)
+            ModerationService.predict_batch([REQUEST])
+        flush()
+
+        sampler.assert_not_called()
+        assert handler.lines == []
+
+    def test_sampling(self):
+        handler = collect(level="INFO", sample_rate=0.0)
+
+        for _ in range(20):
+            ModerationService.predict(REQUEST)
+        flush()
+
+        assert handler.lines == []
+
+    def test_sampled_request_logs_all_lines(self):
+        handler = collect(level="INFO", sample_rate=0.5)
+
+        with patch("logging_config.random.random", side_effect=[0.9, 0.1]):
+            ModerationService.predict(REQUEST)
+            ModerationService.predict(REQUEST)
+        flush()
+
+        assert len(handler.lines) == 3
@@ -0,0 +1,127 @@
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.features import FeatureEncoder
+from services.scorer import LookupTableScorer, build_lookup_table
+
+
+def key_grid() -> np.ndarray:
+    lengths = np.unique(np.concatenate([np.arange(0, 1001, 7), [1, 999, 1000]]))
+    grid = np.meshgrid(np.arange(2), np.arange(11), lengths, np.arange(101), indexing="ij")
+    return np.stack([axis.ravel() for axis in grid], axis=1)
+
+
+def make_requests():
+    return [
+        PredictionRequest(
+            seller_id=i,
+            is_verified_seller=i % 3 == 0,
+            item_id=i,
+            name="Item",
+            description="D" * (i * 97 % 1700),
+            category=i % 130 - 10,
+            images_qty=i % 17,
+        )
+        for i in range(300)
+    ]
+
+
+class TestLookupTableScorer:
+    @pytest.fixture
+    def model(self):
+        from model import train_model
+        return train_model()
+
+    def test_table_is_exact_over_key_space(self, model):
+        keys = key_grid()
+        features = keys / np.array([1.0, 10.0, 1000.0, 100.0])
+
+        expected = model.predict_proba(features)[:, 1]
+
+        np.testing.assert_allclose(build_lookup_table(model).predict_keys(keys), expected, rtol=0, atol=1e-12)
+
+    def test_predict_key_matches_predict_proba(self, model):
+        table = build_lookup_table(model)
+        encoder = FeatureEncoder()
+
+        for request in make_requests():
+            expected = model.predict_proba(encoder.encode(request).reshape(1, -1))[0][1]
+            assert abs(table.predict_key(encoder.key(request)) - expected) <= 1e-12
+
+    def test_encode_keys_matches_single_keys(self):
+        requests = make_requests()
+        encoder = FeatureEncoder()
+
+        assert encoder.encode_keys(requests).tolist() == [list(map(int, encoder.key(r))) for r in requests]
+
+    def test_unsupported_models(self):
+        X = np.random.default_rng(0).random((60, 4))
+        tree = DecisionTreeClassifier().fit(X, np.arange(60) % 2)
+        five_features = LogisticRegression().fit(np.random.default_rng(0).random((60, 5)), np.arange(60) % 2)
+
+        assert build_lookup_table(tree) is None
+        assert build_lookup_table(five_features) is None
+
+
+class TestLookupBackend:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        ModerationService.backend = "lookup"
+        yield
+        ModerationService.model = None
+        ModerationService.backend = "sklearn"
+
+    def test_predictions_match_sklearn_backend(self):
+        requests = make_requests()
+
+        single = [ModerationService.predict(r) for r in requests]
+        batch = ModerationService.predict_batch(requests)
+        ModerationService.backend = "sklearn"
+        expected = ModerationService.predict_batch(requests)
+
+        for one, many, reference in zip(single, batch, expected):
+            assert one.is_violation == many.is_violation == reference.is_violation
+            assert abs(one.probability - reference.probability) <= 1e-12
+            assert abs(many.probability - reference.probability) <= 1e-12
+
+    def test_score_columns_matches_predict_batch(self):
+        requests = make_requests()
+        columns = {
+            "is_verified_seller": np.array([r.is_verified_seller for r in requests]),
+            "images_qty": np.array([r.images_qty for r in requests]),
+            "description_length": np.array([len(r.description) for r in requests]),
+            "category": np.array([r.category for r in requests]),
+        }
+
+        probabilities, violations = ModerationService.score_columns(columns)
+        expected = ModerationService.predict_batch(requests)
+
+        assert violations.tolist() == [e.is_violation for e in expected]
+        np.testing.assert_allclose(probabilities, [e.probability for e in expected], rtol=0, atol=1e-12)
+
+    def test_lookup_backend_does_not_call_model(self):
+        requests = make_requests()[:10]
+        ModerationService.predict(requests[0])
+
+        def fail(*args, **kwargs):
+            raise AssertionError("predict_proba не должен вызываться")
+
+        ModerationService.model.predict_proba = fail
+        ModerationService.predict(requests[1])
+        ModerationService.predict_batch(requests)
+
+        assert isinstance(ModerationService._get_scorer(ModerationService.model), LookupTableScorer)
+
+    def test_falls_back_for_unsupported_model(self):
+        X = np.random.default_rng(0).random((60, 4))
+        ModerationService.model = DecisionTreeClassifier(random_state=0).fit(X, np.arange(60) % 2)
+
+        result = ModerationService.predict(make_requests()[0])
+
+        assert 0.0 <= result.probability <= 1.0
+        assert ModerationService._get_scorer(ModerationService.model) is None
@@ -0,0 +1,112 @@
+import threading
+import pytest
+from unittest.mock import patch
+from services.moderation_service import ModerationService
+from services.metrics import Counter, Histogram, MetricsRegistry
+
+
+PAYLOAD = {
+    "seller_id": 1,
+    "is_verified_seller": False,
+    "item_id": 100,
+    "name": "Test Item",
+    "description": "Short description",
+    "category": 1,
+    "images_qty": 0,
+}
+
+
+def sample(text: str, series: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestMetricPrimitives:
+    def test_counter_merges_thread_shards(self):
+        counter = Counter("test_total", "test", ("outcome",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(("success",))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.values() == {("success",): 8000}
+        assert counter.render() == ['test_total{outcome="success"} 8000']
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("test_total", "test", ("model_version",))
+        counter.inc(('C:\\models\\"v1"\nnext',))
+
+        assert counter.render() == ['test_total{model_version="C:\\\\models\\\\\\"v1\\"\\nnext"} 1']
+
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = Histogram("test_seconds", "test", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        registry = MetricsRegistry()
+        registry.register(histogram)
+        text = registry.render()
+
+        assert "# TYPE test_seconds histogram" in text
+        assert sample(text, 'test_seconds_bucket{le="0.1"}') == 2
+        assert sample(text, 'test_seconds_bucket{le="1.0"}') == 3
+        assert sample(text, 'test_seconds_bucket{le="+Inf"}') == 4
+        assert sample(text, "test_seconds_count") == 4
+        assert sample(text, "test_seconds_sum") == pytest.approx(3.65)
+
+
+class TestMetricsEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        ModerationService.model_version = "test-version"
+        yield
+        ModerationService.model = None
+        ModerationService.model_version = None
+        ModerationService.model_load_duration = None
+
+    def test_outcome_counters(self, app_client):
+        before = app_client.get("/metrics").text
+
+        app_client.post("/predict/", json=PAYLOAD)
+        app_client.post("/predict/", json={**PAYLOAD, "images_qty": -1})
+        with patch("services.moderation_service.ModerationService.predict", side_effect=ValueError("boom")):
+            app_client.post("/predict/", json=PAYLOAD)
+        ModerationService.model = None
+        app_client.post("/predict/", json=PAYLOAD)
+        after = app_client.get("/metrics").text
+
+        for outcome in ("success", "invalid", "error", "model_not_loaded"):
+            series = f'moderation_requests_total{{route="predict",outcome="{outcome}"}}'
+            assert sample(after, series) - sample(before, series) == 1
+
+    def test_stage_latency_and_prediction_histograms(self, app_client):
+        before = app_client.get("/metrics").text
+
+        app_client.post("/predict/", json=PAYLOAD)
+        app_client.post("/predict/batch", json={"items": [PAYLOAD, PAYLOAD]})
+        after = app_client.get("/metrics").text
+
+        for stage, expected in (("validation", 2), ("features", 1), ("model", 1), ("features_batch", 1),
+                                ("model_batch", 1), ("serialization", 2)):
+            series = f'moderation_stage_seconds_count{{stage="{stage}"}}'
+            assert sample(after, series) - sample(before, series) == expected
+        assert sample(after, "moderation_probability_count") - sample(before, "moderation_probability_count") == 3
+        assert sample(after, "moderation_batch_violation_rate_count") - sample(before, "moderation_batch_violation_rate_count") == 1
+
+    def test_model_gauges(self, app_client):
+        ModerationService.model_load_duration = 0.25
+
+        text = app_client.get("/metrics").text
+
+        assert sample(text, 'moderation_model_info{version="test-version"}') == 1
+        assert sample(text, "moderation_model_load_seconds") == 0.25
@@ -0,0 +1,171 @@
+import json
+import os
+import pickle
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from model import get_model_file_version, save_model, train_model
+from services.policy import ThresholdPolicy
+from model_artifact import (
+    META_FILE,
+    LinearModelArtifact,
+    load_local_model,
+    load_model_artifact,
+    save_model_artifact,
+)
+
+
+REQUEST = PredictionRequest(
+    seller_id=1,
+    is_verified_seller=False,
+    item_id=100,
+    name="Test Item",
+    description="Short description",
+    category=1,
+    images_qty=0,
+)
+
+
+@pytest.fixture
+def artifact_path(tmp_path):
+    path = str(tmp_path / "model.artifact")
+    save_model_artifact(train_model(), path)
+    return path
+
+
+class TestModelArtifact:
+    def test_roundtrip_is_memory_mapped(self, artifact_path):
+        model = train_model()
+
+        artifact = load_model_artifact(artifact_path)
+
+        assert isinstance(artifact.coef_.base, np.memmap)
+        np.testing.assert_array_equal(artifact.coef_, model.coef_)
+        np.testing.assert_array_equal(artifact.intercept_, model.intercept_)
+        X = np.random.default_rng(0).random((1000, 4))
+        np.testing.assert_allclose(artifact.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+
+    def test_metadata_header(self, artifact_path):
+        meta = load_model_artifact(artifact_path).meta
+
+        assert meta["features"] == ["is_verified_seller", "images_qty", "description_length", "category"]
+        assert meta["clip"] == [0.0, 1.0]
+        assert meta["threshold"] == 0.5
+        assert meta["version"] == meta["checksum"][:12]
+        assert get_model_file_version(artifact_path) == meta["version"]
+
+    def test_resave_replaces_weights(self, artifact_path):
+        rng = np.random.default_rng(1)
+        other = train_model()
+        other.coef_ = other.coef_ + rng.random(other.coef_.shape)
+        previous = load_model_artifact(artifact_path)
+
+        version = save_model_artifact(other, artifact_path, version="v2")
+
+        assert version == "v2"
+        assert len([name for name in os.listdir(artifact_path) if name.startswith("weights-")]) == 1
+        np.testing.assert_array_equal(load_model_artifact(artifact_path).coef_, other.coef_)
+        np.testing.assert_array_equal(previous.coef_, train_model().coef_)
+
+    def test_checksum_mismatch_is_rejected(self, artifact_path):
+        meta_path = os.path.join(artifact_path, META_FILE)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta["checksum"] = "0" * 64
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+
+        with pytest.raises(ValueError, match="Контрольная сумма"):
+            load_model_artifact(artifact_path)
+
+    def test_schema_mismatch_is_rejected(self, artifact_path):
+        meta_path = os.path.join(artifact_path, META_FILE)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta["features"] = meta["features"][::-1]
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+
+        with pytest.raises(ValueError, match="Схема признаков"):
+            load_model_artifact(artifact_path)
+
+    def test_seller_features_roundtrip(self, tmp_path):
+        path = str(tmp_path / "sellers.artifact")
+        rng = np.random.default_rng(0)
+        X = rng.random((200, 6))
+        model = LogisticRegression().fit(X, (X[:, 4] > 0.5).astype(int))
+
+        save_model_artifact(model, path)
+        loaded = load_model_artifact(path)
+
+        assert loaded.n_features_in_ == 6
+        assert loaded.meta["features"][-2:] == ["seller_violation_rate", "seller_listing_count"]
+        np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=1e-12)
+
+    def test_unknown_feature_count_is_rejected(self, tmp_path):
+        X = np.random.default_rng(0).random((50, 5))
+        model = LogisticRegression().fit(X, np.arange(50) % 2)
+
+        with pytest.raises(ValueError, match="не поддерживается"):
+            save_model_artifact(model, str(tmp_path / "model.artifact"))
+
+    def test_pickling_reopens_mapping(self, artifact_path):
+        restored = pickle.loads(pickle.dumps(load_model_artifact(artifact_path)))
+
+        assert isinstance(restored, LinearModelArtifact)
+        assert isinstance(restored.coef_.base, np.memmap)
+
+    def test_load_local_model_falls_back_to_pickle(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+        save_model(train_model(), path)
+
+        np.testing.assert_array_equal(load_local_model(path).coef_, train_model().coef_)
+
+
+class TestServiceWithArtifact:
+    @pytest.fixture(autouse=True)
+    def reset_model(self):
+        yield
+        ModerationService.model = None
+        ModerationService.model_version = None
+        ModerationService.backend = "sklearn"
+        ModerationService.policy = ThresholdPolicy()
+
+    @pytest.mark.parametrize("backend", ["sklearn", "compiled", "lookup"])
+    def test_service_loads_artifact(self, artifact_path, backend):
+        ModerationService.backend = backend
+        ModerationService.model = train_model()
+        expected = ModerationService.predict(REQUEST)
+
+        ModerationService.load_model(model_path=artifact_path)
+
+        assert isinstance(ModerationService.model, LinearModelArtifact)
+        assert ModerationService.model_version == get_model_file_version(artifact_path)
+        result = ModerationService.predict(REQUEST)
+        assert result.is_violation == expected.is_violation
+        assert abs(result.probability - expected.probability) <= 1e-12
+
+    def test_artifact_threshold_becomes_policy_default(self, tmp_path):
+        path = str(tmp_path / "strict.artifact")
+        save_model_artifact(train_model(), path, threshold=0.99)
+
+        ModerationService.load_model(model_path=path)
+
+        assert ModerationService.policy.default == 0.99
+        assert ModerationService.predict(REQUEST).is_violation is False
+
+        pickled = str(tmp_path / "model.pkl")
+        save_model(train_model(), pickled)
+        ModerationService.load_model(model_path=pickled)
+        assert ModerationService.policy.default == 0.5
+
+    def test_rules_file_default_wins_over_artifact_threshold(self, tmp_path):
+        path = str(tmp_path / "strict.artifact")
+        save_model_artifact(train_model(), path, threshold=0.99)
+        ModerationService.policy = ThresholdPolicy(default=0.3, version="rules")
+
+        ModerationService.load_model(model_path=path)
+
+        assert ModerationService.policy.default == 0.3
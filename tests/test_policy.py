@@ -0,0 +1,208 @@
+import json
+import numpy as np
+import pytest
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.policy import DEFAULT_THRESHOLD, ThresholdPolicy
+from services.reloader import PolicyReloader
+
+
+def make_requests():
+    return [
+        PredictionRequest(
+            seller_id=i % 7,
+            is_verified_seller=i % 2 == 0,
+            item_id=i,
+            name="Item",
+            description="D" * (i * 53 % 1200),
+            category=i % 15 - 2,
+            images_qty=i % 9,
+        )
+        for i in range(120)
+    ]
+
+
+class TestThresholdPolicy:
+    def test_default_policy(self):
+        policy = ThresholdPolicy()
+
+        assert policy.threshold(1, 5) == DEFAULT_THRESHOLD
+        assert policy.rules == 0
+
+    def test_seller_override_wins_over_category(self):
+        policy = ThresholdPolicy(default=0.5, categories={5: 0.7}, sellers={42: 0.2})
+
+        assert policy.threshold(42, 5) == 0.2
+        assert policy.threshold(1, 5) == 0.7
+        assert policy.threshold(1, 6) == 0.5
+        assert policy.threshold(1, -1) == 0.5
+        assert policy.threshold(1, 10_000) == 0.5
+
+    def test_vectorized_thresholds_match_scalar(self):
+        policy = ThresholdPolicy(default=0.4, categories={0: 0.1, 3: 0.9, 11: 0.6}, sellers={2: 0.3, 5: 0.95})
+        seller_ids = [i % 7 for i in range(200)]
+        categories = np.array([i % 17 - 3 for i in range(200)])
+
+        thresholds = policy.thresholds(categories, seller_ids)
+
+        assert thresholds.tolist() == [policy.threshold(s, int(c)) for s, c in zip(seller_ids, categories)]
+
+    def test_seller_lookup_handles_ids_outside_rules(self):
+        rng = np.random.default_rng(0)
+        sellers = {int(seller_id): float(rng.random()) for seller_id in rng.integers(0, 10_000, 500)}
+        policy = ThresholdPolicy(default=0.5, sellers=sellers)
+        seller_ids = rng.integers(-100, 20_000, 5_000).tolist() + [min(sellers), max(sellers), max(sellers) + 1]
+        categories = np.zeros(len(seller_ids), dtype=np.int64)
+
+        thresholds = policy.thresholds(categories, seller_ids)
+
+        assert thresholds.tolist() == [policy.threshold(s, 0) for s in seller_ids]
+
+    def test_thresholds_without_sellers(self):
+        policy = ThresholdPolicy(categories={1: 0.9}, sellers={7: 0.1})
+
+        assert policy.thresholds(np.array([1, 2])).tolist() == [0.9, 0.5]
+
+    @pytest.mark.parametrize("rules", [
+        {"default": 1.5},
+        {"categories": {"1": -0.1}},
+        {"categories": {"-1": 0.5}},
+        {"sellers": {"abc": 0.5}},
+        {"categories": {"1000000000": 0.3}},
+        {"categories": [0.3]},
+        {"categories": 0.3},
+        {"sellers": ["1"]},
+        {"sellers": None},
+        {"sellers": {"1": [0.3]}},
+    ])
+    def test_invalid_rules(self, rules):
+        with pytest.raises(ValueError):
+            ThresholdPolicy.from_json(json.dumps(rules).encode())
+
+    def test_from_json(self):
+        data = json.dumps({"default": 0.6, "categories": {"3": 0.8}, "sellers": {"10": 0.1}}).encode()
+
+        policy = ThresholdPolicy.from_json(data)
+
+        assert policy.describe() == {"version": policy.version, "default": 0.6, "categories": 1, "sellers": 1}
+        assert policy.version == ThresholdPolicy.from_json(data).version
+        assert policy.threshold(10, 3) == 0.1
+
+    def test_category_cap_is_configurable(self):
+        policy = ThresholdPolicy(categories={500: 0.3}, max_category=500)
+
+        assert policy.threshold(0, 500) == 0.3
+        with pytest.raises(ValueError):
+            ThresholdPolicy(categories={501: 0.3}, max_category=500)
+
+    def test_malformed_json(self):
+        with pytest.raises(ValueError):
+            ThresholdPolicy.from_json(b"{not json")
+        with pytest.raises(ValueError):
+            ThresholdPolicy.from_json(b"[]")
+
+
+class TestModerationServicePolicy:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+        ModerationService.policy = ThresholdPolicy()
+
+    def test_policy_applied_consistently(self):
+        requests = make_requests()
+        ModerationService.policy = ThresholdPolicy(
+            default=0.5, categories={0: 0.0, 4: 1.0, 7: 0.3}, sellers={3: 1.0, 5: 0.0}
+        )
+
+        single = [ModerationService.predict(r) for r in requests]
+        batch = ModerationService.predict_batch(requests)
+        _, columns_violations = ModerationService.score_columns({
+            "seller_id": np.array([r.seller_id for r in requests]),
+            "is_verified_seller": np.array([r.is_verified_seller for r in requests]),
+            "images_qty": np.array([r.images_qty for r in requests]),
+            "description_length": np.array([len(r.description) for r in requests]),
+            "category": np.array([r.category for r in requests]),
+        })
+
+        for request, one, many, column in zip(requests, single, batch, columns_violations.tolist()):
+            expected = one.probability > ModerationService.policy.threshold(request.seller_id, request.category)
+            assert one.is_violation == many.is_violation == column == expected
+            if request.seller_id == 3:
+                assert not one.is_violation
+            elif request.seller_id == 5:
+                assert one.is_violation
+
+    def test_cached_probabilities_respect_policy(self):
+        from services.cache import PredictionCache
+
+        request = make_requests()[0]
+        ModerationService.cache = PredictionCache(100)
+        try:
+            ModerationService.policy = ThresholdPolicy(sellers={request.seller_id: 0.0})
+            assert ModerationService.predict(request).is_violation
+            ModerationService.policy = ThresholdPolicy(sellers={request.seller_id: 1.0})
+            assert not ModerationService.predict(request).is_violation
+        finally:
+            ModerationService.cache = None
+
+
+class TestPolicyReloader:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.path = str(tmp_path / "policy.json")
+        self.write({"categories": {"1": 0.9}})
+        self.reloader = PolicyReloader(path=self.path, interval=0.01)
+        yield
+        ModerationService.policy = ThresholdPolicy()
+
+    def write(self, rules):
+        with open(self.path, "w") as f:
+            json.dump(rules, f)
+
+    def test_reload_only_on_change(self):
+        assert self.reloader.reload() is True
+        assert ModerationService.policy.threshold(0, 1) == 0.9
+        assert self.reloader.reload() is False
+
+        self.write({"categories": {"1": 0.2}})
+
+        assert self.reloader.reload() is True
+        assert ModerationService.policy.threshold(0, 1) == 0.2
+        assert self.reloader.reloads == 2
+
+    def test_invalid_rules_keep_previous_policy(self):
+        self.reloader.reload()
+        previous = ModerationService.policy
+        self.write({"default": 7})
+
+        with pytest.raises(ValueError):
+            self.reloader.reload()
+
+        assert ModerationService.policy is previous
+
+    def test_missing_path(self):
+        with pytest.raises(FileNotFoundError):
+            PolicyReloader(path="").reload()
+
+    def test_admin_endpoints(self, admin_client, monkeypatch):
+        import routers.admin
+
+        monkeypatch.setattr(routers.admin, "policy_reloader", self.reloader)
+
+        response = admin_client.post("/admin/policy/reload")
+        info = admin_client.get("/admin/policy")
+
+        assert response.status_code == 200
+        assert response.json()["reloaded"] is True
+        assert info.json()["categories"] == 1
+        assert info.json()["source"] == self.path
+
+    def test_admin_reload_missing_file(self, admin_client, monkeypatch):
+        import routers.admin
+
+        monkeypatch.setattr(routers.admin, "policy_reloader", PolicyReloader(path=self.path + ".missing"))
+
+        assert admin_client.post("/admin/policy/reload").status_code == 404
@@ -0,0 +1,358 @@
+import asyncio
+import os
+import pickle
+import statistics
+import time
+import httpx
+import numpy as np
+import pytest
+import config
+from sklearn.linear_model import LogisticRegression
+from main import app
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.registry import ModelRegistry, routing_bucket, routing_buckets
+from services.shadow import ShadowScorer, shadow
+from model import save_model, train_model
+
+
+def make_request(item_id: int) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=item_id % 50,
+        is_verified_seller=item_id % 2 == 0,
+        item_id=item_id,
+        name=f"Item {item_id}",
+        description="A" * (item_id * 37 % 1200),
+        category=item_id % 120,
+        images_qty=item_id % 13,
+    )
+
+
+def other_model() -> LogisticRegression:
+    rng = np.random.default_rng(3)
+    X = rng.random((300, 4))
+    return LogisticRegression().fit(X, (X[:, 2] > 0.5).astype(int))
+
+
+class SlowModel:
+    def __init__(self, model, delay: float):
+        self.model = model
+        self.delay = delay
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.model.predict_proba(X)
+
+
+async def run_shadow(scorer: ShadowScorer, submissions):
+    await scorer.start()
+    try:
+        for request, probability, is_violation in submissions:
+            scorer.submit(request, probability, is_violation)
+        await scorer.wait_idle()
+    finally:
+        await scorer.stop()
+
+
+class TestModelRegistry:
+    def test_routing_buckets_match_single_item(self):
+        item_ids = [0, 1, 7, 123456789, 2 ** 40 + 3, -5]
+
+        np.testing.assert_allclose(routing_buckets(item_ids), [routing_bucket(i) for i in item_ids])
+
+    def test_traffic_share_is_respected(self):
+        registry = ModelRegistry()
+        registry.register("v2", other_model())
+        registry.set_challenger("v2", traffic_share=0.1)
+
+        _, mask = registry.route_batch(list(range(20000)))
+
+        assert mask.mean() == pytest.approx(0.1, abs=0.01)
+        assert registry.routed == int(mask.sum())
+        assert [registry.routes(i) for i in range(200)] == mask[:200].tolist()
+
+    def test_invalid_challenger(self):
+        registry = ModelRegistry()
+        registry.register("v2", other_model())
+
+        with pytest.raises(KeyError):
+            registry.set_challenger("v3")
+        with pytest.raises(ValueError):
+            registry.set_challenger("v2", traffic_share=1.5)
+
+    def test_active_challenger_cannot_be_removed(self):
+        registry = ModelRegistry()
+        registry.register("v2", other_model())
+        registry.register("v3", other_model())
+        registry.set_challenger("v2")
+
+        with pytest.raises(ValueError):
+            registry.remove("v2")
+        registry.remove("v3")
+
+        assert registry.versions() == ["v2"]
+
+    def test_pickle_keeps_only_challenger(self):
+        registry = ModelRegistry()
+        registry.register("v2", other_model())
+        registry.register("v3", other_model())
+        registry.set_challenger("v3", traffic_share=0.25, shadow=False)
+
+        restored = pickle.loads(pickle.dumps(registry))
+
+        assert restored.versions() == ["v3"]
+        assert restored.active.traffic_share == 0.25
+        assert restored.active.shadow is False
+
+    def test_load_from_local_file(self, tmp_path):
+        path = str(tmp_path / "challenger.pkl")
+        save_model(other_model(), path)
+        registry = ModelRegistry()
+
+        model = registry.load("v2", path=path)
+
+        np.testing.assert_array_equal(model.coef_, other_model().coef_)
+        with pytest.raises(ValueError):
+            registry.load("v3")
+
+
+class TestChallengerRouting:
+    @pytest.fixture(autouse=True)
+    def setup_models(self):
+        self.champion = train_model()
+        self.challenger = other_model()
+        ModerationService.model = self.champion
+        ModerationService.registry.register("v2", self.challenger)
+        yield
+        ModerationService.model = None
+        ModerationService.registry = ModelRegistry()
+
+    def expected(self, model, requests):
+        return ModerationService._score_batch(model, requests)
+
+    def test_full_share_goes_to_challenger(self):
+        ModerationService.registry.set_challenger("v2", traffic_share=1.0)
+        requests = [make_request(i) for i in range(50)]
+
+        single = [ModerationService.predict(request).probability for request in requests]
+        batch, _ = ModerationService.score_batch(requests)
+
+        np.testing.assert_allclose(single, self.expected(self.challenger, requests))
+        np.testing.assert_allclose(batch, self.expected(self.challenger, requests))
+
+    def test_split_is_consistent_between_single_and_batch(self):
+        ModerationService.registry.set_challenger("v2", traffic_share=0.5)
+        requests = [make_request(i) for i in range(200)]
+        routed = np.array([ModerationService.registry.routes(r.item_id) for r in requests])
+        expected = np.where(routed, self.expected(self.challenger, requests), self.expected(self.champion, requests))
+
+        single = [ModerationService.predict(request).probability for request in requests]
+        batch, _ = ModerationService.score_batch(requests)
+
+        assert 0 < routed.sum() < len(requests)
+        np.testing.assert_allclose(single, expected)
+        np.testing.assert_allclose(batch, expected)
+        assert ModerationService.registry.routed == 2 * routed.sum()
+
+    def test_no_share_keeps_champion(self):
+        ModerationService.registry.set_challenger("v2", traffic_share=0.0)
+        requests = [make_request(i) for i in range(50)]
+
+        batch, _ = ModerationService.score_batch(requests)
+
+        np.testing.assert_allclose(batch, self.expected(self.champion, requests))
+        assert ModerationService.registry.routed == 0
+
+
+class TestShadowScoring:
+    @pytest.fixture(autouse=True)
+    def setup_models(self):
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+        ModerationService.registry = ModelRegistry()
+
+    def champion_results(self, requests):
+        return [(r, response.probability, response.is_violation)
+                for r, response in zip(requests, ModerationService.predict_batch(requests))]
+
+    def test_identical_challenger_fully_agrees(self):
+        ModerationService.registry.register("v2", ModerationService.model)
+        ModerationService.registry.set_challenger("v2")
+        scorer = ShadowScorer(max_batch_size=16, max_wait_ms=1)
+
+        asyncio.run(run_shadow(scorer, self.champion_results([make_request(i) for i in range(100)])))
+
+        stats = scorer.stats()
+        assert stats["version"] == "v2"
+        assert stats["compared"] == stats["submitted"] == 100
+        assert stats["agreement_rate"] == 1.0
+        assert stats["mean_abs_diff"] == pytest.approx(0.0, abs=1e-12)
+
+    def test_disagreement_is_counted(self):
+        ModerationService.registry.register("v2", other_model())
+        ModerationService.registry.set_challenger("v2")
+        requests = [make_request(i) for i in range(100)]
+        results = self.champion_results(requests)
+        scorer = ShadowScorer()
+
+        asyncio.run(run_shadow(scorer, results))
+
+        _, _, challenger_violations = ModerationService.score_shadow(requests)
+        expected_agreed = sum(v == c for (_, _, v), c in zip(results, challenger_violations.tolist()))
+        assert scorer.agreed == expected_agreed
+        assert scorer.compared == 100
+        assert scorer.stats()["mean_abs_diff"] > 0
+
+    def test_routed_requests_are_not_shadowed(self):
+        ModerationService.registry.register("v2", other_model())
+        ModerationService.registry.set_challenger("v2", traffic_share=0.5)
+        requests = [make_request(i) for i in range(100)]
+        routed = sum(ModerationService.registry.routes(r.item_id) for r in requests)
+        scorer = ShadowScorer()
+
+        asyncio.run(run_shadow(scorer, self.champion_results(requests)))
+
+        assert scorer.submitted == 100 - routed
+
+    def test_disabled_shadow_submits_nothing(self):
+        ModerationService.registry.register("v2", other_model())
+        ModerationService.registry.set_challenger("v2", shadow=False)
+        scorer = ShadowScorer()
+
+        asyncio.run(run_shadow(scorer, self.champion_results([make_request(i) for i in range(10)])))
+
+        assert scorer.submitted == 0
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        slow = SlowModel(ModerationService.model, delay=0.05)
+        ModerationService.registry.register("v2", slow)
+        ModerationService.registry.set_challenger("v2")
+        scorer = ShadowScorer(queue_size=4, max_batch_size=4, max_wait_ms=0)
+
+        asyncio.run(run_shadow(scorer, self.champion_results([make_request(i) for i in range(50)])))
+
+        assert scorer.dropped > 0
+        assert scorer.submitted + scorer.dropped == 50
+        assert scorer.compared == scorer.submitted
+
+    def test_challenger_errors_are_counted(self):
+        broken = SlowModel(None, delay=0)
+        ModerationService.registry.register("v2", broken)
+        ModerationService.registry.set_challenger("v2")
+        scorer = ShadowScorer()
+
+        asyncio.run(run_shadow(scorer, self.champion_results([make_request(i) for i in range(10)])))
+
+        assert scorer.errors == 10
+        assert scorer.compared == 0
+
+    def test_shadow_adds_no_user_facing_latency(self):
+        slow = SlowModel(ModerationService.model, delay=0.02)
+        ModerationService.registry.register("v2", slow)
+        payloads = [make_request(i).model_dump() for i in range(300)]
+
+        async def median_latency(client) -> float:
+            latencies = []
+            for payload in payloads:
+                started = time.perf_counter()
+                response = await client.post("/predict/", json=payload)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            return statistics.median(latencies)
+
+        async def scenario():
+            await shadow.start()
+            try:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                    await median_latency(client)
+                    ModerationService.registry.set_challenger("v2", shadow=False)
+                    baseline = await median_latency(client)
+                    ModerationService.registry.set_challenger("v2", shadow=True)
+                    shadowed = await median_latency(client)
+                    await shadow.wait_idle()
+                    return baseline, shadowed
+            finally:
+                await shadow.stop()
+
+        baseline, shadowed = asyncio.run(scenario())
+
+        assert shadow.compared == len(payloads)
+        assert slow.calls < len(payloads)
+        assert shadowed - baseline < 0.002
+
+
+class TestRegistryAdmin:
+    @pytest.fixture(autouse=True)
+    def setup_models(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "MODELS_DIR", str(tmp_path / "artifacts"))
+        self.path = str(tmp_path / "artifacts" / "challenger.pkl")
+        os.makedirs(os.path.dirname(self.path))
+        save_model(other_model(), self.path)
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+        ModerationService.registry = ModelRegistry()
+
+    def test_load_and_route_to_challenger(self, admin_client):
+        response = admin_client.post("/admin/models/v2", params={"path": self.path})
+        assert response.status_code == 200
+        assert response.json()["versions"] == ["v2"]
+
+        response = admin_client.post("/admin/challenger", params={"version": "v2", "traffic_share": 1.0})
+        assert response.status_code == 200
+        assert response.json()["challenger"] == "v2"
+
+        request = make_request(7)
+        response = admin_client.post("/predict/", json=request.model_dump())
+        expected = ModerationService._score_batch(other_model(), [request])[0]
+        assert response.json()["probability"] == pytest.approx(expected)
+
+        assert admin_client.delete("/admin/models/v2").status_code == 409
+        assert admin_client.delete("/admin/challenger").json()["challenger"] is None
+        assert admin_client.delete("/admin/models/v2").json()["versions"] == []
+
+    def test_errors(self, admin_client):
+        assert admin_client.post("/admin/models/v2", params={"path": self.path + ".missing"}).status_code == 404
+        assert admin_client.post("/admin/models/v2").status_code == 400
+        assert admin_client.post("/admin/challenger", params={"version": "v9"}).status_code == 404
+        assert admin_client.delete("/admin/models/v9").status_code == 404
+
+    def test_path_outside_models_dir_is_rejected(self, admin_client, tmp_path):
+        outside = str(tmp_path / "outside.pkl")
+        save_model(other_model(), outside)
+
+        assert admin_client.post("/admin/models/v2", params={"path": outside}).status_code == 403
+        assert admin_client.post("/admin/models/v2", params={"path": "../outside.pkl"}).status_code == 403
+        assert admin_client.post("/admin/models/v2", params={"path": "challenger.pkl"}).status_code == 200
+        assert ModerationService.registry.describe()["versions"] == ["v2"]
+
+    def test_mutations_are_refused_without_token(self, app_client):
+        assert app_client.post("/admin/models/v2", params={"path": self.path}).status_code == 403
+        assert app_client.post("/admin/challenger", params={"version": "v2"}).status_code == 403
+        assert app_client.delete("/admin/challenger").status_code == 403
+        assert app_client.get("/admin/models").status_code == 200
+        assert ModerationService.registry.describe()["versions"] == []
+
+    def test_models_dir_is_not_source_tree(self):
+        import models
+
+        assert os.path.realpath(config.MODELS_DIR) != os.path.dirname(os.path.realpath(models.__file__))
+
+    def test_admin_token(self, app_client, monkeypatch):
+        monkeypatch.setattr(config, "ADMIN_TOKEN", "secret")
+
+        assert app_client.get("/admin/models").status_code == 401
+        assert app_client.post("/admin/models/v2", params={"path": self.path}).status_code == 401
+        assert app_client.get("/admin/models", headers={"X-Admin-Token": "wrong"}).status_code == 401
+        assert app_client.get("/admin/models", headers={"X-Admin-Token": "secret"}).status_code == 200
+        assert ModerationService.registry.describe()["versions"] == []
+
+    def test_registry_info_includes_shadow_stats(self, app_client):
+        response = app_client.get("/admin/models")
+
+        assert response.status_code == 200
+        assert response.json()["challenger"] is None
+        assert "agreement_rate" in response.json()["shadow_stats"]
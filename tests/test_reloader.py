@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import pytest
+import numpy as np
+from unittest.mock import patch
+from sklearn.linear_model import LogisticRegression
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.reloader import ModelReloader, PeriodicReloader, reloader
+from model import save_model, train_model
+
+
+REQUEST = PredictionRequest(
+    seller_id=1,
+    is_verified_seller=False,
+    item_id=100,
+    name="Test Item",
+    description="Short description",
+    category=1,
+    images_qty=0,
+)
+
+
+def other_model() -> LogisticRegression:
+    rng = np.random.default_rng(3)
+    X = rng.random((300, 4))
+    return LogisticRegression().fit(X, (X[:, 2] > 0.5).astype(int))
+
+
+class TestModelReloader:
+    @pytest.fixture(autouse=True)
+    def setup_model(self, tmp_path):
+        self.path = str(tmp_path / "model.pkl")
+        save_model(train_model(), self.path)
+        self.reloader = ModelReloader(model_path=self.path, interval=0.01, use_mlflow=False)
+        yield
+        ModerationService.model = None
+        ModerationService.model_version = None
+
+    def test_reload_loads_new_version(self):
+        assert self.reloader.reload() is True
+        first_version = ModerationService.model_version
+        assert self.reloader.reload() is False
+
+        save_model(other_model(), self.path)
+
+        assert self.reloader.reload() is True
+        assert ModerationService.model_version != first_version
+        np.testing.assert_array_equal(ModerationService.model.coef_, other_model().coef_)
+        assert ModerationService.model_load_duration >= 0
+
+    def test_forced_reload(self):
+        self.reloader.reload()
+
+        assert self.reloader.reload(force=True) is True
+        assert self.reloader.reloads == 2
+
+    def test_failed_reload_keeps_current_model(self):
+        self.reloader.reload()
+        current = ModerationService.model
+        with open(self.path, "wb") as f:
+            f.write(b"not a pickle")
+
+        with pytest.raises(Exception):
+            self.reloader.reload()
+
+        assert ModerationService.model is current
+
+    def test_base_reloader_is_abstract(self):
+        with pytest.raises(TypeError):
+            PeriodicReloader(1.0)
+
+    def test_missing_model_file(self):
+        missing = ModelReloader(model_path=self.path + ".missing", use_mlflow=False)
+
+        with pytest.raises(FileNotFoundError):
+            missing.reload()
+
+    def test_in_flight_request_finishes_on_old_model(self):
+        self.reloader.reload()
+        old_model = ModerationService.model
+        expected_old = ModerationService.predict(REQUEST).probability
+        entered, release = threading.Event(), threading.Event()
+        original = old_model.predict_proba
+
+        def slow_predict_proba(X):
+            entered.set()
+            release.wait(5)
+            return original(X)
+
+        results = []
+        old_model.predict_proba = slow_predict_proba
+        worker = threading.Thread(target=lambda: results.append(ModerationService.predict(REQUEST)))
+        worker.start()
+        entered.wait(5)
+
+        save_model(other_model(), self.path)
+        self.reloader.reload()
+        new_result = ModerationService.predict(REQUEST)
+        release.set()
+        worker.join(5)
+
+        assert results[0].probability == expected_old
+        assert ModerationService.model is not old_model
+        assert new_result.probability == pytest.approx(other_model().predict_proba([[0.0, 0.0, 0.017, 0.01]])[0][1])
+
+    def test_background_polling_picks_up_new_file(self):
+        self.reloader.reload()
+        first_version = ModerationService.model_version
+
+        async def scenario():
+            await self.reloader.start()
+            save_model(other_model(), self.path)
+            for _ in range(200):
+                if ModerationService.model_version != first_version:
+                    break
+                await asyncio.sleep(0.01)
+            await self.reloader.stop()
+
+        asyncio.run(scenario())
+
+        assert ModerationService.model_version != first_version
+
+
+class TestAdminModelEndpoints:
+    @pytest.fixture(autouse=True)
+    def setup_model(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+        save_model(train_model(), path)
+        with patch.object(reloader, "model_path", path), patch.object(reloader, "use_mlflow", False):
+            yield
+        ModerationService.model = None
+        ModerationService.model_version = None
+
+    def test_reload_endpoint(self, admin_client):
+        response = admin_client.post("/admin/model/reload")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reloaded"] is True
+        assert data["loaded"] is True
+        assert data["version"] == ModerationService.model_version
+        assert data["load_duration"] >= 0
+
+        info = admin_client.get("/admin/model").json()
+        assert info["version"] == data["version"]
+        assert info["source"].endswith("model.pkl")
+
+    def test_reload_endpoint_missing_model(self, admin_client):
+        with patch.object(reloader, "model_path", "/nonexistent/model.pkl"):
+            response = admin_client.post("/admin/model/reload")
+
+        assert response.status_code == 404
@@ -0,0 +1,169 @@
+import csv
+import json
+import pytest
+from model import save_model, train_model
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.policy import ThresholdPolicy
+from score_cli import WRITERS, ResultWriter, main, plan_tasks, read_task, score_file, split_ranges
+
+
+def make_request(i: int) -> PredictionRequest:
+    return PredictionRequest(
+        seller_id=i,
+        is_verified_seller=i % 3 == 0,
+        item_id=1000 + i,
+        name=f"Item {i}",
+        description=("line one,\n\"quoted\" line two " if i % 4 == 0 else "plain ") * (i % 90),
+        category=i % 130,
+        images_qty=i % 14,
+    )
+
+
+REQUESTS = [make_request(i) for i in range(200)]
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    save_model(train_model(), path)
+    yield path
+    ModerationService.model = None
+    ModerationService.model_version = None
+    ModerationService.policy = ThresholdPolicy()
+
+
+def write_csv(path, requests):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["item_id", "seller_id", "name", "description", "category", "images_qty", "is_verified_seller"])
+        for r in requests:
+            writer.writerow([r.item_id, r.seller_id, r.name, r.description, r.category, r.images_qty, r.is_verified_seller])
+
+
+def write_ndjson(path, requests):
+    with open(path, "w", encoding="utf-8") as f:
+        for r in requests:
+            f.write(r.model_dump_json() + "\n")
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [
+            (int(row["item_id"]), row["is_violation"] == "true", float(row["probability"]))
+            for row in csv.DictReader(f)
+        ]
+
+
+def expected_results(requests):
+    results = []
+    for r in requests:
+        response = ModerationService.predict(r)
+        results.append((r.item_id, response.is_violation, response.probability))
+    return results
+
+
+def assert_same_results(actual, expected):
+    assert [(item_id, is_violation) for item_id, is_violation, _ in actual] == [
+        (item_id, is_violation) for item_id, is_violation, _ in expected
+    ]
+    assert [p for _, _, p in actual] == pytest.approx([p for _, _, p in expected])
+
+
+class TestSplitRanges:
+    def test_csv_ranges_do_not_split_quoted_newlines(self, tmp_path):
+        path = str(tmp_path / "input.csv")
+        write_csv(path, REQUESTS)
+
+        tasks = plan_tasks(path, "csv", chunk_bytes=512)
+
+        assert len(tasks) > 10
+        rows = sum(len(read_task(task)["item_id"]) for task in tasks)
+        assert rows == len(REQUESTS)
+
+    def test_ranges_cover_file(self, tmp_path):
+        path = str(tmp_path / "input.ndjson")
+        write_ndjson(path, REQUESTS)
+
+        ranges = split_ranges(path, 0, chunk_bytes=1000, quote_aware=False)
+
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == (tmp_path / "input.ndjson").stat().st_size
+        assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
+
+
+class TestScoreFile:
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_csv_matches_predict(self, tmp_path, model_path, processes):
+        input_path = str(tmp_path / "input.csv")
+        output_path = str(tmp_path / "output.csv")
+        write_csv(input_path, REQUESTS)
+
+        rows = score_file(input_path, output_path, processes=processes, chunk_bytes=2048, model_path=model_path)
+
+        assert rows == len(REQUESTS)
+        assert_same_results(read_results(output_path), expected_results(REQUESTS))
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_policy_file_is_applied(self, tmp_path, model_path, processes):
+        input_path = str(tmp_path / "input.csv")
+        output_path = str(tmp_path / "output.csv")
+        policy_path = str(tmp_path / "policy.json")
+        write_csv(input_path, REQUESTS)
+        with open(policy_path, "w") as f:
+            json.dump({"default": 0.99, "categories": {"5": 0.0}, "sellers": {"7": 1.0}}, f)
+
+        assert main([
+            input_path, output_path, "--processes", str(processes), "--chunk-bytes", "2048",
+            "--model-path", model_path, "--policy", policy_path,
+        ]) == 0
+
+        results = read_results(output_path)
+        ModerationService.policy = ThresholdPolicy.from_file(policy_path)
+        assert_same_results(results, expected_results(REQUESTS))
+        violations = {item_id for item_id, is_violation, _ in results if is_violation}
+        assert violations == {r.item_id for r in REQUESTS if r.category == 5 and r.seller_id != 7}
+
+    def test_ndjson_input_and_output(self, tmp_path, model_path):
+        input_path = str(tmp_path / "input.jsonl")
+        output_path = str(tmp_path / "output.ndjson")
+        write_ndjson(input_path, REQUESTS)
+
+        score_file(input_path, output_path, chunk_bytes=4096, model_path=model_path)
+
+        with open(output_path, encoding="utf-8") as f:
+            actual = [(r["item_id"], r["is_violation"], r["probability"]) for r in map(json.loads, f)]
+        assert_same_results(actual, expected_results(REQUESTS))
+
+    def test_parquet_input_and_output(self, tmp_path, model_path):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.parquet
+
+        input_path = str(tmp_path / "input.parquet")
+        output_path = str(tmp_path / "output.parquet")
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pylist([r.model_dump() for r in REQUESTS]), input_path, row_group_size=30
+        )
+
+        main([input_path, output_path, "--processes", "2", "--model-path", model_path])
+
+        table = pyarrow.parquet.read_table(output_path).to_pydict()
+        actual = list(zip(table["item_id"], table["is_violation"], table["probability"]))
+        assert_same_results(actual, expected_results(REQUESTS))
+
+    @pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+    def test_writer_is_closed_on_error(self, tmp_path, fmt):
+        with pytest.raises(RuntimeError):
+            with WRITERS[fmt](str(tmp_path / f"out.{fmt}")) as writer:
+                raise RuntimeError("boom")
+
+        assert isinstance(writer, ResultWriter)
+        assert writer._file.closed
+
+    def test_missing_columns(self, tmp_path, model_path):
+        input_path = str(tmp_path / "input.csv")
+        with open(input_path, "w") as f:
+            f.write("item_id,seller_id\n1,2\n")
+
+        with pytest.raises(ValueError, match="description"):
+            score_file(input_path, str(tmp_path / "output.csv"), model_path=model_path)
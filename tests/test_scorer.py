@@ -0,0 +1,122 @@
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.scorer import CompiledLogisticScorer, compile_scorer
+
+
+def random_features(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    features = rng.random((n, 4))
+    features[0] = 0.0
+    features[1] = 1.0
+    features[2, :] = [1.0, 0.0, 1.0, 0.0]
+    return features
+
+
+def fitted_models():
+    from model import train_model
+    rng = np.random.default_rng(7)
+    X = rng.random((500, 4))
+    y = (X[:, 2] + rng.normal(0, 0.2, 500) > 0.5).astype(int)
+    return [
+        train_model(),
+        LogisticRegression(C=100.0).fit(X, y),
+        LogisticRegression(fit_intercept=False).fit(X, y),
+    ]
+
+
+class TestCompiledLogisticScorer:
+    @pytest.mark.parametrize("model", fitted_models())
+    def test_batch_matches_predict_proba(self, model):
+        features = random_features(10_000)
+        scorer = compile_scorer(model)
+
+        expected = model.predict_proba(features)[:, 1]
+
+        np.testing.assert_allclose(scorer.predict_proba(features), expected, rtol=0, atol=1e-12)
+
+    @pytest.mark.parametrize("model", fitted_models())
+    def test_single_row_matches_predict_proba(self, model):
+        scorer = compile_scorer(model)
+
+        for row in random_features(200, seed=1):
+            expected = model.predict_proba([row.tolist()])[0][1]
+            assert abs(scorer.predict_one(row) - expected) <= 1e-12
+
+    def test_extreme_logits(self):
+        scorer = CompiledLogisticScorer(np.array([1000.0, 0.0, 0.0, 0.0]), -500.0)
+        features = np.array([[0.0, 0, 0, 0], [1.0, 0, 0, 0]])
+
+        np.testing.assert_allclose(scorer.predict_proba(features), [0.0, 1.0], atol=1e-12)
+        assert scorer.predict_one(features[0]) == pytest.approx(0.0, abs=1e-12)
+        assert scorer.predict_one(features[1]) == pytest.approx(1.0, abs=1e-12)
+
+    def test_unsupported_models_are_not_compiled(self):
+        X = np.random.default_rng(0).random((60, 4))
+        multiclass = LogisticRegression().fit(X, np.arange(60) % 3)
+        tree = DecisionTreeClassifier().fit(X, np.arange(60) % 2)
+
+        assert compile_scorer(multiclass) is None
+        assert compile_scorer(tree) is None
+        assert compile_scorer(None) is None
+
+
+class TestCompiledBackend:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        ModerationService.backend = "compiled"
+        yield
+        ModerationService.model = None
+        ModerationService.backend = "sklearn"
+
+    def test_predict_matches_sklearn_backend(self):
+        requests = [
+            PredictionRequest(
+                seller_id=i,
+                is_verified_seller=i % 2 == 0,
+                item_id=i,
+                name="Item",
+                description="D" * (i * 53 % 1300),
+                category=i % 110,
+                images_qty=i % 12,
+            )
+            for i in range(50)
+        ]
+
+        compiled_single = [ModerationService.predict(r) for r in requests]
+        compiled_batch = ModerationService.predict_batch(requests)
+        ModerationService.backend = "sklearn"
+        expected = ModerationService.predict_batch(requests)
+
+        for single, batch, reference in zip(compiled_single, compiled_batch, expected):
+            assert single.is_violation == batch.is_violation == reference.is_violation
+            assert abs(single.probability - reference.probability) <= 1e-12
+            assert abs(batch.probability - reference.probability) <= 1e-12
+
+    def test_scorer_is_rebuilt_when_model_changes(self):
+        first = ModerationService._get_scorer(ModerationService.model)
+        assert ModerationService._get_scorer(ModerationService.model) is first
+
+        ModerationService.model = fitted_models()[1]
+
+        second = ModerationService._get_scorer(ModerationService.model)
+        assert second is not first
+        np.testing.assert_array_equal(second.coef, ModerationService.model.coef_[0])
+
+    def test_falls_back_to_sklearn_for_unsupported_model(self):
+        X = np.random.default_rng(0).random((60, 4))
+        ModerationService.model = DecisionTreeClassifier(random_state=0).fit(X, np.arange(60) % 2)
+        request = PredictionRequest(
+            seller_id=1, is_verified_seller=True, item_id=1, name="Item",
+            description="Text", category=1, images_qty=1,
+        )
+
+        result = ModerationService.predict(request)
+
+        assert 0.0 <= result.probability <= 1.0
+        assert ModerationService._get_scorer(ModerationService.model) is None
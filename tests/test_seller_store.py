@@ -0,0 +1,216 @@
+import asyncio
+import pickle
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.seller_store import (
+    DEFAULT_SELLER_FEATURES,
+    InMemorySellerStore,
+    SellerFeatureCache,
+    SQLiteSellerStore,
+    create_seller_store,
+    encode_seller_features,
+    read_seller_aggregates,
+    write_seller_aggregates,
+)
+
+ROWS = [(seller_id, seller_id % 10 / 10.0, seller_id * 37) for seller_id in range(0, 3000, 3)]
+
+
+class CountingStore(InMemorySellerStore):
+    def __init__(self, aggregates=None):
+        super().__init__(aggregates)
+        self.calls = []
+
+    def fetch_many(self, seller_ids):
+        self.calls.append(list(seller_ids))
+        return super().fetch_many(seller_ids)
+
+
+def make_requests(n: int = 60):
+    return [
+        PredictionRequest(
+            seller_id=i * 7 % 40,
+            is_verified_seller=i % 2 == 0,
+            item_id=i,
+            name="Item",
+            description="D" * (i * 71 % 1100),
+            category=i % 100,
+            images_qty=i % 8,
+        )
+        for i in range(n)
+    ]
+
+
+def train_seller_model() -> LogisticRegression:
+    rng = np.random.default_rng(0)
+    X = rng.random((500, 6))
+    y = ((X[:, 0] < 0.3) | (X[:, 4] > 0.7)).astype(int)
+    return LogisticRegression().fit(X, y)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    store = create_seller_store(request.param, str(tmp_path / "sellers.db"))
+    store.put_many(ROWS)
+    return store
+
+
+class TestSellerStores:
+    def test_fetch_many(self, store):
+        seller_ids = list(range(0, 3000))
+
+        fetched = store.fetch_many(seller_ids)
+
+        assert fetched == {seller_id: (rate, count) for seller_id, rate, count in ROWS}
+
+    @pytest.mark.parametrize("kind", ["memory", "sqlite"])
+    def test_aggregates_file_populates_store(self, tmp_path, kind):
+        path = str(tmp_path / "sellers.csv")
+        assert write_seller_aggregates(path, ROWS) == len(ROWS)
+
+        store = create_seller_store(kind, str(tmp_path / "sellers.db"), path)
+
+        assert list(read_seller_aggregates(path)) == ROWS
+        assert store.fetch_many([3, 4, 2997]) == {3: (0.3, 111), 2997: (0.7, 2997 * 37)}
+
+    def test_aggregates_file_requires_columns(self, tmp_path):
+        path = tmp_path / "sellers.csv"
+        path.write_text("seller_id,rate\n1,0.5\n")
+
+        with pytest.raises(ValueError, match="listing_count"):
+            create_seller_store("memory", aggregates_path=str(path))
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_seller_store("redis")
+
+    def test_sqlite_store_is_picklable(self, tmp_path):
+        store = SQLiteSellerStore(str(tmp_path / "sellers.db"))
+        store.put_many(ROWS[:5])
+
+        restored = pickle.loads(pickle.dumps(store))
+
+        assert restored.fetch_many([0, 3]) == store.fetch_many([0, 3])
+
+
+class TestSellerFeatureCache:
+    def test_batch_is_fetched_with_one_query(self):
+        store = CountingStore({seller_id: (rate, count) for seller_id, rate, count in ROWS})
+        cache = SellerFeatureCache(store, max_size=100)
+
+        features = cache.get_many([0, 3, 0, 5, 6])
+
+        assert len(store.calls) == 1
+        assert sorted(store.calls[0]) == [0, 3, 5, 6]
+        assert features.tolist() == [
+            list(encode_seller_features(0.0, 0)),
+            list(encode_seller_features(0.3, 111)),
+            list(encode_seller_features(0.0, 0)),
+            list(DEFAULT_SELLER_FEATURES),
+            list(encode_seller_features(0.6, 222)),
+        ]
+
+        cache.get_many([0, 3, 5])
+
+        assert len(store.calls) == 1
+        assert cache.stats() == {"size": 4, "hits": 3, "misses": 4, "queries": 1}
+
+    def test_lru_is_bounded(self):
+        store = CountingStore()
+        cache = SellerFeatureCache(store, max_size=10)
+
+        cache.get_many(list(range(25)))
+        cache.get_many([24])
+        cache.get_many([0])
+
+        assert cache.stats()["size"] == 10
+        assert store.calls[-1] == [0]
+        assert len(store.calls) == 2
+
+    def test_concurrent_prefetches_share_one_query(self):
+        store = CountingStore()
+        cache = SellerFeatureCache(store, max_size=1000)
+
+        async def scenario():
+            await asyncio.gather(*(cache.prefetch([seller_id, seller_id + 1]) for seller_id in range(50)))
+            await cache.prefetch([0, 1])
+
+        asyncio.run(scenario())
+
+        assert len(store.calls) == 1
+        assert sorted(store.calls[0]) == list(range(51))
+
+
+class TestSellerFeaturesInService:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.store = CountingStore({seller_id: (rate, count) for seller_id, rate, count in ROWS})
+        previous = ModerationService.seller_features
+        ModerationService.seller_features = SellerFeatureCache(self.store, max_size=1000)
+        ModerationService.model = train_seller_model()
+        yield
+        ModerationService.model = None
+        ModerationService.seller_features = previous
+
+    def expected_probability(self, request: PredictionRequest) -> float:
+        base = ModerationService.encoder.encode(request).copy()
+        aggregates = self.store.aggregates.get(request.seller_id)
+        seller = encode_seller_features(*aggregates) if aggregates else DEFAULT_SELLER_FEATURES
+        features = np.concatenate((base, seller)).reshape(1, -1)
+        return float(ModerationService.model.predict_proba(features)[0][1])
+
+    @pytest.mark.parametrize("backend", ["sklearn", "compiled", "lookup"])
+    def test_predictions_use_seller_features(self, backend):
+        ModerationService.backend = backend
+        try:
+            requests = make_requests()
+            single = [ModerationService.predict(r) for r in requests]
+            batch = ModerationService.predict_batch(requests)
+        finally:
+            ModerationService.backend = "sklearn"
+
+        for request, one, many in zip(requests, single, batch):
+            assert one.probability == pytest.approx(self.expected_probability(request))
+            assert many.probability == pytest.approx(one.probability)
+
+    def test_batch_fetches_sellers_once(self):
+        ModerationService.predict_batch(make_requests())
+
+        assert len(self.store.calls) == 1
+
+    def test_prediction_cache_keys_include_seller_features(self):
+        from services.cache import PredictionCache
+
+        request = make_requests(1)[0]
+        ModerationService.cache = PredictionCache(100)
+        try:
+            first = ModerationService.predict(request)
+            other = ModerationService.predict(request.model_copy(update={"seller_id": 9}))
+        finally:
+            ModerationService.cache = None
+
+        assert first.probability != other.probability
+
+    def test_four_feature_model_does_not_query_store(self):
+        from model import train_model
+
+        ModerationService.model = train_model()
+        ModerationService.predict_batch(make_requests())
+        ModerationService.predict(make_requests(1)[0])
+
+        assert self.store.calls == []
+        assert not ModerationService.uses_seller_features()
+
+    def test_endpoint_prefetches_sellers(self, app_client):
+        payload = make_requests(1)[0].model_dump()
+
+        response = app_client.post("/predict/", json=payload)
+        stats = app_client.get("/admin/sellers").json()
+
+        assert response.status_code == 200
+        assert response.json()["probability"] == pytest.approx(self.expected_probability(make_requests(1)[0]))
+        assert stats["enabled"] is True
+        assert stats["queries"] == 1
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import pytest
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.streaming import LineTooLongError, iter_lines, score_ndjson
+
+
+def make_payload(i: int) -> dict:
+    return {
+        "seller_id": i,
+        "is_verified_seller": i % 2 == 0,
+        "item_id": i,
+        "name": f"Item {i}",
+        "description": "D" * (i * 37 % 1300),
+        "category": i % 120,
+        "images_qty": i % 12,
+    }
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+class TestIterLines:
+    def test_lines_split_across_chunks(self):
+        data = b'{"a":1}\n{"b":2}\n\n{"c":3}'
+
+        lines = asyncio.run(collect(iter_lines(chunked(data, 3))))
+
+        assert lines == [b'{"a":1}', b'{"b":2}', b"", b'{"c":3}']
+
+    def test_line_too_long(self):
+        with pytest.raises(LineTooLongError):
+            asyncio.run(collect(iter_lines(chunked(b"x" * 100, 10), max_line_bytes=50)))
+
+
+class TestScoreNdjson:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_results_are_streamed_in_order(self):
+        payloads = [make_payload(i) for i in range(25)]
+        lines = [json.dumps(p).encode() for p in payloads]
+        lines[7] = b'{"seller_id": "oops"}'
+        lines[8] = b"not json"
+        data = b"\n".join(lines) + b"\n"
+
+        output = b"".join(asyncio.run(collect(score_ndjson(chunked(data, 100), chunk_size=4))))
+        results = [json.loads(line) for line in output.splitlines()]
+
+        assert len(results) == 25
+        assert results[7]["line"] == 8 and "error" in results[7]
+        assert results[8]["line"] == 9 and "error" in results[8]
+        for i, result in enumerate(results):
+            if i in (7, 8):
+                continue
+            expected = ModerationService.predict(PredictionRequest(**payloads[i]))
+            assert result["is_violation"] == expected.is_violation
+            assert result["probability"] == pytest.approx(expected.probability)
+
+    def test_chunks_are_scored_with_one_call_each(self, monkeypatch):
+        data = b"".join(json.dumps(make_payload(i)).encode() + b"\n" for i in range(10))
+        calls = []
+        original = ModerationService.score_batch
+
+        def counting_score_batch(requests):
+            calls.append(len(requests))
+            return original(requests)
+
+        monkeypatch.setattr(ModerationService, "score_batch", counting_score_batch)
+        asyncio.run(collect(score_ndjson(chunked(data, 64), chunk_size=4)))
+
+        assert calls == [4, 4, 2]
+
+    def test_model_failure_is_reported_in_stream(self):
+        ModerationService.model = None
+        data = json.dumps(make_payload(1)).encode() + b"\n"
+
+        output = b"".join(asyncio.run(collect(score_ndjson(chunked(data, 64)))))
+
+        assert "Модель не загружена" in json.loads(output)["error"]
+
+
+class TestStreamEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup_model(self):
+        from model import train_model
+        ModerationService.model = train_model()
+        yield
+        ModerationService.model = None
+
+    def test_stream_endpoint(self, app_client):
+        payloads = [make_payload(i) for i in range(50)]
+        body = "\n".join(json.dumps(p) for p in payloads) + "\n"
+
+        response = app_client.post("/predict/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        expected = ModerationService.predict_batch([PredictionRequest(**p) for p in payloads])
+        assert results == [e.model_dump() for e in expected]
+
+    def test_stream_endpoint_model_not_loaded(self, app_client):
+        ModerationService.model = None
+
+        response = app_client.post("/predict/stream", content=json.dumps(make_payload(1)))
+
+        assert response.status_code == 503
+
+
+PEAK_RSS_PROBE = """
+import asyncio, resource
+from model import train_model
+from services.moderation_service import ModerationService
+from services.streaming import score_ndjson
+import logging_config
+
+logging_config.setup_logging(level="WARNING")
+ModerationService.model = train_model()
+ROWS = 1_000_000
+
+
+async def body():
+    for start in range(0, ROWS, 1000):
+        yield b"".join(
+            b'{"seller_id":%d,"is_verified_seller":%s,"item_id":%d,"name":"Item","description":"%s","category":%d,"images_qty":%d}\\n'
+            % (i, b"true" if i % 2 else b"false", i, b"d" * (i % 300), i % 120, i % 12)
+            for i in range(start, min(start + 1000, ROWS))
+        )
+
+
+async def main():
+    lines = 0
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    async for chunk in score_ndjson(body()):
+        lines += chunk.count(b"\\n")
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(lines, before, after)
+
+
+asyncio.run(main())
+"""
+
+
+def test_one_million_rows_stream_in_constant_memory():
+    result = subprocess.run(
+        [sys.executable, "-c", PEAK_RSS_PROBE],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "MLFLOW_DISABLE_AGENT_HINT": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines, rss_before_kb, rss_after_kb = map(int, result.stdout.split())
+
+    assert lines == 1_000_000
+    assert rss_after_kb - rss_before_kb < 64 * 1024
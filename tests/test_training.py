@@ -0,0 +1,238 @@
+import os
+import numpy as np
+import pytest
+from sklearn.linear_model import SGDClassifier
+from models.moderation import PredictionRequest
+from services.moderation_service import ModerationService
+from services.scorer import build_lookup_table, compile_scorer
+from services.features import FeatureEncoder
+from model import save_model, train_model
+from model_artifact import LinearModelArtifact, load_local_model
+from services.seller_store import InMemorySellerStore, SellerFeatureCache, read_seller_aggregates
+from training import (
+    LABEL_COLUMN,
+    aggregate_sellers,
+    iter_file_chunks,
+    iter_synthetic_chunks,
+    iter_synthetic_columns,
+    main,
+    publish,
+    synthetic_columns,
+    train,
+    warm_start_model,
+    write_synthetic,
+)
+
+REQUEST = PredictionRequest(
+    seller_id=1,
+    is_verified_seller=False,
+    item_id=100,
+    name="Test Item",
+    description="Short description",
+    category=1,
+    images_qty=0,
+)
+
+
+def holdout_accuracy(model) -> float:
+    columns = synthetic_columns(20_000, seed=999)
+    X = FeatureEncoder().encode_columns(columns)
+    return float((model.predict(X) == columns[LABEL_COLUMN]).mean())
+
+
+@pytest.fixture
+def reset_model():
+    yield
+    ModerationService.model = None
+    ModerationService.model_version = None
+    ModerationService.backend = "sklearn"
+
+
+class TestTraining:
+    def test_synthetic_training_is_accurate(self):
+        model, stats = train(lambda: iter_synthetic_chunks(200_000, chunk_rows=50_000))
+
+        assert stats.rows == 200_000
+        assert stats.chunks == 4
+        assert 0.08 < stats.as_dict()["positive_rate"] < 0.14
+        assert holdout_accuracy(model) > 0.95
+
+    def test_training_is_reproducible(self):
+        first, _ = train(lambda: iter_synthetic_chunks(50_000, chunk_rows=10_000), epochs=2)
+        second, _ = train(lambda: iter_synthetic_chunks(50_000, chunk_rows=10_000), epochs=2)
+
+        np.testing.assert_array_equal(first.coef_, second.coef_)
+        np.testing.assert_array_equal(first.intercept_, second.intercept_)
+
+    @pytest.mark.parametrize("extension", ["csv", "ndjson", "parquet"])
+    def test_file_chunks_match_generated_data(self, tmp_path, extension):
+        if extension == "parquet":
+            pytest.importorskip("pyarrow")
+        path = str(tmp_path / f"train.{extension}")
+        write_synthetic(path, 5_000, chunk_rows=1_000)
+        columns = synthetic_columns(1_000, seed=42)
+
+        chunks = list(iter_file_chunks([path], chunk_bytes=64 * 1024))
+
+        assert len(chunks) > 1
+        assert sum(len(y) for _, y in chunks) == 5_000
+        X = np.vstack([X for X, _ in chunks])
+        y = np.concatenate([y for _, y in chunks])
+        np.testing.assert_allclose(X[:1_000], FeatureEncoder().encode_columns(columns))
+        np.testing.assert_array_equal(y[:1_000], columns[LABEL_COLUMN])
+
+    def test_warm_start_continues_training(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+        first, _ = train(lambda: iter_synthetic_chunks(20_000, chunk_rows=10_000, seed=1))
+        publish(first, path)
+
+        continued, stats = train(lambda: iter_synthetic_chunks(20_000, chunk_rows=10_000, seed=2), model=warm_start_model(path))
+        fresh, _ = train(lambda: iter_synthetic_chunks(20_000, chunk_rows=10_000, seed=2))
+
+        assert stats.rows == 20_000
+        assert continued.t_ > fresh.t_
+        assert not np.array_equal(continued.coef_, fresh.coef_)
+        np.testing.assert_array_equal(load_local_model(path).coef_, first.coef_)
+
+    def test_warm_start_from_artifact(self, tmp_path):
+        path = str(tmp_path / "model.artifact")
+        first, _ = train(lambda: iter_synthetic_chunks(20_000, chunk_rows=10_000, seed=1))
+        publish(first, path)
+
+        restored = warm_start_model(path)
+        X = FeatureEncoder().encode_columns(synthetic_columns(100, seed=5))
+        np.testing.assert_allclose(restored.predict_proba(X), first.predict_proba(X), rtol=1e-12)
+        assert restored.t_ == first.t_
+
+        continued, _ = train(lambda: iter_synthetic_chunks(20_000, chunk_rows=10_000, seed=2), model=restored)
+        assert isinstance(continued, SGDClassifier)
+        assert not np.array_equal(continued.coef_, first.coef_)
+        assert holdout_accuracy(continued) > 0.95
+
+    def test_warm_start_rejects_other_models(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+        save_model(train_model(), path)
+
+        with pytest.raises(ValueError):
+            warm_start_model(path)
+
+    def test_empty_input(self, tmp_path):
+        path = str(tmp_path / "empty.csv")
+        write_synthetic(path, 0)
+
+        with pytest.raises(ValueError):
+            train(lambda: iter_file_chunks([path]))
+
+    def test_publish_requires_target(self):
+        model, _ = train(lambda: iter_synthetic_chunks(1_000))
+
+        with pytest.raises(ValueError):
+            publish(model)
+
+
+class TestPublishedModel:
+    @pytest.mark.parametrize("backend", ["sklearn", "compiled", "lookup"])
+    @pytest.mark.parametrize("filename", ["model.pkl", "model.artifact"])
+    def test_service_loads_published_model(self, tmp_path, reset_model, backend, filename):
+        path = str(tmp_path / filename)
+        model, _ = train(lambda: iter_synthetic_chunks(20_000))
+        version = publish(model, path)
+        ModerationService.backend = backend
+
+        ModerationService.load_model(model_path=path)
+
+        assert ModerationService.model_version == version
+        if filename.endswith(".artifact"):
+            assert isinstance(ModerationService.model, LinearModelArtifact)
+        expected = model.predict_proba(FeatureEncoder().encode(REQUEST).reshape(1, -1))[0][1]
+        assert ModerationService.predict(REQUEST).probability == pytest.approx(expected, abs=1e-12)
+
+    def test_compiled_scorer_supports_sgd(self):
+        model, _ = train(lambda: iter_synthetic_chunks(20_000))
+        X = FeatureEncoder().encode_columns(synthetic_columns(100, seed=5))
+
+        np.testing.assert_allclose(compile_scorer(model).predict_proba(X), model.predict_proba(X)[:, 1], rtol=1e-12)
+        assert build_lookup_table(model) is not None
+        assert compile_scorer(SGDClassifier(loss="hinge").fit(X, np.arange(100) % 2)) is None
+
+    def test_missing_model_is_not_trained(self, tmp_path, reset_model):
+        path = str(tmp_path / "model.pkl")
+
+        with pytest.raises(FileNotFoundError):
+            ModerationService.load_model(model_path=path)
+
+        assert ModerationService.model is None
+        assert not os.path.exists(path)
+
+
+class TestSellerFeatures:
+    def test_aggregates_match_labels(self):
+        columns = {
+            "seller_id": np.array([5, 1, 5, 5, 2]),
+            LABEL_COLUMN: np.array([1, 0, 0, 1, 1]),
+        }
+
+        assert aggregate_sellers([columns, {key: value[:1] for key, value in columns.items()}]) == [
+            (1, 0.0, 1),
+            (2, 1.0, 1),
+            (5, 0.75, 4),
+        ]
+
+    def test_chunks_join_seller_features(self):
+        aggregates = aggregate_sellers(iter_synthetic_columns(5_000, chunk_rows=1_000))
+        sellers = SellerFeatureCache(InMemorySellerStore({s: (rate, count) for s, rate, count in aggregates}), 10_000)
+
+        model, _ = train(lambda: iter_synthetic_chunks(5_000, chunk_rows=1_000, sellers=sellers))
+
+        assert model.n_features_in_ == 6
+        assert sellers.stats()["queries"] == 5
+
+    def test_cli_trains_and_serves_seller_model(self, tmp_path, reset_model):
+        data = str(tmp_path / "train.csv")
+        aggregates = str(tmp_path / "sellers.csv")
+        output = str(tmp_path / "model.artifact")
+
+        assert main(["generate", data, "--rows", "20000"]) == 0
+        assert main(["sellers", data, "--output", aggregates]) == 0
+        assert main(["train", data, "--output", output, "--seller-features", "--seller-aggregates", aggregates]) == 0
+
+        store = InMemorySellerStore({s: (rate, count) for s, rate, count in read_seller_aggregates(aggregates)})
+        previous = ModerationService.seller_features
+        ModerationService.seller_features = SellerFeatureCache(store, 1_000)
+        try:
+            ModerationService.load_model(model_path=output)
+            request = REQUEST.model_copy(update={"seller_id": next(iter(store.aggregates))})
+            probability = ModerationService.predict(request).probability
+            expected_sellers = ModerationService.seller_features.get_many([request.seller_id])[0]
+        finally:
+            ModerationService.seller_features = previous
+
+        model = ModerationService.model
+        features = np.concatenate((FeatureEncoder().encode(request), expected_sellers)).reshape(1, -1)
+        assert model.n_features_in_ == 6
+        assert probability == pytest.approx(model.predict_proba(features)[0][1], abs=1e-12)
+
+
+class TestTrainingCli:
+    def test_generate_and_train(self, tmp_path, capsys):
+        data = str(tmp_path / "train.csv")
+        output = str(tmp_path / "model.pkl")
+
+        assert main(["generate", data, "--rows", "20000"]) == 0
+        assert main(["train", data, "--output", output, "--epochs", "2"]) == 0
+
+        model = load_local_model(output)
+        assert isinstance(model, SGDClassifier)
+        assert holdout_accuracy(model) > 0.95
+        assert "строк: 40000" in capsys.readouterr().err
+
+    def test_train_on_synthetic_rows(self, tmp_path):
+        output = str(tmp_path / "model.artifact")
+
+        assert main(["train", "--synthetic-rows", "10000", "--output", output]) == 0
+
+        assert isinstance(load_local_model(output), LinearModelArtifact)
+
+    def test_inputs_are_required(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main(["train", "--output", str(tmp_path / "model.pkl")])
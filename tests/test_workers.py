@@ -0,0 +1,178 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import pytest
+from unittest.mock import patch
+from artifact_cache import ArtifactCache, file_lock, load_model_mlflow_cached
+from model import train_model
+from serve import bootstrap_model
+from services.workers import WorkerStats, process_memory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_json(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def wait_for(condition, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            result = condition()
+            if result:
+                return result
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError("Условие не выполнено за отведённое время")
+
+
+class TestFileLock:
+    def test_bootstrap_trains_once(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+
+        with multiprocessing.get_context("fork").Pool(3) as pool:
+            trained = pool.starmap(bootstrap_model, [(path, 20_000)] * 3)
+
+        assert sorted(trained) == [False, False, True]
+        assert os.path.exists(path)
+
+    def test_bootstrap_skips_existing_model(self, tmp_path):
+        path = str(tmp_path / "model.pkl")
+
+        assert bootstrap_model(path, 0) is False
+        assert bootstrap_model(path, 10_000) is True
+        assert bootstrap_model(path, 10_000) is False
+
+    def test_lock_is_exclusive(self, tmp_path):
+        path = str(tmp_path / "locks" / "model.lock")
+        events = []
+
+        def hold(name: str):
+            with file_lock(path):
+                events.append(f"{name}:enter")
+                time.sleep(0.05)
+                events.append(f"{name}:exit")
+
+        threads = [threading.Thread(target=hold, args=(str(i),)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(events[i].split(":")[0] == events[i + 1].split(":")[0] for i in range(0, len(events), 2))
+
+    def test_concurrent_cache_miss_downloads_once(self, tmp_path):
+        cache = ArtifactCache(str(tmp_path))
+        model = train_model()
+
+        def slow_download(*args, **kwargs):
+            time.sleep(0.1)
+            return model
+
+        with patch("artifact_cache.get_latest_model_version", return_value="3"), \
+                patch("artifact_cache.load_model_mlflow", side_effect=slow_download) as download:
+            threads = [
+                threading.Thread(target=load_model_mlflow_cached, args=("moderation_model",), kwargs={"cache": cache})
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert download.call_count == 1
+        assert cache.resolve("moderation_model")[0] == "3"
+
+
+class TestWorkerStats:
+    def test_collects_all_workers(self, tmp_path):
+        first, second = WorkerStats(), WorkerStats()
+        first.configure(0, str(tmp_path))
+        second.configure(1, str(tmp_path))
+        second.write()
+
+        workers = first.collect()
+
+        assert [worker["index"] for worker in workers] == [0, 1]
+        assert workers[0]["pid"] == os.getpid()
+
+    def test_stop_removes_stats_file(self, tmp_path):
+        stats = WorkerStats(interval=0.01)
+        stats.configure(0, str(tmp_path))
+
+        async def scenario():
+            await stats.start()
+            await stats.stop()
+
+        asyncio.run(scenario())
+
+        assert os.listdir(str(tmp_path)) == []
+
+    def test_single_process(self, app_client):
+        response = app_client.get("/admin/workers")
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 1
+        assert response.json()["workers"][0]["pid"] == os.getpid()
+
+    def test_process_memory(self):
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            pytest.skip("smaps_rollup недоступен")
+        usage = process_memory()
+
+        assert 0 < usage["pss_kb"] <= usage["rss_kb"]
+        assert usage["private_kb"] + usage["shared_kb"] == usage["rss_kb"]
+
+
+class TestSupervisor:
+    def test_prefork_workers_share_preloaded_model(self, tmp_path):
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        process = subprocess.Popen(
+            [
+                sys.executable, "serve.py", "--workers", "2", "--host", "127.0.0.1", "--port", str(port),
+                "--model-path", str(tmp_path / "model.pkl"), "--bootstrap-rows", "20000",
+                "--stats-dir", str(tmp_path / "stats"), "--log-level", "warning",
+            ],
+            cwd=ROOT,
+            env={**os.environ, "PYTHONPATH": ROOT, "LOG_LEVEL": "WARNING", "WORKER_STATS_INTERVAL": "0.1"},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            workers = wait_for(lambda: get_json(f"{url}/admin/workers")["count"] == 2 and get_json(f"{url}/admin/workers"))
+            pids = {worker["pid"] for worker in workers["workers"]}
+            assert len(pids) == 2
+            assert {worker["model_version"] for worker in workers["workers"]} != {None}
+            assert wait_for(lambda: get_json(f"{url}/health/ready")["ready"])
+
+            os.kill(next(iter(pids)), signal.SIGKILL)
+            restarted = wait_for(lambda: {
+                worker["pid"] for worker in get_json(f"{url}/admin/workers")["workers"]
+            } - pids)
+            assert len(restarted) == 1
+        finally:
+            process.send_signal(signal.SIGTERM)
+            _, stderr = process.communicate(timeout=30)
+
+        assert process.returncode == 0
+        assert stderr.count("Модель обучена при запуске") == 1
+        assert "Модель загружена в родительском процессе" in stderr
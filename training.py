@@ -0,0 +1,358 @@
+import argparse
+import copy
+import functools
+import pickle
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+
+import config
+from model import get_model_file_version, save_model_mlflow
+from model_artifact import LinearModelArtifact, is_artifact_path, load_local_model, save_model_artifact, write_atomic
+from score_cli import FORMATS, _import_parquet, detect_format, plan_tasks, read_task
+from services.features import FeatureEncoder
+from services.seller_store import SellerFeatureCache, create_seller_store, write_seller_aggregates
+
+LABEL_COLUMN = "is_violation"
+CLASSES = np.array([0, 1])
+DEFAULT_SEED = 42
+DEFAULT_ALPHA = 0.0001
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+DEFAULT_CHUNK_ROWS = 100_000
+
+Chunk = Tuple[np.ndarray, np.ndarray]
+
+
+def encode_chunk(
+    encoder: FeatureEncoder, columns: Dict[str, np.ndarray], sellers: Optional[SellerFeatureCache] = None
+) -> np.ndarray:
+    X = encoder.encode_columns(columns)
+    if sellers is not None:
+        X = np.hstack((X, sellers.get_many(np.asarray(columns["seller_id"]).tolist())))
+    return X
+
+
+def iter_file_columns(
+    paths: Sequence[str],
+    input_format: Optional[str] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    label: str = LABEL_COLUMN,
+) -> Iterator[Dict[str, np.ndarray]]:
+    for path in paths:
+        fmt = detect_format(path, input_format)
+        for task in plan_tasks(path, fmt, chunk_bytes, label):
+            columns = read_task(task, label)
+            if len(columns[label]):
+                yield columns
+
+
+def iter_file_chunks(
+    paths: Sequence[str],
+    input_format: Optional[str] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    label: str = LABEL_COLUMN,
+    sellers: Optional[SellerFeatureCache] = None,
+) -> Iterator[Chunk]:
+    encoder = FeatureEncoder()
+    for columns in iter_file_columns(paths, input_format, chunk_bytes, label):
+        yield encode_chunk(encoder, columns, sellers), columns[label]
+
+
+def synthetic_columns(rows: int, seed: int = DEFAULT_SEED) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    columns = {
+        "seller_id": rng.integers(0, 100_000, rows),
+        "item_id": np.arange(rows, dtype=np.int64),
+        "is_verified_seller": rng.random(rows) < 0.5,
+        "images_qty": rng.integers(0, 11, rows),
+        "description_length": rng.integers(0, 1001, rows),
+        "category": rng.integers(0, 101, rows),
+    }
+    violation = ~columns["is_verified_seller"] & (columns["images_qty"] < 2)
+    noise = rng.random(rows) < 0.02
+    columns[LABEL_COLUMN] = (violation ^ noise).astype(np.int64)
+    return columns
+
+
+def iter_synthetic_columns(
+    rows: int, chunk_rows: int = DEFAULT_CHUNK_ROWS, seed: int = DEFAULT_SEED
+) -> Iterator[Dict[str, np.ndarray]]:
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        yield synthetic_columns(min(chunk_rows, rows - start), seed + i)
+
+
+def iter_synthetic_chunks(
+    rows: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    seed: int = DEFAULT_SEED,
+    sellers: Optional[SellerFeatureCache] = None,
+) -> Iterator[Chunk]:
+    encoder = FeatureEncoder()
+    for columns in iter_synthetic_columns(rows, chunk_rows, seed):
+        yield encode_chunk(encoder, columns, sellers), columns[LABEL_COLUMN]
+
+
+def aggregate_sellers(chunks: Iterable[Dict[str, np.ndarray]], label: str = LABEL_COLUMN) -> List[Tuple[int, float, int]]:
+    listings: Dict[int, int] = {}
+    violations: Dict[int, int] = {}
+    for columns in chunks:
+        seller_ids, inverse, counts = np.unique(
+            np.asarray(columns["seller_id"]), return_inverse=True, return_counts=True
+        )
+        positives = np.bincount(inverse, weights=np.asarray(columns[label]) > 0, minlength=len(seller_ids))
+        for seller_id, count, positive in zip(seller_ids.tolist(), counts.tolist(), positives.tolist()):
+            listings[seller_id] = listings.get(seller_id, 0) + count
+            violations[seller_id] = violations.get(seller_id, 0) + int(positive)
+    return [
+        (seller_id, violations[seller_id] / count, count)
+        for seller_id, count in sorted(listings.items())
+    ]
+
+
+def new_model(seed: int = DEFAULT_SEED, alpha: float = DEFAULT_ALPHA) -> SGDClassifier:
+    return SGDClassifier(loss="log_loss", alpha=alpha, random_state=seed)
+
+
+def warm_start_model(path: str, seed: int = DEFAULT_SEED, alpha: float = DEFAULT_ALPHA) -> SGDClassifier:
+    model = load_local_model(path)
+    if isinstance(model, LinearModelArtifact):
+        restored = new_model(seed, alpha)
+        restored.coef_ = np.array(model.coef_, dtype=np.float64)
+        restored.intercept_ = np.array(model.intercept_, dtype=np.float64)
+        restored.classes_ = np.array(model.classes_)
+        restored.n_features_in_ = model.n_features_in_
+        if "sgd_t" in model.meta:
+            restored.t_ = model.meta["sgd_t"]
+        return restored
+    if not isinstance(model, SGDClassifier) or model.loss != "log_loss":
+        raise ValueError(f"Дообучение поддерживается только для SGDClassifier(loss='log_loss'): {path}")
+    return copy.deepcopy(model)
+
+
+class TrainingStats:
+    def __init__(self):
+        self.rows = 0
+        self.chunks = 0
+        self.epochs = 0
+        self.positives = 0
+        self.seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "epochs": self.epochs,
+            "positive_rate": self.positives / self.rows if self.rows else None,
+            "seconds": self.seconds,
+            "rows_per_second": self.rows / self.seconds if self.seconds else None,
+        }
+
+
+def train(
+    chunks: Callable[[], Iterable[Chunk]],
+    epochs: int = 1,
+    model: Optional[SGDClassifier] = None,
+    seed: int = DEFAULT_SEED,
+    alpha: float = DEFAULT_ALPHA,
+) -> Tuple[SGDClassifier, TrainingStats]:
+    if epochs < 1:
+        raise ValueError("Число эпох должно быть положительным")
+    model = model if model is not None else new_model(seed, alpha)
+    stats = TrainingStats()
+    started = time.perf_counter()
+    for _ in range(epochs):
+        for X, y in chunks():
+            model.partial_fit(X, y, classes=CLASSES)
+            stats.rows += len(y)
+            stats.chunks += 1
+            stats.positives += int(y.sum())
+        stats.epochs += 1
+    stats.seconds = time.perf_counter() - started
+    if not stats.rows:
+        raise ValueError("Нет данных для обучения")
+    return model, stats
+
+
+def publish(model, output: Optional[str] = None, mlflow_model_name: Optional[str] = None) -> Optional[str]:
+    if not output and not mlflow_model_name:
+        raise ValueError("Нужно указать путь публикации или имя модели в MLflow")
+    version = None
+    if output:
+        if is_artifact_path(output):
+            version = save_model_artifact(model, output)
+        else:
+            write_atomic(output, pickle.dumps(model))
+            version = get_model_file_version(output)
+    if mlflow_model_name:
+        save_model_mlflow(model, mlflow_model_name)
+    return version
+
+
+class LabeledWriter:
+    def __init__(self, path: str, fmt: str):
+        if fmt not in FORMATS.values():
+            raise ValueError(f"Неподдерживаемый формат: {fmt}")
+        self.fmt = fmt
+        self.path = path
+        self._writer = None
+        if fmt == "parquet":
+            self._pyarrow, self._parquet = _import_parquet()
+        else:
+            self._file = open(path, "w", encoding="utf-8", newline="")
+            if fmt == "csv":
+                self._file.write(f"seller_id,item_id,is_verified_seller,images_qty,description,category,{LABEL_COLUMN}\n")
+
+    def write(self, columns: Dict[str, np.ndarray]):
+        descriptions = ["x" * length for length in columns["description_length"].tolist()]
+        rows = zip(
+            columns["seller_id"].tolist(),
+            columns["item_id"].tolist(),
+            columns["is_verified_seller"].tolist(),
+            columns["images_qty"].tolist(),
+            descriptions,
+            columns["category"].tolist(),
+            columns[LABEL_COLUMN].tolist(),
+        )
+        if self.fmt == "parquet":
+            table = self._pyarrow.table({
+                "seller_id": columns["seller_id"],
+                "item_id": columns["item_id"],
+                "is_verified_seller": columns["is_verified_seller"],
+                "images_qty": columns["images_qty"],
+                "description": descriptions,
+                "category": columns["category"],
+                LABEL_COLUMN: columns[LABEL_COLUMN],
+            })
+            if self._writer is None:
+                self._writer = self._parquet.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        elif self.fmt == "csv":
+            self._file.write("".join(
+                f"{seller_id},{item_id},{'true' if verified else 'false'},{images},{description},{category},{label}\n"
+                for seller_id, item_id, verified, images, description, category, label in rows
+            ))
+        else:
+            self._file.write("".join(
+                f'{{"seller_id":{seller_id},"item_id":{item_id},"is_verified_seller":{"true" if verified else "false"},'
+                f'"images_qty":{images},"description":"{description}","category":{category},"{LABEL_COLUMN}":{label}}}\n'
+                for seller_id, item_id, verified, images, description, category, label in rows
+            ))
+
+    def close(self):
+        if self.fmt == "parquet":
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            self._file.close()
+
+
+def write_synthetic(
+    path: str,
+    rows: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    seed: int = DEFAULT_SEED,
+    output_format: Optional[str] = None,
+):
+    fmt = detect_format(path, output_format)
+    writer = LabeledWriter(path, fmt)
+    try:
+        for columns in iter_synthetic_columns(rows, chunk_rows, seed):
+            writer.write(columns)
+    finally:
+        writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Обучение и публикация модели модерации")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Обучить модель на размеченных файлах и опубликовать артефакт")
+    train_parser.add_argument("inputs", nargs="*", help="Файлы CSV, NDJSON или Parquet с колонкой метки")
+    train_parser.add_argument("--synthetic-rows", type=int, default=0, help="Обучить на синтетических данных")
+    train_parser.add_argument("--output", default=config.MODEL_PATH)
+    train_parser.add_argument("--mlflow-model-name")
+    train_parser.add_argument("--no-output", action="store_true", help="Публиковать только в MLflow")
+    train_parser.add_argument("--warm-start", help="Дообучить опубликованную модель SGDClassifier или артефакт")
+    train_parser.add_argument("--format", dest="input_format", choices=sorted(set(FORMATS.values())))
+    train_parser.add_argument("--label", default=LABEL_COLUMN)
+    train_parser.add_argument("--epochs", type=int, default=1)
+    train_parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES)
+    train_parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    train_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    train_parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    train_parser.add_argument(
+        "--seller-features", action="store_true", help="Добавить агрегаты продавцов из хранилища SELLER_STORE"
+    )
+    train_parser.add_argument("--seller-aggregates", default=config.SELLER_AGGREGATES_PATH)
+
+    sellers_parser = commands.add_parser("sellers", help="Посчитать агрегаты продавцов по размеченным файлам")
+    sellers_parser.add_argument("inputs", nargs="*", help="Файлы CSV, NDJSON или Parquet с колонкой метки")
+    sellers_parser.add_argument("--synthetic-rows", type=int, default=0, help="Посчитать по синтетическим данным")
+    sellers_parser.add_argument("--output", default=config.SELLER_AGGREGATES_PATH or "sellers.csv")
+    sellers_parser.add_argument("--sqlite", dest="sqlite_path", help="Дополнительно записать агрегаты в SQLite")
+    sellers_parser.add_argument("--format", dest="input_format", choices=sorted(set(FORMATS.values())))
+    sellers_parser.add_argument("--label", default=LABEL_COLUMN)
+    sellers_parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES)
+    sellers_parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    sellers_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    generate_parser = commands.add_parser("generate", help="Сгенерировать синтетический размеченный набор")
+    generate_parser.add_argument("output")
+    generate_parser.add_argument("--rows", type=int, default=100_000)
+    generate_parser.add_argument("--format", dest="output_format", choices=sorted(set(FORMATS.values())))
+    generate_parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    generate_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        write_synthetic(args.output, args.rows, args.chunk_rows, args.seed, args.output_format)
+        print(f"Сгенерировано строк: {args.rows}, файл: {args.output}")
+        return 0
+
+    if args.inputs and args.synthetic_rows:
+        parser.error("Нельзя одновременно указать файлы и --synthetic-rows")
+    if not args.inputs and not args.synthetic_rows:
+        parser.error("Нужно указать файлы для обучения или --synthetic-rows")
+
+    if args.command == "sellers":
+        if args.inputs:
+            columns = iter_file_columns(args.inputs, args.input_format, args.chunk_bytes, args.label)
+        else:
+            columns = iter_synthetic_columns(args.synthetic_rows, args.chunk_rows, args.seed)
+        aggregates = aggregate_sellers(columns, args.label)
+        write_seller_aggregates(args.output, aggregates)
+        if args.sqlite_path:
+            create_seller_store("sqlite", args.sqlite_path).put_many(aggregates)
+        print(f"Агрегаты продавцов: {len(aggregates)}, файл: {args.output}")
+        return 0
+
+    sellers = None
+    if args.seller_features:
+        sellers = SellerFeatureCache(
+            create_seller_store(config.SELLER_STORE, config.SELLER_STORE_PATH, args.seller_aggregates),
+            config.SELLER_CACHE_SIZE,
+        )
+    if args.inputs:
+        chunks = functools.partial(
+            iter_file_chunks, args.inputs, args.input_format, args.chunk_bytes, args.label, sellers
+        )
+    else:
+        chunks = functools.partial(iter_synthetic_chunks, args.synthetic_rows, args.chunk_rows, args.seed, sellers)
+
+    model = warm_start_model(args.warm_start, args.seed, args.alpha) if args.warm_start else None
+    model, stats = train(chunks, args.epochs, model, args.seed, args.alpha)
+    version = publish(model, None if args.no_output else args.output, args.mlflow_model_name)
+    summary = stats.as_dict()
+    print(
+        f"Модель обучена - строк: {summary['rows']}, эпох: {summary['epochs']}, "
+        f"время: {summary['seconds']:.2f} с, версия: {version or args.mlflow_model_name}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())